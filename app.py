@@ -1,8 +1,10 @@
 """Flask application entry point"""
-from flask import Flask, send_from_directory
+from flask import Flask
 from flask_cors import CORS
 from config import Config
 from models import db
+from json_provider import FastJSONProvider
+from compression import init_compression, send_precompressed
 import os
 
 
@@ -11,6 +13,9 @@ def create_app():
     app = Flask(__name__, static_folder='static')
     app.config.from_object(Config)
 
+    # orjson-backed JSON (falls back to stdlib json when not installed)
+    app.json = FastJSONProvider(app)
+
     # Validate configuration
     try:
         Config.validate()
@@ -31,6 +36,9 @@ def create_app():
     # Initialize database
     db.init_app(app)
 
+    # gzip/brotli for large responses (streams/SSE are left untouched)
+    init_compression(app)
+
     # Global error handler
     @app.errorhandler(Exception)
     def handle_error(e):
@@ -44,17 +52,19 @@ def create_app():
     from routes.user_routes import user_bp
     from routes.config_routes import config_bp
     from routes.init_routes import init_bp
+    from routes.event_routes import event_bp
 
     app.register_blueprint(auth_bp, url_prefix='/api')
     app.register_blueprint(request_bp, url_prefix='/api')
     app.register_blueprint(user_bp, url_prefix='/api')
     app.register_blueprint(config_bp, url_prefix='/api')
     app.register_blueprint(init_bp, url_prefix='/api')
+    app.register_blueprint(event_bp, url_prefix='/api')
 
     # Serve frontend
     @app.route('/')
     def index():
-        return send_from_directory('static', 'index.html')
+        return send_precompressed('static', 'index.html')
 
     # Health check endpoint
     @app.route('/health')
@@ -0,0 +1,92 @@
+"""
+Audit Log Retention Script
+Przenosi stare logi audytowe z tabeli audit_log do skompresowanego archiwum
+(segmenty JSONL.gz w AUDIT_ARCHIVE_DIR), aby tabela i jej indeksy pozostały małe.
+
+Użycie:
+    python archive_audit_logs.py                      # logi starsze niż AUDIT_RETENTION_DAYS
+    python archive_audit_logs.py --older-than-days 90 --batch-size 2000
+    python archive_audit_logs.py export --since 2025-01-01 --until 2025-02-01 > logs.ndjson
+
+Cron (np. codziennie o 3:00):
+    0 3 * * * cd /home/site/wwwroot && python archive_audit_logs.py
+
+AUDIT_ARCHIVE_DIR musi być ustawione (w App Settings, tak samo dla aplikacji
+i crona) na ścieżkę bezwzględną na trwałym dysku, POZA /home/site/wwwroot -
+np. /home/data/audit_archive. Archiwum jest jedyną kopią przeniesionych
+logów, a wwwroot jest nadpisywany przy każdym deployu. Bez tej zmiennej
+skrypt kończy się błędem i niczego nie usuwa.
+"""
+import argparse
+import json
+import sys
+import os
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from services.audit_archive import archive_audit_logs, iter_archived_audit_logs, list_segments
+
+
+def run_archive(args):
+    """Move old rows into archive segments"""
+    result = archive_audit_logs(
+        older_than_days=args.older_than_days,
+        batch_size=args.batch_size,
+        max_batches=args.max_batches
+    )
+    print(f"✅ Zarchiwizowano {result['archived']} logów starszych niż "
+          f"{result['cutoff']:%Y-%m-%d %H:%M} w {len(result['segments'])} segmentach")
+    return True
+
+
+def run_export(args):
+    """Write archived entries as NDJSON to stdout"""
+    since = datetime.fromisoformat(args.since) if args.since else None
+    until = datetime.fromisoformat(args.until) if args.until else None
+    for entry in iter_archived_audit_logs(since=since, until=until, user_id=args.user_id,
+                                          actions=args.action):
+        sys.stdout.write(json.dumps(entry, ensure_ascii=False) + '\n')
+    return True
+
+
+def run_list(args):
+    """Print archive segments"""
+    for path, first, last in list_segments():
+        print(f"{first:%Y-%m-%d %H:%M:%S}  {last:%Y-%m-%d %H:%M:%S}  "
+              f"{os.path.getsize(path):>10}  {os.path.basename(path)}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Audit log retention and archive')
+    parser.add_argument('--older-than-days', type=int, default=None)
+    parser.add_argument('--batch-size', type=int, default=None)
+    parser.add_argument('--max-batches', type=int, default=None)
+    parser.set_defaults(handler=run_archive)
+
+    commands = parser.add_subparsers()
+    export = commands.add_parser('export', help='stream archived entries as NDJSON')
+    export.add_argument('--since')
+    export.add_argument('--until')
+    export.add_argument('--user-id', type=int)
+    export.add_argument('--action', action='append')
+    export.set_defaults(handler=run_export)
+    commands.add_parser('list', help='list archive segments').set_defaults(handler=run_list)
+
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        try:
+            return args.handler(args)
+        except Exception as e:
+            print(f"\n❌ Błąd: {str(e)}", file=sys.stderr)
+            return False
+
+
+if __name__ == '__main__':
+    success = main()
+    sys.exit(0 if success else 1)
@@ -1,5 +1,10 @@
 """Authentication and authorization middleware"""
 from functools import wraps
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from hashlib import sha256
+import threading
+import time
 from flask import request, jsonify, g
 import jwt
 import bcrypt
@@ -8,6 +13,76 @@ from config import Config
 from models import User
 
 
+class TokenCache:
+    """
+    Bounded LRU cache of verified JWT claims
+
+    Keyed by SHA-256 digest of the token (raw tokens are not kept in memory).
+    An entry expires after `ttl` seconds, and never later than the token's
+    own `exp`, so expired tokens always go through jwt.decode again.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token):
+        """Return cached claims for token, or None"""
+        key = sha256(token.encode()).digest()
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, claims = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def put(self, token, claims):
+        """Cache verified claims until min(now + ttl, exp)"""
+        if self.max_size <= 0:
+            return
+        key = sha256(token.encode()).digest()
+        expires_at = min(time.time() + self.ttl, claims.get('exp', 0))
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Counters for monitoring"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / total, 4) if total else 0.0
+            }
+
+
+token_cache = TokenCache(Config.TOKEN_CACHE_SIZE, Config.TOKEN_CACHE_TTL)
+
+
 def generate_token(user):
     """Generate JWT token for user with 8-hour expiration"""
     payload = {
@@ -21,14 +96,53 @@ def generate_token(user):
     return token
 
 
+class PasswordHasherBusy(Exception):
+    """Raised when too many bcrypt operations are already queued"""
+
+
+# bcrypt releases the GIL, so hashing runs on a small bounded pool: at most
+# BCRYPT_MAX_WORKERS hashes run per process, at most BCRYPT_MAX_QUEUE wait,
+# and any further call fails fast instead of pinning request threads
+_bcrypt_executor = ThreadPoolExecutor(
+    max_workers=Config.BCRYPT_MAX_WORKERS, thread_name_prefix='bcrypt'
+)
+_bcrypt_slots = threading.BoundedSemaphore(Config.BCRYPT_MAX_WORKERS + Config.BCRYPT_MAX_QUEUE)
+
+
+def _run_bcrypt(fn, *args):
+    """Run a bcrypt call on the bounded pool and wait for its result"""
+    if not _bcrypt_slots.acquire(blocking=False):
+        raise PasswordHasherBusy('Password hashing queue is full')
+    try:
+        future = _bcrypt_executor.submit(fn, *args)
+    except Exception:
+        _bcrypt_slots.release()
+        raise
+    future.add_done_callback(lambda _: _bcrypt_slots.release())
+    try:
+        return future.result(timeout=Config.BCRYPT_TIMEOUT)
+    except FuturesTimeoutError:
+        raise PasswordHasherBusy('Password hashing timed out')
+
+
 def verify_password(password, password_hash):
     """Verify password against hash"""
-    return bcrypt.checkpw(password.encode(), password_hash.encode())
+    return _run_bcrypt(bcrypt.checkpw, password.encode(), password_hash.encode())
 
 
 def hash_password(password):
-    """Hash password using bcrypt"""
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
+    """Hash password using bcrypt with the configured work factor"""
+    salt = bcrypt.gensalt(rounds=Config.BCRYPT_ROUNDS)
+    return _run_bcrypt(bcrypt.hashpw, password.encode(), salt).decode()
+
+
+def password_needs_rehash(password_hash):
+    """True if hash was created with a different work factor than configured"""
+    try:
+        # Format: $2b$<cost>$<salt+hash>
+        return int(password_hash.split('$')[2]) != Config.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
 
 
 def token_required(f):
@@ -49,8 +163,11 @@ def token_required(f):
             return jsonify({'error': 'Token is missing'}), 401
 
         try:
-            # Decode token
-            payload = jwt.decode(token, Config.SECRET_KEY, algorithms=['HS256'])
+            # Reuse claims of a recently verified token, else verify signature
+            payload = token_cache.get(token)
+            if payload is None:
+                payload = jwt.decode(token, Config.SECRET_KEY, algorithms=['HS256'])
+                token_cache.put(token, payload)
             g.user_id = payload['user_id']
             g.user_role = payload['role']
             g.user_email = payload['email']
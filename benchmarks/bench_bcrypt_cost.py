@@ -0,0 +1,71 @@
+"""
+Benchmark: pick a bcrypt work factor (BCRYPT_ROUNDS) for a target latency
+
+Measures bcrypt.hashpw / checkpw for a range of costs on this machine and
+suggests the highest cost whose median checkpw time stays within the
+target. Run it on the production App Service plan, not a laptop.
+
+With BCRYPT_MAX_WORKERS=W a worker process can verify about
+W * 1000 / median_ms logins per second; the report shows this too.
+
+Usage:
+    python benchmarks/bench_bcrypt_cost.py                  # target 250 ms
+    python benchmarks/bench_bcrypt_cost.py --target-ms 100 --min 8 --max 14
+"""
+import argparse
+import os
+import statistics
+import time
+import bcrypt
+
+PASSWORD = b'Correct-Horse-Battery-Staple-1'
+
+
+def measure(cost, samples):
+    """Return (median hash ms, median check ms) for a cost"""
+    hash_times = []
+    check_times = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hashed = bcrypt.hashpw(PASSWORD, bcrypt.gensalt(rounds=cost))
+        hash_times.append((time.perf_counter() - start) * 1000)
+
+        start = time.perf_counter()
+        bcrypt.checkpw(PASSWORD, hashed)
+        check_times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(hash_times), statistics.median(check_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--target-ms', type=float, default=250.0)
+    parser.add_argument('--min', type=int, default=10, dest='min_cost')
+    parser.add_argument('--max', type=int, default=14, dest='max_cost')
+    parser.add_argument('--samples', type=int, default=5)
+    parser.add_argument('--workers', type=int,
+                        default=int(os.getenv('BCRYPT_MAX_WORKERS', 2)))
+    args = parser.parse_args()
+
+    print(f"target: {args.target_ms:.0f} ms per login, {args.workers} bcrypt workers/process\n")
+    print(f"{'cost':>4} {'hash ms':>9} {'check ms':>9} {'logins/s/process':>17}")
+
+    chosen = None
+    for cost in range(args.min_cost, args.max_cost + 1):
+        hash_ms, check_ms = measure(cost, args.samples)
+        throughput = args.workers * 1000 / check_ms
+        print(f"{cost:>4} {hash_ms:>9.1f} {check_ms:>9.1f} {throughput:>17.1f}")
+        if check_ms <= args.target_ms:
+            chosen = cost
+        else:
+            # Each extra round doubles the cost - no need to go further
+            break
+
+    if chosen is None:
+        print(f"\nEven cost {args.min_cost} exceeds the target; use BCRYPT_ROUNDS={args.min_cost}")
+    else:
+        print(f"\nSuggested: BCRYPT_ROUNDS={chosen}")
+        print("Existing hashes are upgraded on the next successful login.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""
+Benchmark: email body rendering
+
+Compares, for N new-request and N decision emails:
+- before:  the previous inline f-string HTML builders (HTML only, no escaping)
+- after:   render_email() - precompiled Jinja templates, auto-escaped HTML
+           plus the plain-text part
+
+The first render of each template (compilation) is reported separately;
+it happens once per process. No SMTP or database is involved.
+
+Usage:
+    python benchmarks/bench_email_templates.py            # 5000 messages
+    python benchmarks/bench_email_templates.py 20000
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+
+from services.email_service import render_email, get_app_url, DECISION_STYLES
+
+
+# Previous implementation (services/email_service.py before templates),
+# returning (subject, html) instead of sending
+
+
+def old_new_request_html(employee_name, request_data):
+    # Get app URL from environment
+    app_name = os.getenv('APP_NAME', 'timeoff-manager-20251004')
+    if os.getenv('FLASK_ENV') == 'production':
+        app_url = f"https://{app_name}.azurewebsites.net"
+    else:
+        app_url = "http://localhost:5000"
+
+    subject = f"Nowy wniosek od {employee_name}"
+
+    html = f"""
+    <html>
+    <body style="font-family: Arial, sans-serif; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 40px;">
+        <div style="max-width: 600px; margin: 0 auto; background: white; border-radius: 20px; padding: 40px; box-shadow: 0 10px 40px rgba(0,0,0,0.1);">
+            <h2 style="color: #1e293b; margin-bottom: 30px; font-size: 24px;">Nowy wniosek o wyjście</h2>
+
+            <div style="background: #f8fafc; border-radius: 12px; padding: 20px; margin-bottom: 20px;">
+                <p style="margin: 10px 0; color: #475569;"><strong style="color: #1e293b;">Pracownik:</strong> {employee_name}</p>
+                <p style="margin: 10px 0; color: #475569;"><strong style="color: #1e293b;">Data:</strong> {request_data['date']}</p>
+                <p style="margin: 10px 0; color: #475569;"><strong style="color: #1e293b;">Wyjście:</strong> {request_data['time_out']}</p>
+                <p style="margin: 10px 0; color: #475569;"><strong style="color: #1e293b;">Powrót:</strong> {request_data['time_return']}</p>
+            </div>
+
+            <div style="background: #fef3c7; border-left: 4px solid #f59e0b; padding: 15px; border-radius: 8px; margin-bottom: 30px;">
+                <p style="margin: 0; color: #78350f;"><strong>Powód:</strong> {request_data['reason']}</p>
+            </div>
+
+            <p style="margin-top: 30px; text-align: center;">
+                <a href="{app_url}"
+                   style="display: inline-block; padding: 12px 24px; background: linear-gradient(to right, #667eea, #764ba2); color: white; text-decoration: none; border-radius: 8px; font-weight: bold;">
+                    Przejdź do aplikacji
+                </a>
+            </p>
+
+            <p style="margin-top: 30px; text-align: center; color: #94a3b8; font-size: 12px;">
+                TimeOff Manager - System zarządzania wnioskami
+            </p>
+        </div>
+    </body>
+    </html>
+    """
+
+    return subject, html
+
+
+def old_decision_html(employee_name, request_data, decision, comment=None):
+    if decision == 'zaakceptowany':
+        subject = f"✅ Wniosek zaakceptowany - {request_data['date']}"
+        color = "#10b981"
+        emoji = "✅"
+        message = "Twój wniosek został zaakceptowany."
+        bg_color = "#d1fae5"
+    else:
+        subject = f"❌ Wniosek odrzucony - {request_data['date']}"
+        color = "#ef4444"
+        emoji = "❌"
+        message = "Twój wniosek został odrzucony."
+        bg_color = "#fee2e2"
+
+    comment_section = ""
+    if comment:
+        comment_section = f"""
+        <div style="background: {bg_color}; border-left: 4px solid {color}; padding: 15px; border-radius: 8px; margin-top: 20px;">
+            <p style="margin: 0; color: #1e293b;"><strong>Komentarz managera:</strong> {comment}</p>
+        </div>
+        """
+
+    html = f"""
+    <html>
+    <body style="font-family: Arial, sans-serif; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 40px;">
+        <div style="max-width: 600px; margin: 0 auto; background: white; border-radius: 20px; padding: 40px; box-shadow: 0 10px 40px rgba(0,0,0,0.1);">
+            <div style="text-align: center; margin-bottom: 30px;">
+                <h1 style="color: {color}; font-size: 48px; margin: 0;">{emoji}</h1>
+                <h2 style="color: #1e293b; margin: 10px 0; text-transform: uppercase; font-size: 20px;">Wniosek {decision}</h2>
+            </div>
+
+            <div style="background: #f8fafc; border-radius: 12px; padding: 20px; margin-bottom: 20px;">
+                <p style="margin: 10px 0; color: #475569;"><strong style="color: #1e293b;">Pracownik:</strong> {employee_name}</p>
+                <p style="margin: 10px 0; color: #475569;"><strong style="color: #1e293b;">Data:</strong> {request_data['date']}</p>
+                <p style="margin: 10px 0; color: #475569;"><strong style="color: #1e293b;">Wyjście:</strong> {request_data['time_out']}</p>
+                <p style="margin: 10px 0; color: #475569;"><strong style="color: #1e293b;">Powrót:</strong> {request_data['time_return']}</p>
+            </div>
+
+            {comment_section}
+
+            <p style="margin-top: 30px; text-align: center; color: #94a3b8; font-size: 12px;">
+                TimeOff Manager - System zarządzania wnioskami
+            </p>
+        </div>
+    </body>
+    </html>
+    """
+
+    return subject, html
+
+
+def sample(i):
+    request_data = {
+        'date': '2025-10-15',
+        'time_out': '10:00',
+        'time_return': '12:00',
+        'reason': f'Wizyta u lekarza - kontrola okresowa #{i} <pilne> & "ważne"'
+    }
+    return f'Jan Kowalski {i}', request_data
+
+
+def render_before(n):
+    for i in range(n):
+        name, data = sample(i)
+        old_new_request_html(name, data)
+        old_decision_html(name, data, 'odrzucony', 'Brak zastępstwa <b>w dziale</b>')
+
+
+def render_after(n):
+    app_url = get_app_url()
+    for i in range(n):
+        name, data = sample(i)
+        render_email('new_request', employee_name=name, request_data=data, app_url=app_url)
+        render_email('decision', employee_name=name, request_data=data, decision='odrzucony',
+                     comment='Brak zastępstwa <b>w dziale</b>', style=DECISION_STYLES['odrzucony'])
+
+
+def timed(fn, n):
+    start = time.perf_counter()
+    fn(n)
+    return time.perf_counter() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    compile_time = timed(render_after, 1)
+    print(f"template compilation (first render, once per process): {compile_time * 1000:.1f} ms\n")
+
+    before = timed(render_before, n)
+    after = timed(render_after, n)
+    per = lambda elapsed: elapsed / (2 * n) * 1e6
+    print(f"{2 * n:,} emails")
+    print(f"  before (f-string, HTML only)      {before * 1000:8.1f} ms  {per(before):6.1f} us/email")
+    print(f"  after  (templates, HTML + text)   {after * 1000:8.1f} ms  {per(after):6.1f} us/email")
+    print(f"\n  templates cost {per(after) - per(before):.1f} us/email more - for comparison, one SMTP"
+          f"\n  send is milliseconds (see bench_smtp_pool.py)")
+
+
+if __name__ == '__main__':
+    main()
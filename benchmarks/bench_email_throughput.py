@@ -0,0 +1,192 @@
+"""
+Benchmark: end-to-end email delivery throughput
+
+Drives the real delivery paths against a local stand-in SMTP server
+(benchmarks/smtp_sink.py) instead of a live mail host:
+- send_email:     one call per message (SMTP config cache + pooled session)
+- decision:       send_decision_email - template rendering + send_email
+- send_emails:    batches of --batch messages over one pooled session
+- outbox:         enqueue_email('decision', ...) rows drained by
+                  deliver_pending(), as email_worker.py does
+
+For each path it reports messages/second, p50/p99 latency of one call
+(one message, or one batch for send_emails/outbox), and the SMTP
+connections and logins the sink saw. --threads calls the direct paths
+from several threads at once, like gunicorn gthread workers.
+
+Usage:
+    python benchmarks/bench_email_throughput.py                 # 500 messages, 2 ms/reply
+    python benchmarks/bench_email_throughput.py 2000 --latency 0.01 --threads 4
+
+Runs against a temporary SQLite database unless BENCH_DATABASE_URL is set
+(use a scratch database - tables are created and dropped).
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+os.environ['DATABASE_URL'] = os.getenv('BENCH_DATABASE_URL', 'sqlite:///:memory:')
+
+from app import create_app
+from models import db, SmtpConfig, EmailOutbox
+from security import encrypt_password
+from services.email_outbox import enqueue_email, deliver_pending
+from services.email_service import (
+    send_email, send_emails, send_decision_email, render_email, smtp_pool, smtp_config_cache
+)
+from smtp_sink import SMTPSink
+
+REQUEST_DATA = {
+    'date': '2026-10-20',
+    'time_out': '10:00',
+    'time_return': '12:30',
+    'reason': 'Wizyta u lekarza - kontrola okresowa'
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def configure_smtp(port):
+    """Point the stored SMTP configuration at the sink"""
+    db.session.query(SmtpConfig).delete()
+    db.session.add(SmtpConfig(
+        server='127.0.0.1', port=port, use_ssl=False, login='bench',
+        password=encrypt_password('bench-password'), email_from='noreply@firma.pl'
+    ))
+    db.session.commit()
+    smtp_config_cache.invalidate()
+
+
+def call_in_threads(app, calls, threads):
+    """Run the callables on `threads` threads, return per-call latencies"""
+    latencies = []
+    lock = threading.Lock()
+    it = iter(calls)
+
+    def worker():
+        with app.app_context():
+            local = []
+            while True:
+                with lock:
+                    fn = next(it, None)
+                if fn is None:
+                    break
+                start = time.perf_counter()
+                fn()
+                local.append(time.perf_counter() - start)
+            with lock:
+                latencies.extend(local)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return latencies
+
+
+def run(label, sink, messages, fn):
+    """Reset counters, run fn() -> latencies and print one result line"""
+    smtp_pool.close_all()
+    sink.reset()
+    start = time.perf_counter()
+    # The send paths print one line per email
+    with contextlib.redirect_stdout(io.StringIO()):
+        latencies = fn()
+    elapsed = time.perf_counter() - start
+    stats = sink.stats()
+    print(f"  {label:<12} {stats['messages'] / elapsed:8.1f} msg/s  "
+          f"p50 {percentile(latencies, 50) * 1000:7.2f} ms  "
+          f"p99 {percentile(latencies, 99) * 1000:7.2f} ms  "
+          f"connections={stats['connections']:<4} logins={stats['logins']}")
+    if stats['messages'] != messages:
+        print(f"  ⚠️  sink received {stats['messages']} of {messages} messages")
+
+
+def bench_outbox(n, batch_size):
+    """Enqueue n decision emails in one transaction, then drain the outbox"""
+    db.session.query(EmailOutbox).delete()
+    for i in range(n):
+        enqueue_email('decision', f'user{i}@firma.pl', employee_name=f'Pracownik {i}',
+                      request_data=REQUEST_DATA, decision='zaakceptowany', comment=None)
+    db.session.commit()
+
+    latencies = []
+    while True:
+        start = time.perf_counter()
+        result = deliver_pending(batch_size)
+        if not result['processed']:
+            break
+        latencies.append(time.perf_counter() - start)
+        db.session.remove()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('messages', type=int, nargs='?', default=500)
+    parser.add_argument('--latency', type=float, default=0.002,
+                        help='seconds added to every SMTP reply')
+    parser.add_argument('--threads', type=int, default=1,
+                        help='concurrent callers for the direct send paths')
+    parser.add_argument('--batch', type=int, default=50,
+                        help='messages per send_emails call / outbox batch')
+    args = parser.parse_args()
+    n = args.messages
+
+    app = create_app()
+    with app.app_context(), SMTPSink(latency=args.latency) as sink:
+        db.create_all()
+        configure_smtp(sink.port)
+        html, text = render_email('decision', employee_name='Jan Kowalski', request_data=REQUEST_DATA,
+                                  decision='zaakceptowany', comment=None,
+                                  style={'emoji': '✅', 'color': '#10b981', 'bg_color': '#d1fae5',
+                                         'message': 'Twój wniosek został zaakceptowany.'})
+
+        print(f"{n} messages, {args.latency * 1000:.1f} ms per SMTP reply, "
+              f"{args.threads} thread(s), batch {args.batch}\n")
+
+        run('send_email', sink, n, lambda: call_in_threads(app, [
+            (lambda i=i: send_email(f'user{i}@firma.pl', f'Wniosek #{i}', html, text))
+            for i in range(n)
+        ], args.threads))
+
+        run('decision', sink, n, lambda: call_in_threads(app, [
+            (lambda i=i: send_decision_email(f'user{i}@firma.pl', f'Pracownik {i}', REQUEST_DATA,
+                                             'zaakceptowany' if i % 2 else 'odrzucony',
+                                             None if i % 2 else 'Brak zastępstwa'))
+            for i in range(n)
+        ], args.threads))
+
+        batches = [
+            [(f'user{i}@firma.pl', f'Wniosek #{i}', html, text)
+             for i in range(start, min(start + args.batch, n))]
+            for start in range(0, n, args.batch)
+        ]
+        run('send_emails', sink, n, lambda: call_in_threads(app, [
+            (lambda batch=batch: send_emails(batch)) for batch in batches
+        ], args.threads))
+
+        run('outbox', sink, n, lambda: bench_outbox(n, args.batch))
+
+        print(f"\n  smtp_pool: {smtp_pool.stats()}")
+        smtp_pool.close_all()
+        db.session.remove()
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,207 @@
+"""
+Benchmark: input validation helpers in security.py
+
+Compares the previous implementations (regexes compiled from string
+literals on every call, one round of four re.sub passes) with the current
+ones (module-level compiled patterns, forward-only scanners) for
+sanitize_input, validate_sql_injection, validate_email and
+validate_password_strength:
+
+- realistic:    short request reasons, comments, emails and passwords,
+                microseconds per call. sanitize_input repeats its passes
+                until nothing changes: text with markup to remove takes at
+                least two rounds, which makes the attack samples somewhat
+                slower, but constructs the single round left behind (last
+                attack sample) are removed too.
+- adversarial:  inputs that make a backtracking regex rescan the text
+                from every position (unclosed <script>, long "onon..."
+                words, "OR OR ..." without "="), plus nesting that needs
+                one more round per level, at growing sizes. The current
+                functions stay linear: time per character is flat. The
+                previous ones are quadratic and are skipped where a call
+                would take longer than --budget seconds.
+
+No database is needed.
+
+Usage:
+    python benchmarks/bench_input_validation.py                  # up to 100k chars
+    python benchmarks/bench_input_validation.py 1000 10000 1000000
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+
+from security import sanitize_input, validate_sql_injection, validate_email, validate_password_strength
+
+
+# Previous implementation (security.py before the compiled patterns)
+
+
+def old_validate_email(email):
+    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    return re.match(pattern, email) is not None
+
+
+def old_validate_password_strength(password):
+    if len(password) < 8:
+        return False, "Hasło musi mieć minimum 8 znaków"
+    if not re.search(r'[A-Z]', password):
+        return False, "Hasło musi zawierać przynajmniej jedną wielką literę"
+    if not re.search(r'[a-z]', password):
+        return False, "Hasło musi zawierać przynajmniej jedną małą literę"
+    if not re.search(r'\d', password):
+        return False, "Hasło musi zawierać przynajmniej jedną cyfrę"
+    return True, "OK"
+
+
+def old_sanitize_input(text):
+    if not text:
+        return text
+    text = re.sub(r'<script[^>]*>.*?</script>', '', text, flags=re.IGNORECASE | re.DOTALL)
+    text = re.sub(r'<iframe[^>]*>.*?</iframe>', '', text, flags=re.IGNORECASE | re.DOTALL)
+    text = re.sub(r'javascript:', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'on\w+\s*=', '', text, flags=re.IGNORECASE)
+    return text.strip()
+
+
+def old_validate_sql_injection(text):
+    if not text:
+        return True
+    patterns = [
+        r"(\b(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC|EXECUTE)\b)",
+        r"(--|\;|\/\*|\*\/)",
+        r"(\bOR\b.*=.*)",
+        r"(\bAND\b.*=.*)"
+    ]
+    for pattern in patterns:
+        if re.search(pattern, str(text), re.IGNORECASE):
+            return False
+    return True
+
+
+FUNCTIONS = {
+    'sanitize_input': (old_sanitize_input, sanitize_input),
+    'validate_sql_injection': (old_validate_sql_injection, validate_sql_injection),
+    'validate_email': (old_validate_email, validate_email),
+    'validate_password_strength': (old_validate_password_strength, validate_password_strength),
+}
+
+REALISTIC = {
+    'sanitize_input': [
+        'Wizyta u lekarza - kontrola okresowa',
+        'Odbiór dziecka z przedszkola, wracam ok. 14:30',
+        'Brak zastępstwa na zmianie, proszę przełożyć na przyszły tydzień.',
+        'Spotkanie z klientem <b>ABC</b> w centrum',
+    ],
+    'sanitize_input (attacks)': [
+        '<img src=x onerror=alert(1)> pilne',
+        'Urząd skarbowy <script>fetch("//evil")</script> 10:00-11:00',
+        '<a href="java<script></script>script:alert(1)">link</a>',
+    ],
+    'validate_sql_injection': [
+        'Wizyta u lekarza - kontrola okresowa',
+        'Odbiór dziecka z przedszkola, wracam ok. 14:30',
+        'Jan or Anna will cover the shift',
+        "x' OR 1=1",
+        'Robert; DROP TABLE requests',
+    ],
+    'validate_email': [
+        'jan.kowalski@firma.pl',
+        'anna.nowak+urlop@dzial-hr.firma.com.pl',
+        'not-an-email',
+        'a@b.c',
+    ],
+    'validate_password_strength': [
+        'Haslo123',
+        'krotkie',
+        'dlugiehaslobezcyfr',
+        'Bardzo-Dlugie-Haslo-2026!',
+    ],
+}
+
+# name -> (function, generator of an input of about n characters)
+ADVERSARIAL = {
+    'unclosed <script>': ('sanitize_input', lambda n: '<script>' * (n // 8)),
+    '"onon..." no "=" after it': ('sanitize_input', lambda n: 'on' * (n // 2) + ' x=1'),
+    'nested javascript:': ('sanitize_input', lambda n: 'java' * (n // 15) + 'script:' * (n // 15)),
+    'nested on...=': ('sanitize_input', lambda n: 'o' * (n // 8) + 'nerror=' * (n // 8)),
+    '"OR OR ..." no "="': ('validate_sql_injection', lambda n: 'OR ' * (n // 3)),
+    'OR lines, "=" at end': ('validate_sql_injection', lambda n: ('x OR y ' * 10 + '\n') * (n // 71) + '='),
+    'domain "a.a.a...!"': ('validate_email', lambda n: 'a@' + 'a.' * (n // 2) + '!'),
+    'lowercase only': ('validate_password_strength', lambda n: 'a' * n),
+}
+
+
+def per_call(fn, inputs, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for value in inputs:
+            fn(value)
+    return (time.perf_counter() - start) / (repeat * len(inputs))
+
+
+def bench_realistic(repeat):
+    print("Realistic inputs (µs per call)\n")
+    print(f"  {'':<28} {'before':>9} {'after':>9}")
+    for name, inputs in REALISTIC.items():
+        old, new = FUNCTIONS[name.split(' ')[0]]
+        before = per_call(old, inputs, repeat)
+        after = per_call(new, inputs, repeat)
+        print(f"  {name:<28} {before * 1e6:9.2f} {after * 1e6:9.2f}   {before / after:.1f}x")
+
+
+def timed(fn, text, last, budget):
+    """
+    Seconds for fn(text), or None when the last timed call (length, seconds)
+    scaled quadratically to len(text) would exceed the budget
+    """
+    if last and last[1] * (len(text) / last[0]) ** 2 > budget:
+        return None
+    start = time.perf_counter()
+    fn(text)
+    return time.perf_counter() - start
+
+
+def bench_adversarial(sizes, budget):
+    print("\nAdversarial inputs (ms per call; ns per character)\n")
+    for label, (name, generate) in ADVERSARIAL.items():
+        old, new = FUNCTIONS[name]
+        print(f"  {label} - {name}")
+        last_before = last_after = None  # (length, seconds) of the last timed call
+        for n in sizes:
+            text = generate(n)
+            after = timed(new, text, last_after, budget)
+            before = timed(old, text, last_before, budget)
+            if after is not None:
+                last_after = (len(text), after)
+                after_col = f"{after * 1000:9.2f} ms  ({after / len(text) * 1e9:6.0f} ns/char)"
+            else:
+                after_col = f"{'skipped':>12}"
+            if before is not None:
+                last_before = (len(text), before)
+                before_col = f"{before * 1000:9.1f} ms"
+            else:
+                before_col = f"{'skipped':>12}"
+            print(f"    {len(text):>9,} chars   before {before_col}   after {after_col}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('sizes', type=int, nargs='*', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=2000,
+                        help='calls per realistic input')
+    parser.add_argument('--budget', type=float, default=2.0,
+                        help='skip previous-implementation calls expected to take longer (seconds)')
+    args = parser.parse_args()
+
+    bench_realistic(args.repeat)
+    bench_adversarial(args.sizes, args.budget)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark: JSON encoding of /api/requests and /api/audit-logs payloads
+
+Compares:
+- before:          Flask DefaultJSONProvider, every date pre-formatted
+                   with isoformat() in to_dict()
+- after (json):    FastJSONProvider stdlib fallback, raw date/datetime values
+- after (orjson):  FastJSONProvider with orjson, raw date/datetime values
+
+Only encoding is measured (no database). Dict construction is included,
+since pre-formatting dates is part of the "before" cost.
+
+Usage:
+    python benchmarks/bench_json_provider.py          # 10k rows
+    python benchmarks/bench_json_provider.py 1000 100000
+"""
+import os
+import sys
+import time
+from datetime import datetime, date, time as dtime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+import json_provider
+from json_provider import FastJSONProvider
+
+
+def request_rows(n):
+    now = datetime(2025, 10, 1, 8, 0, 0, 123456)
+    return [
+        (i, 100 + i % 400, 'Jan', 'Kowalski', 'jan.kowalski@firma.pl',
+         2, 'Anna', 'Nowak', 'anna.nowak@firma.pl',
+         date(2025, 10, 1) + timedelta(days=i % 30), dtime(10, 0), dtime(12, 30),
+         'Wizyta u lekarza - kontrola okresowa', 'zaakceptowany',
+         now - timedelta(seconds=i), now, 'OK')
+        for i in range(n)
+    ]
+
+
+def audit_rows(n):
+    now = datetime(2025, 10, 1, 8, 0, 0, 123456)
+    return [
+        (i, 100 + i % 400, 'Jan Kowalski', 'USER_LOGIN',
+         'User jan.kowalski@firma.pl logged in', now - timedelta(seconds=i))
+        for i in range(n)
+    ]
+
+
+def request_dicts(rows, fmt):
+    return [
+        {
+            'id': rid,
+            'employee': {'id': eid, 'name': f"{ef} {el}", 'email': ee},
+            'manager': {'id': mid, 'name': f"{mf} {ml}", 'email': me},
+            'date': fmt(d),
+            'time_out': t_out.strftime('%H:%M'),
+            'time_return': t_ret.strftime('%H:%M'),
+            'reason': reason,
+            'status': status,
+            'created_at': fmt(created),
+            'decision_date': fmt(decided),
+            'manager_comment': comment
+        }
+        for (rid, eid, ef, el, ee, mid, mf, ml, me, d, t_out, t_ret,
+             reason, status, created, decided, comment) in rows
+    ]
+
+
+def audit_dicts(rows, fmt):
+    return [
+        {'id': lid, 'user_id': uid, 'user': name, 'action': action,
+         'details': details, 'timestamp': fmt(ts)}
+        for (lid, uid, name, action, details, ts) in rows
+    ]
+
+
+def best_of(fn, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000]
+    app = Flask(__name__)
+    default = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    orjson_module = json_provider.orjson
+
+    iso = lambda value: value.isoformat() if value else None
+    raw = lambda value: value
+
+    for n in sizes:
+        print(f"\n{n:,} rows")
+        for label, rows, build in (
+            ('/api/requests', request_rows(n), request_dicts),
+            ('/api/audit-logs', audit_rows(n), audit_dicts),
+        ):
+            before = best_of(lambda: default.dumps(build(rows, iso)))
+            print(f"  {label:<16} before (default)  {before * 1000:8.1f} ms")
+
+            json_provider.orjson = None
+            stdlib = best_of(lambda: fast.dumps(build(rows, raw)))
+            print(f"  {label:<16} after (json)      {stdlib * 1000:8.1f} ms"
+                  f"   {before / stdlib:.2f}x")
+
+            json_provider.orjson = orjson_module
+            if orjson_module:
+                fastest = best_of(lambda: fast.dumps(build(rows, raw)))
+                print(f"  {label:<16} after (orjson)    {fastest * 1000:8.1f} ms"
+                      f"   {before / fastest:.2f}x")
+            else:
+                print(f"  {label:<16} after (orjson)    not installed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""
+Benchmark: ORM vs column-projection serialization of list endpoints
+
+Compares, for GET /api/requests and GET /api/users:
+- ORM path:        eager-loaded instances + to_dict()
+- projection path: projections.*_list_select() tuples + serialize_*_rows()
+
+Both paths include JSON encoding with the app's JSON provider.
+
+Usage:
+    python benchmarks/bench_list_serialization.py            # 10k and 100k rows
+    python benchmarks/bench_list_serialization.py 5000 50000
+
+Runs against a temporary SQLite database unless BENCH_DATABASE_URL is set
+(use a scratch database - tables are created and filled with fake data).
+"""
+import os
+import sys
+import time
+from datetime import datetime, date, time as dtime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+os.environ['DATABASE_URL'] = os.getenv('BENCH_DATABASE_URL', 'sqlite:///:memory:')
+
+from sqlalchemy.orm import joinedload
+from app import create_app
+from models import db, User, Request
+from projections import (
+    request_list_select, serialize_request_rows,
+    user_list_select, serialize_user_rows, fetch_rows
+)
+
+USERS = 500
+
+
+def seed(rows):
+    """Create USERS users and `rows` requests"""
+    db.drop_all()
+    db.create_all()
+
+    now = datetime.utcnow()
+    users = [
+        {
+            'id': i + 1,
+            'email': f'user{i}@firma.pl',
+            'password_hash': 'x',
+            'first_name': f'Imię{i}',
+            'last_name': f'Nazwisko{i}',
+            'role': 'manager' if i < 50 else 'pracownik',
+            'supervisor_id': None if i < 50 else (i % 50) + 1,
+            'created_at': now - timedelta(days=i),
+            'is_active': True,
+        }
+        for i in range(USERS)
+    ]
+    db.session.execute(User.__table__.insert(), users)
+
+    batch = []
+    for i in range(rows):
+        employee_id = 51 + (i % (USERS - 50))
+        batch.append({
+            'employee_id': employee_id,
+            'manager_id': ((employee_id - 1) % 50) + 1,
+            'date': date(2025, 1, 1) + timedelta(days=i % 365),
+            'time_out': dtime(10, 0),
+            'time_return': dtime(12, 30),
+            'reason': 'Wizyta u lekarza - kontrola okresowa',
+            'status': ('oczekujący', 'zaakceptowany', 'odrzucony')[i % 3],
+            'created_at': now - timedelta(seconds=i),
+            'decision_date': None if i % 3 == 0 else now,
+            'manager_comment': 'Brak zastępstwa' if i % 3 == 2 else None,
+        })
+        if len(batch) == 10000:
+            db.session.execute(Request.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.session.execute(Request.__table__.insert(), batch)
+    db.session.commit()
+
+
+def timed(label, fn, app, repeat=3):
+    """Run fn `repeat` times and print the best wall time"""
+    best = None
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        payload = app.json.dumps(fn())
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"  {label:<28} {best * 1000:9.1f} ms   ({len(payload) / 1024:,.0f} KiB)")
+    return best
+
+
+def run(app, rows):
+    seed(rows)
+    print(f"\n{rows:,} requests / {USERS} users")
+
+    orm = timed('requests ORM + to_dict', lambda: [
+        r.to_dict() for r in
+        Request.with_parties(Request.query).order_by(Request.created_at.desc()).all()
+    ], app)
+    proj = timed('requests projection', lambda: serialize_request_rows(
+        fetch_rows(request_list_select().order_by(Request.created_at.desc()))
+    ), app)
+    print(f"  speedup: {orm / proj:.2f}x")
+
+    orm = timed('users ORM + to_dict', lambda: [
+        u.to_dict() for u in
+        User.query.options(joinedload(User.supervisor)).order_by(User.created_at.desc()).all()
+    ], app)
+    proj = timed('users projection', lambda: serialize_user_rows(
+        fetch_rows(user_list_select().order_by(User.created_at.desc()))
+    ), app)
+    print(f"  speedup: {orm / proj:.2f}x")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+    app = create_app()
+    with app.app_context():
+        for rows in sizes:
+            run(app, rows)
+        db.drop_all()
+
+
+if __name__ == '__main__':
+    main()
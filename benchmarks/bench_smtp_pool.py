@@ -0,0 +1,95 @@
+"""
+Benchmark: SMTP delivery with and without the connection pool
+
+Sends N messages to a local stand-in SMTP server (benchmarks/smtp_sink.py)
+and compares:
+- before:  a new connection + AUTH + QUIT per message (previous send_email)
+- pooled:  SMTPConnectionPool.send_messages, one message per call
+           (what send_email / the outbox worker do)
+- batch:   SMTPConnectionPool.send_messages with all messages in one call
+
+No database is needed - the SMTP configuration is built in memory.
+--latency adds a delay to every server reply to mimic a remote host.
+
+Usage:
+    python benchmarks/bench_smtp_pool.py                 # 200 messages, 2 ms/reply
+    python benchmarks/bench_smtp_pool.py 500 --latency 0.01
+"""
+import argparse
+import os
+import smtplib
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+
+from security import encrypt_password, decrypt_password
+from services.email_service import SMTPConnectionPool, SmtpSettings, build_message
+from smtp_sink import SMTPSink
+
+
+def make_messages(smtp_config, n):
+    return [
+        build_message(smtp_config, f'user{i}@firma.pl', f'Wniosek #{i}',
+                      f'<p>Wniosek #{i} zaakceptowany</p>')
+        for i in range(n)
+    ]
+
+
+def send_unpooled(smtp_config, encrypted_password, messages):
+    """Previous behaviour: connect, login, send, quit - per message"""
+    for msg in messages:
+        server = smtplib.SMTP(smtp_config.server, smtp_config.port)
+        server.login(smtp_config.login, decrypt_password(encrypted_password))
+        server.send_message(msg)
+        server.quit()
+
+
+def send_pooled(pool, smtp_config, messages):
+    for msg in messages:
+        pool.send_messages(smtp_config, [msg])
+
+
+def run(label, sink, fn):
+    sink.reset()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    stats = sink.stats()
+    print(f"  {label:<8} {elapsed * 1000:9.1f} ms  {stats['messages'] / elapsed:8.1f} msg/s  "
+          f"connections={stats['connections']:<4} logins={stats['logins']}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('messages', type=int, nargs='?', default=200)
+    parser.add_argument('--latency', type=float, default=0.002,
+                        help='seconds added to every SMTP reply')
+    args = parser.parse_args()
+
+    with SMTPSink(latency=args.latency) as sink:
+        # `before` decrypts the stored password per message, as send_email did
+        encrypted_password = encrypt_password('bench-password')
+        smtp_config = SmtpSettings('127.0.0.1', sink.port, False, 'bench',
+                                   'bench-password', 'noreply@firma.pl')
+        messages = make_messages(smtp_config, args.messages)
+        print(f"{args.messages} messages, {args.latency * 1000:.1f} ms per SMTP reply\n")
+
+        before = run('before', sink, lambda: send_unpooled(smtp_config, encrypted_password, messages))
+
+        pool = SMTPConnectionPool(max_idle=2, idle_timeout=60, noop_after=5)
+        pooled = run('pooled', sink, lambda: send_pooled(pool, smtp_config, messages))
+        pool.close_all()
+
+        pool = SMTPConnectionPool(max_idle=2, idle_timeout=60, noop_after=5)
+        batch = run('batch', sink, lambda: pool.send_messages(smtp_config, messages))
+        pool.close_all()
+
+        print(f"\n  pooled: {before / pooled:.1f}x, batch: {before / batch:.1f}x faster than before")
+
+
+if __name__ == '__main__':
+    main()
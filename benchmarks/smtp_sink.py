@@ -0,0 +1,118 @@
+"""
+Local SMTP stand-in for benchmarks
+
+A minimal threaded SMTP server that accepts EHLO/HELO, AUTH PLAIN/LOGIN,
+MAIL, RCPT, DATA, NOOP, RSET and QUIT, discards the messages and counts
+connections, logins and messages. `latency` adds a delay to every reply,
+to approximate the round trip to a real mail host. Setting `stall` makes
+it accept connections and never answer, like a hung mail host.
+
+    with SMTPSink(latency=0.005) as sink:
+        ... send to 127.0.0.1:sink.port ...
+        print(sink.stats())
+"""
+import socketserver
+import threading
+import time
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def reply(self, line):
+        if self.server.sink.latency:
+            time.sleep(self.server.sink.latency)
+        self.wfile.write(line.encode() + b'\r\n')
+        self.wfile.flush()
+
+    def handle(self):
+        sink = self.server.sink
+        sink._count('connections')
+        if sink.stall:
+            # Hold the connection open without a greeting until the client gives up
+            while self.rfile.readline():
+                pass
+            return
+        self.reply('220 localhost SMTP sink')
+
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode('utf-8', 'replace').strip()
+            verb = command.split(' ', 1)[0].upper()
+
+            if verb == 'EHLO':
+                self.wfile.write(b'250-localhost\r\n250-AUTH PLAIN LOGIN\r\n')
+                self.reply('250 8BITMIME')
+            elif verb == 'HELO':
+                self.reply('250 localhost')
+            elif verb == 'AUTH':
+                if command.upper().startswith('AUTH LOGIN'):
+                    # Username and password prompts
+                    self.reply('334 VXNlcm5hbWU6')
+                    self.rfile.readline()
+                    self.reply('334 UGFzc3dvcmQ6')
+                    self.rfile.readline()
+                sink._count('logins')
+                self.reply('235 Authentication successful')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while True:
+                    data = self.rfile.readline()
+                    if not data or data in (b'.\r\n', b'.\n'):
+                        break
+                sink._count('messages')
+                self.reply('250 OK queued')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                # MAIL, RCPT, NOOP, RSET, ...
+                self.reply('250 OK')
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class SMTPSink:
+    """Threaded SMTP server on 127.0.0.1 (random port) that discards mail"""
+
+    def __init__(self, latency=0.0, stall=False):
+        self.latency = latency
+        self.stall = stall
+        self._lock = threading.Lock()
+        self._counters = {'connections': 0, 'logins': 0, 'messages': 0}
+        self._server = _Server(('127.0.0.1', 0), _Handler)
+        self._server.sink = self
+        self.port = self._server.server_address[1]
+        self._thread = None
+
+    def _count(self, name):
+        with self._lock:
+            self._counters[name] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self):
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
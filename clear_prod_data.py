@@ -12,7 +12,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app import create_app
-from models import db, User, Request, SmtpConfig, AuditLog
+from models import db, User, Request, SmtpConfig, AuditLog, EmailOutbox
 
 
 def confirm_cleanup():
@@ -25,6 +25,7 @@ def confirm_cleanup():
     print("  - Wszystkie wnioski")
     print("  - Wszystkie logi audytowe")
     print("  - Konfigurację SMTP")
+    print("  - Kolejkę emaili (email_outbox)")
     print("\nBaza będzie PUSTA i gotowa do produkcji.\n")
 
     confirmation = input("Czy na pewno kontynuować? Wpisz 'TAK' aby potwierdzić: ")
@@ -43,7 +44,8 @@ def clear_production_data():
         print("\n🗑️  Usuwanie danych z bazy...")
 
         try:
-            # Delete all records
+            # Delete all records (in one transaction)
+            deleted_emails = EmailOutbox.query.delete()
             deleted_requests = Request.query.delete()
             deleted_logs = AuditLog.query.delete()
             deleted_smtp = SmtpConfig.query.delete()
@@ -56,6 +58,7 @@ def clear_production_data():
             print(f"   - {deleted_requests} wniosków")
             print(f"   - {deleted_logs} logów audytowych")
             print(f"   - {deleted_smtp} konfiguracji SMTP")
+            print(f"   - {deleted_emails} emaili z kolejki")
 
             print("\n🎉 Baza danych wyczyszczona!")
             print("\n📋 Następne kroki:")
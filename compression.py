@@ -0,0 +1,132 @@
+"""
+Response compression (gzip, and brotli when installed)
+
+Compression is negotiated via Accept-Encoding and applied only to
+compressible, non-streamed responses above COMPRESS_MIN_SIZE bytes.
+SSE and other streamed responses are never buffered or compressed.
+Static files served through send_precompressed() are compressed once per
+file version at the highest level and served from memory afterwards.
+"""
+import gzip
+import mimetypes
+import os
+import threading
+from flask import request, current_app, send_from_directory, abort
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/csv',
+    'image/svg+xml',
+}
+
+_static_cache = {}
+_static_cache_lock = threading.Lock()
+
+
+def choose_encoding():
+    """Pick best supported encoding from Accept-Encoding ('br', 'gzip' or None)"""
+    accepted = request.accept_encodings
+    if brotli and accepted.quality('br') > 0:
+        return 'br'
+    if accepted.quality('gzip') > 0:
+        return 'gzip'
+    return None
+
+
+def compress(data, encoding, level):
+    """Compress bytes with the given encoding at the given level"""
+    if encoding == 'br':
+        # Brotli quality scale is 0-11, gzip 1-9
+        return brotli.compress(data, quality=min(11, level))
+    return gzip.compress(data, compresslevel=min(9, level))
+
+
+def _should_compress(response):
+    if response.direct_passthrough or response.is_streamed:
+        return False
+    if response.status_code < 200 or response.status_code in (204, 206, 304):
+        return False
+    if 'Content-Encoding' in response.headers:
+        return False
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return False
+    return response.content_length is not None and \
+        response.content_length >= current_app.config['COMPRESS_MIN_SIZE']
+
+
+def compress_response(response):
+    """after_request hook - compress eligible responses"""
+    if not _should_compress(response):
+        return response
+
+    # Responses of the same resource differ by encoding, even when not compressed
+    response.vary.add('Accept-Encoding')
+
+    encoding = choose_encoding()
+    if not encoding:
+        return response
+
+    response.set_data(compress(response.get_data(), encoding, current_app.config['COMPRESS_LEVEL']))
+    response.headers['Content-Encoding'] = encoding
+
+    # Compressed bytes differ from the identity representation
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def send_precompressed(directory, filename):
+    """
+    Serve a static file, compressed once per (file, mtime, encoding)
+
+    Args:
+        directory: Directory relative to the application root
+        filename: File name inside the directory
+
+    Returns:
+        Response with precompressed body when the client accepts it
+    """
+    encoding = choose_encoding()
+    if not encoding:
+        response = send_from_directory(directory, filename)
+        response.vary.add('Accept-Encoding')
+        return response
+
+    path = safe_join(os.path.join(current_app.root_path, directory), filename)
+    if not path or not os.path.isfile(path):
+        abort(404)
+
+    mtime = os.path.getmtime(path)
+    key = (path, encoding)
+    cached = _static_cache.get(key)
+    if not cached or cached[0] != mtime:
+        with open(path, 'rb') as f:
+            body = compress(f.read(), encoding, 11)
+        cached = (mtime, body)
+        with _static_cache_lock:
+            _static_cache[key] = cached
+
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    response = current_app.response_class(cached[1], mimetype=mimetype)
+    response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.last_modified = mtime
+    response.set_etag(f"{int(mtime * 1000)}-{len(cached[1])}-{encoding}", weak=True)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def init_compression(app):
+    """Register response compression on the Flask app"""
+    app.after_request(compress_response)
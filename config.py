@@ -25,6 +25,86 @@ class Config:
     SMTP_PASSWORD = os.getenv('SMTP_PASSWORD')
     EMAIL_FROM = os.getenv('EMAIL_FROM')
 
+    # SMTP connection pool (per process)
+    SMTP_POOL_SIZE = int(os.getenv('SMTP_POOL_SIZE', 2))
+    SMTP_POOL_IDLE_SECONDS = int(os.getenv('SMTP_POOL_IDLE_SECONDS', 60))
+    SMTP_POOL_NOOP_AFTER = int(os.getenv('SMTP_POOL_NOOP_AFTER', 5))
+    # Cached SMTP configuration (invalidated on change, TTL as a safety net)
+    SMTP_CONFIG_TTL = int(os.getenv('SMTP_CONFIG_TTL', 300))
+    # SMTP timeouts (seconds) - connect and each command once connected
+    SMTP_CONNECT_TIMEOUT = float(os.getenv('SMTP_CONNECT_TIMEOUT', 10))
+    SMTP_COMMAND_TIMEOUT = float(os.getenv('SMTP_COMMAND_TIMEOUT', 30))
+    # SMTP circuit breaker (per process): after SMTP_BREAKER_THRESHOLD failures
+    # in a row, sends fail fast for SMTP_BREAKER_COOLDOWN seconds
+    SMTP_BREAKER_THRESHOLD = int(os.getenv('SMTP_BREAKER_THRESHOLD', 3))
+    SMTP_BREAKER_COOLDOWN = int(os.getenv('SMTP_BREAKER_COOLDOWN', 60))
+
+    # Email outbox (email_worker.py)
+    EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', 20))
+    # EMAIL_OUTBOX_LEASE_SECONDS: how long a claimed batch belongs to one worker -
+    # it stops sending when the lease runs out, and a dead worker's batch is
+    # picked up again after it
+    EMAIL_OUTBOX_LEASE_SECONDS = int(os.getenv('EMAIL_OUTBOX_LEASE_SECONDS', 300))
+    EMAIL_MAX_ATTEMPTS = int(os.getenv('EMAIL_MAX_ATTEMPTS', 8))
+    EMAIL_RETRY_BASE_SECONDS = int(os.getenv('EMAIL_RETRY_BASE_SECONDS', 30))
+    EMAIL_RETRY_MAX_SECONDS = int(os.getenv('EMAIL_RETRY_MAX_SECONDS', 3600))
+    EMAIL_WORKER_POLL_SECONDS = int(os.getenv('EMAIL_WORKER_POLL_SECONDS', 5))
+    EMAIL_OUTBOX_RETENTION_DAYS = int(os.getenv('EMAIL_OUTBOX_RETENTION_DAYS', 14))
+    # EMAIL_DIGEST_ENABLED: managers get one summary of new requests per interval
+    # instead of one email per request
+    EMAIL_DIGEST_ENABLED = os.getenv('EMAIL_DIGEST_ENABLED', 'false').lower() == 'true'
+    EMAIL_DIGEST_INTERVAL_MINUTES = int(os.getenv('EMAIL_DIGEST_INTERVAL_MINUTES', 15))
+
+    # Rate limiting
+    # RATE_LIMIT_BACKEND: 'database' (shared by workers), 'memory' or 'auto'
+    RATE_LIMIT_BACKEND = os.getenv('RATE_LIMIT_BACKEND', 'auto')
+    RATE_LIMIT_MAX_KEYS = int(os.getenv('RATE_LIMIT_MAX_KEYS', 10000))
+
+    # Password hashing (bcrypt)
+    # BCRYPT_ROUNDS: work factor, see benchmarks/bench_bcrypt_cost.py
+    BCRYPT_ROUNDS = int(os.getenv('BCRYPT_ROUNDS', 12))
+    BCRYPT_MAX_WORKERS = int(os.getenv('BCRYPT_MAX_WORKERS', 2))
+    BCRYPT_MAX_QUEUE = int(os.getenv('BCRYPT_MAX_QUEUE', 16))
+    BCRYPT_TIMEOUT = int(os.getenv('BCRYPT_TIMEOUT', 10))
+
+    # Verified JWT cache (per process)
+    TOKEN_CACHE_SIZE = int(os.getenv('TOKEN_CACHE_SIZE', 10000))
+    TOKEN_CACHE_TTL = int(os.getenv('TOKEN_CACHE_TTL', 300))
+
+    # User snapshot cache (per process, invalidated across workers)
+    USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', 5000))
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 300))
+
+    # Audit log writer
+    # AUDIT_ASYNC: queue entries and insert them in batches from a background thread
+    AUDIT_ASYNC = os.getenv('AUDIT_ASYNC', 'true').lower() == 'true'
+    AUDIT_BATCH_SIZE = int(os.getenv('AUDIT_BATCH_SIZE', 100))
+    AUDIT_FLUSH_INTERVAL = float(os.getenv('AUDIT_FLUSH_INTERVAL', 1.0))
+    AUDIT_MAX_QUEUE = int(os.getenv('AUDIT_MAX_QUEUE', 10000))
+
+    # Audit log retention (archive_audit_logs.py)
+    AUDIT_RETENTION_DAYS = int(os.getenv('AUDIT_RETENTION_DAYS', 180))
+    # AUDIT_ARCHIVE_DIR: absolute path on persistent storage seen by the web app
+    # and the cron job (Azure App Service: under /home, outside /home/site/wwwroot,
+    # e.g. /home/data/audit_archive). The archive is the only copy of the rows
+    # it holds, so there is no default - archiving refuses to run without it
+    AUDIT_ARCHIVE_DIR = os.getenv('AUDIT_ARCHIVE_DIR')
+    AUDIT_ARCHIVE_BATCH_SIZE = int(os.getenv('AUDIT_ARCHIVE_BATCH_SIZE', 5000))
+
+    # Response compression (gzip / brotli)
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))
+
+    # Server-Sent Events
+    # EVENT_BROKER: 'postgres' (LISTEN/NOTIFY), 'local' (single process) or 'auto'
+    EVENT_BROKER = os.getenv('EVENT_BROKER', 'auto')
+    SSE_KEEPALIVE_SECONDS = int(os.getenv('SSE_KEEPALIVE_SECONDS', 15))
+    SSE_MAX_CONNECTION_SECONDS = int(os.getenv('SSE_MAX_CONNECTION_SECONDS', 300))
+    # SSE_MAX_STREAMS: open streams per worker process; each one holds a gunicorn
+    # thread (--threads=8 in startup.sh), the rest stay free for API requests.
+    # Beyond the limit /api/events returns 503 and the client polls instead
+    SSE_MAX_STREAMS = int(os.getenv('SSE_MAX_STREAMS', 4))
+
     # Azure
     APP_NAME = os.getenv('APP_NAME', 'timeoff-manager-app')
 
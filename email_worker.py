@@ -0,0 +1,112 @@
+"""
+Email Outbox Worker
+Wysyła emaile z tabeli email_outbox (zapisywane przez API w tej samej
+transakcji co zmiana wniosku), z ponowieniami i backoffem.
+
+Worker budzi się od razu po zapisaniu nowego emaila (LISTEN/NOTIFY na
+PostgreSQL), a poza tym sprawdza kolejkę co EMAIL_WORKER_POLL_SECONDS.
+Gdy serwer SMTP nie odpowiada, circuit breaker wstrzymuje wysyłkę na
+SMTP_BREAKER_COOLDOWN sekund - emaile czekają w kolejce bez zużywania prób.
+Przy EMAIL_DIGEST_ENABLED=true co EMAIL_DIGEST_INTERVAL_MINUTES wysyła
+managerom jedno podsumowanie nowych wniosków zamiast emaila per wniosek.
+Można uruchomić kilka workerów - wiersze są blokowane z SKIP LOCKED.
+
+Użycie:
+    python email_worker.py                 # działa do SIGTERM / Ctrl+C
+    python email_worker.py --once          # jedna partia i koniec
+    python email_worker.py --retry-dead    # przywróć martwe emaile do kolejki
+"""
+import argparse
+import signal
+import sys
+import os
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app import create_app
+from config import Config
+from models import db
+from services.email_outbox import deliver_pending, flush_digests, prune_sent, retry_dead, EVENT_KIND
+from services.event_service import get_broker
+
+PRUNE_INTERVAL_SECONDS = 3600
+
+
+def run_worker(once=False):
+    """Deliver outbox emails until stopped"""
+    stop = threading.Event()
+    wake = threading.Event()
+
+    def request_stop(signum, frame):
+        print("🛑 Email worker stopping...")
+        stop.set()
+        wake.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    get_broker().add_listener(lambda payload: payload.get('kind') == EVENT_KIND and wake.set())
+
+    print("📧 Email worker started")
+    last_prune = 0
+    last_digest = time.monotonic()
+    digest_interval = Config.EMAIL_DIGEST_INTERVAL_MINUTES * 60
+    while not stop.is_set():
+        wake.clear()
+        try:
+            if Config.EMAIL_DIGEST_ENABLED and (once or time.monotonic() - last_digest >= digest_interval):
+                last_digest = time.monotonic()
+                digests = flush_digests()
+                if digests['managers']:
+                    print(f"📧 Digest: {digests['requests']} requests for {digests['managers']} managers")
+
+            result = deliver_pending()
+            if result['processed']:
+                print(f"📧 Outbox: {result['sent']} sent, {result['retried']} retried, "
+                      f"{result['dead']} dead")
+            if result['deferred']:
+                print(f"⏸️  SMTP niedostępny - {result['deferred']} emaili odłożonych")
+
+            if time.monotonic() - last_prune > PRUNE_INTERVAL_SECONDS:
+                prune_sent()
+                last_prune = time.monotonic()
+        except Exception as e:
+            db.session.rollback()
+            print(f"❌ Email worker error: {str(e)}")
+            result = {'processed': 0, 'deferred': 0}
+        finally:
+            # Fresh session per batch - no stale identity map between polls
+            db.session.remove()
+
+        if once:
+            break
+        # A full batch means more emails are probably due - don't wait
+        if result['processed'] < Config.EMAIL_OUTBOX_BATCH_SIZE:
+            timeout = Config.EMAIL_WORKER_POLL_SECONDS
+            if Config.EMAIL_DIGEST_ENABLED:
+                timeout = max(0, min(timeout, last_digest + digest_interval - time.monotonic()))
+            wake.wait(timeout)
+
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Email outbox worker')
+    parser.add_argument('--once', action='store_true', help='deliver one batch and exit')
+    parser.add_argument('--retry-dead', action='store_true', help='requeue dead emails and exit')
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        if args.retry_dead:
+            print(f"✅ Przywrócono {retry_dead()} emaili do kolejki")
+            return True
+        return run_worker(once=args.once)
+
+
+if __name__ == '__main__':
+    success = main()
+    sys.exit(0 if success else 1)
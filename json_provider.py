@@ -0,0 +1,68 @@
+"""
+Fast JSON provider for Flask
+
+Uses orjson when it is installed and falls back to the standard library
+otherwise. Both encoders render date/datetime/time values as ISO 8601
+(the API format for dates), so to_dict()/projections can return dates and
+timestamps unformatted. Times of day use HH:MM in the API and are still
+formatted by the serializers.
+"""
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, time
+from flask.json.provider import JSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+def _default(value):
+    """Encode types the encoders don't handle natively"""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(JSONProvider):
+    """JSONProvider backed by orjson (or stdlib json as a fallback)"""
+
+    mimetype = 'application/json'
+
+    @property
+    def backend(self):
+        return 'orjson' if orjson else 'json'
+
+    def dumps(self, obj, **kwargs):
+        if orjson and not kwargs:
+            return orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS).decode()
+        kwargs.setdefault('default', _default)
+        kwargs.setdefault('ensure_ascii', False)
+        kwargs.setdefault('separators', (',', ':'))
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        if orjson:
+            body = orjson.dumps(obj, default=_default, option=ORJSON_OPTIONS)
+        else:
+            body = self.dumps(obj)
+        return self._app.response_class(body, mimetype=self.mimetype)
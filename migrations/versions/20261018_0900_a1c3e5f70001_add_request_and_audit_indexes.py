@@ -0,0 +1,67 @@
+"""Add composite indexes for request and audit log queries
+
+Revision ID: a1c3e5f70001
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+Indexes match the access patterns of:
+- GET /api/requests (role scoping by employee_id / manager_id, status filter,
+  ORDER BY created_at DESC, id DESC for keyset pagination)
+- manager pending queue (manager_id + status = 'oczekujący')
+- GET /api/audit-logs (ORDER BY timestamp DESC, optional user_id filter)
+
+Tables that do not exist yet are skipped - db.create_all() (init_db.py)
+creates them with the indexes declared on the models.
+
+On PostgreSQL the indexes are built with CREATE INDEX CONCURRENTLY outside
+of the migration transaction, so writes to `requests` and `audit_log` are
+not blocked while the index is built.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a1c3e5f70001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('idx_requests_created_at_id', 'requests', ['created_at', 'id']),
+    ('idx_requests_employee_created', 'requests', ['employee_id', 'created_at', 'id']),
+    ('idx_requests_manager_status_created', 'requests', ['manager_id', 'status', 'created_at']),
+    ('idx_requests_status_created', 'requests', ['status', 'created_at']),
+    ('idx_audit_log_timestamp_id', 'audit_log', ['timestamp', 'id']),
+    ('idx_audit_log_user_timestamp', 'audit_log', ['user_id', 'timestamp']),
+]
+
+
+def upgrade() -> None:
+    # On an empty database (startup.sh runs migrations before init_db.py)
+    # db.create_all() creates the tables together with these indexes
+    inspector = sa.inspect(op.get_bind())
+    indexes = [index for index in INDEXES if inspector.has_table(index[1])]
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in indexes:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _columns in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,46 @@
+"""Add cache_versions table for ETag version stamps
+
+Revision ID: b2d4f6a80002
+Revises: a1c3e5f70001
+Create Date: 2026-10-18 10:00:00.000000
+
+init_db.py (run by startup.sh on every boot) calls db.create_all(), which
+may already have created the table before this migration runs - it is
+then left as is and only the missing seed rows are inserted.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2d4f6a80002'
+down_revision = 'a1c3e5f70001'
+branch_labels = None
+depends_on = None
+
+
+SEED_VERSIONS = [
+    {'scope': 'requests', 'version': 1},
+    {'scope': 'users', 'version': 1},
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('cache_versions'):
+        op.create_table(
+            'cache_versions',
+            sa.Column('scope', sa.String(length=50), nullable=False),
+            sa.Column('version', sa.BigInteger(), nullable=False),
+            sa.PrimaryKeyConstraint('scope')
+        )
+
+    cache_versions = sa.table('cache_versions', sa.column('scope'), sa.column('version'))
+    existing = {row.scope for row in bind.execute(sa.select(cache_versions.c.scope))}
+    missing = [row for row in SEED_VERSIONS if row['scope'] not in existing]
+    if missing:
+        op.bulk_insert(cache_versions, missing)
+
+
+def downgrade() -> None:
+    op.drop_table('cache_versions')
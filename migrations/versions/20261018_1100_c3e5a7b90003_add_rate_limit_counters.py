@@ -0,0 +1,35 @@
+"""Add rate_limit_counters table for the shared rate limiter
+
+Revision ID: c3e5a7b90003
+Revises: b2d4f6a80002
+Create Date: 2026-10-18 11:00:00.000000
+
+The table may already exist - init_db.py's db.create_all() runs on every
+boot, possibly before this migration.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3e5a7b90003'
+down_revision = 'b2d4f6a80002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table('rate_limit_counters'):
+        return
+    op.create_table(
+        'rate_limit_counters',
+        sa.Column('key', sa.String(length=255), nullable=False),
+        sa.Column('window', sa.BigInteger(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('prev_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('rate_limit_counters')
@@ -0,0 +1,73 @@
+"""Add audit log indexes for filtered keyset pagination
+
+Revision ID: d4f6b8c00004
+Revises: c3e5a7b90003
+Create Date: 2026-10-18 12:00:00.000000
+
+GET /api/audit-logs pages on (timestamp DESC, id DESC) with optional
+user_id and action filters. The user index gains `id` as its last column
+so filtered pages are served from the index in order, and an equivalent
+index is added for the action filter.
+
+On PostgreSQL the indexes are built/dropped CONCURRENTLY outside of the
+migration transaction, so logins (which write audit rows) are not blocked.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f6b8c00004'
+down_revision = 'c3e5a7b90003'
+branch_labels = None
+depends_on = None
+
+
+NEW_INDEXES = [
+    ('idx_audit_log_user_timestamp_id', 'audit_log', ['user_id', 'timestamp', 'id']),
+    ('idx_audit_log_action_timestamp_id', 'audit_log', ['action', 'timestamp', 'id']),
+]
+REPLACED_INDEX = ('idx_audit_log_user_timestamp', 'audit_log', ['user_id', 'timestamp'])
+
+
+def upgrade() -> None:
+    # On an empty database db.create_all() creates audit_log with these indexes
+    if not sa.inspect(op.get_bind()).has_table('audit_log'):
+        return
+
+    # CONCURRENTLY cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in NEW_INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+        name, table, _columns = REPLACED_INDEX
+        op.drop_index(
+            name,
+            table_name=table,
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        name, table, columns = REPLACED_INDEX
+        op.create_index(
+            name,
+            table,
+            columns,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        for name, table, _columns in reversed(NEW_INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,49 @@
+"""Add email_outbox table for transactional email delivery
+
+Revision ID: e5a7c9d10005
+Revises: d4f6b8c00004
+Create Date: 2026-10-18 13:00:00.000000
+
+The table and its index may already exist - init_db.py's db.create_all()
+runs on every boot, possibly before this migration.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5a7c9d10005'
+down_revision = 'd4f6b8c00004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('email_outbox'):
+        op.create_table(
+            'email_outbox',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('kind', sa.String(length=50), nullable=False),
+            sa.Column('recipient', sa.String(length=255), nullable=False),
+            sa.Column('payload', sa.JSON(), nullable=False),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('attempts', sa.Integer(), nullable=False),
+            sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+            sa.Column('last_error', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('sent_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+    elif inspector.has_index('email_outbox', 'idx_email_outbox_status_next_attempt'):
+        return
+    op.create_index(
+        'idx_email_outbox_status_next_attempt',
+        'email_outbox',
+        ['status', 'next_attempt_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_email_outbox_status_next_attempt', table_name='email_outbox')
+    op.drop_table('email_outbox')
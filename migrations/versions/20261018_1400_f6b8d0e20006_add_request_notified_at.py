@@ -0,0 +1,42 @@
+"""Add requests.notified_at for manager digest emails
+
+Revision ID: f6b8d0e20006
+Revises: e5a7c9d10005
+Create Date: 2026-10-18 14:00:00.000000
+
+Requests with notified_at IS NULL are waiting for the next manager digest.
+Existing requests are marked as notified, so enabling digests does not
+email managers about old requests.
+
+Must be applied before the code that has Request.notified_at is served:
+db.create_all() cannot add a column to an existing table, and every query
+loading a Request fails until the column exists. startup.sh runs
+`alembic upgrade head` before init_db.py and before gunicorn starts.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6b8d0e20006'
+down_revision = 'e5a7c9d10005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # On an empty database db.create_all() creates requests with the column
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('requests'):
+        return
+    # A database created by db.create_all() with the current models already
+    # has the column (and its NULLs are real pending digest entries)
+    columns = {column['name'] for column in inspector.get_columns('requests')}
+    if 'notified_at' in columns:
+        return
+    op.add_column('requests', sa.Column('notified_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE requests SET notified_at = created_at")
+
+
+def downgrade() -> None:
+    op.drop_column('requests', 'notified_at')
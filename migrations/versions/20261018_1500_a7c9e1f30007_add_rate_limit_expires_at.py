@@ -0,0 +1,37 @@
+"""Add rate_limit_counters.expires_at
+
+Revision ID: a7c9e1f30007
+Revises: f6b8d0e20006
+Create Date: 2026-10-18 15:00:00.000000
+
+Keys of different limiters count in windows of different lengths, so the
+periodic prune cannot compare `window` numbers across rows - a prune run by
+a 60 s limiter deleted live counters of limiters with longer windows. Each
+row now stores the Unix time after which it no longer counts. Existing
+rows get 0 and are pruned on the next run (their limiters start over).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7c9e1f30007'
+down_revision = 'f6b8d0e20006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    # On an empty database db.create_all() creates the table with the column
+    if not inspector.has_table('rate_limit_counters'):
+        return
+    columns = {column['name'] for column in inspector.get_columns('rate_limit_counters')}
+    if 'expires_at' in columns:
+        return
+    op.add_column('rate_limit_counters',
+                  sa.Column('expires_at', sa.BigInteger(), nullable=False, server_default='0'))
+
+
+def downgrade() -> None:
+    op.drop_column('rate_limit_counters', 'expires_at')
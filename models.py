@@ -1,4 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.orm import joinedload
 from datetime import datetime
 
 db = SQLAlchemy()
@@ -19,8 +20,8 @@ class User(db.Model):
 
     # Relationships
     supervisor = db.relationship('User', remote_side=[id], backref='subordinates')
-    requests_as_employee = db.relationship('Request', foreign_keys='Request.employee_id', backref='employee', cascade='all, delete-orphan')
-    requests_as_manager = db.relationship('Request', foreign_keys='Request.manager_id', backref='manager')
+    requests_as_employee = db.relationship('Request', foreign_keys='Request.employee_id', back_populates='employee', cascade='all, delete-orphan')
+    requests_as_manager = db.relationship('Request', foreign_keys='Request.manager_id', back_populates='manager')
     audit_logs = db.relationship('AuditLog', backref='user', cascade='all, delete-orphan')
 
     def to_dict(self, include_supervisor=True):
@@ -31,7 +32,7 @@ class User(db.Model):
             'first_name': self.first_name,
             'last_name': self.last_name,
             'role': self.role,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'created_at': self.created_at,
             'is_active': self.is_active
         }
 
@@ -51,6 +52,16 @@ class User(db.Model):
 
 class Request(db.Model):
     __tablename__ = 'requests'
+    __table_args__ = (
+        # Admin listing / keyset pagination on (created_at, id)
+        db.Index('idx_requests_created_at_id', 'created_at', 'id'),
+        # Employee's own requests, newest first
+        db.Index('idx_requests_employee_created', 'employee_id', 'created_at', 'id'),
+        # Manager queue: requests assigned to a manager, by status, newest first
+        db.Index('idx_requests_manager_status_created', 'manager_id', 'status', 'created_at'),
+        # Admin status filter (e.g. all pending), newest first
+        db.Index('idx_requests_status_created', 'status', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     employee_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -63,6 +74,25 @@ class Request(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     decision_date = db.Column(db.DateTime, nullable=True)
     manager_comment = db.Column(db.Text, nullable=True)
+    # When the manager was emailed about the request (NULL = waiting for the next digest)
+    notified_at = db.Column(db.DateTime, nullable=True)
+
+    # Relationships (declared here so list queries can eager-load them)
+    employee = db.relationship('User', foreign_keys=[employee_id], back_populates='requests_as_employee')
+    manager = db.relationship('User', foreign_keys=[manager_id], back_populates='requests_as_manager')
+
+    @classmethod
+    def with_parties(cls, query):
+        """
+        Eager-load employee and manager for list serialization
+
+        to_dict() touches both relationships, so without this a list of N
+        requests costs up to 2N extra SELECTs.
+        """
+        return query.options(
+            joinedload(cls.employee),
+            joinedload(cls.manager)
+        )
 
     def to_dict(self):
         """Convert request to dictionary"""
@@ -78,13 +108,13 @@ class Request(db.Model):
                 'name': f"{self.manager.first_name} {self.manager.last_name}",
                 'email': self.manager.email
             },
-            'date': self.date.isoformat() if self.date else None,
+            'date': self.date,
             'time_out': self.time_out.strftime('%H:%M') if self.time_out else None,
             'time_return': self.time_return.strftime('%H:%M') if self.time_return else None,
             'reason': self.reason,
             'status': self.status,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'decision_date': self.decision_date.isoformat() if self.decision_date else None,
+            'created_at': self.created_at,
+            'decision_date': self.decision_date,
             'manager_comment': self.manager_comment
         }
 
@@ -114,7 +144,7 @@ class SmtpConfig(db.Model):
             'login': self.login,
             'password': '***' if mask_password and self.password else self.password,
             'email_from': self.email_from,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'updated_at': self.updated_at
         }
 
     def __repr__(self):
@@ -123,6 +153,13 @@ class SmtpConfig(db.Model):
 
 class AuditLog(db.Model):
     __tablename__ = 'audit_log'
+    __table_args__ = (
+        # Audit log browsing, newest first
+        db.Index('idx_audit_log_timestamp_id', 'timestamp', 'id'),
+        # Audit log filtered by user / action, newest first (keyset on timestamp, id)
+        db.Index('idx_audit_log_user_timestamp_id', 'user_id', 'timestamp', 'id'),
+        db.Index('idx_audit_log_action_timestamp_id', 'action', 'timestamp', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
@@ -138,8 +175,58 @@ class AuditLog(db.Model):
             'user': f"{self.user.first_name} {self.user.last_name}" if self.user else 'System',
             'action': self.action,
             'details': self.details,
-            'timestamp': self.timestamp.isoformat() if self.timestamp else None
+            'timestamp': self.timestamp
         }
 
     def __repr__(self):
         return f'<AuditLog {self.action}>'
+
+
+class CacheVersion(db.Model):
+    """Version stamp per data scope ('requests', 'users') used for ETags"""
+    __tablename__ = 'cache_versions'
+
+    scope = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<CacheVersion {self.scope}={self.version}>'
+
+
+class RateLimitCounter(db.Model):
+    """Shared sliding-window rate limit counter (one row per limited key)"""
+    __tablename__ = 'rate_limit_counters'
+
+    key = db.Column(db.String(255), primary_key=True)
+    window = db.Column(db.BigInteger, nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    prev_count = db.Column(db.Integer, nullable=False, default=0)
+    # Unix time after which the row no longer affects its limiter (keys
+    # have different window lengths, so `window` alone cannot tell)
+    expires_at = db.Column(db.BigInteger, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<RateLimitCounter {self.key}>'
+
+
+class EmailOutbox(db.Model):
+    """Email waiting for delivery by email_worker.py (written in the transaction of the change)"""
+    __tablename__ = 'email_outbox'
+    __table_args__ = (
+        # Worker queue: due pending emails, oldest first
+        db.Index('idx_email_outbox_status_next_attempt', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)  # 'new_request' or 'decision'
+    recipient = db.Column(db.String(255), nullable=False)
+    payload = db.Column(db.JSON, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')  # pending / sent / dead
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
+
+    def __repr__(self):
+        return f'<EmailOutbox {self.kind} to {self.recipient} ({self.status})>'
@@ -0,0 +1,100 @@
+"""Keyset (cursor) pagination helpers"""
+import base64
+from datetime import datetime
+from sqlalchemy import or_, and_
+from models import db
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor or limit cannot be parsed"""
+
+
+def encode_cursor(sort_value, row_id):
+    """
+    Encode (timestamp, id) of the last returned row into an opaque cursor
+
+    Args:
+        sort_value: datetime of the sort column of the last row
+        row_id: primary key of the last row
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{sort_value.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Decode cursor produced by encode_cursor
+
+    Returns:
+        tuple: (sort_value: datetime, row_id: int)
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        sort_part, id_part = raw.rsplit('|', 1)
+        return datetime.fromisoformat(sort_part), int(id_part)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise InvalidCursor('Invalid cursor') from e
+
+
+def parse_limit(value, default=DEFAULT_PAGE_SIZE, maximum=MAX_PAGE_SIZE):
+    """Parse ?limit= query parameter, clamped to [1, maximum]"""
+    if value is None or value == '':
+        return default
+    try:
+        limit = int(value)
+    except ValueError as e:
+        raise InvalidCursor('Invalid limit') from e
+    if limit < 1:
+        raise InvalidCursor('Limit must be positive')
+    return min(limit, maximum)
+
+
+def keyset_page(query, sort_column, id_column, limit, after=None):
+    """
+    Apply descending keyset pagination on (sort_column, id_column)
+
+    Rows are ordered newest first. When `after` is given, only rows strictly
+    older than the cursor position are returned, so the database can seek
+    straight to the next page through an index instead of scanning OFFSET rows.
+
+    Args:
+        query: SELECT statement (already scoped/filtered); must include
+            sort_column and id_column in its columns
+        sort_column: Timestamp column used for ordering
+        id_column: Primary key column used as a tie-breaker
+        limit: Page size
+        after: Optional cursor string from a previous page
+
+    Returns:
+        tuple: (rows: list of result tuples, next_cursor: str or None)
+    """
+    if after:
+        sort_value, row_id = decode_cursor(after)
+        query = query.where(
+            or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < row_id)
+            )
+        )
+
+    # Fetch one extra row to know whether another page exists
+    stmt = query.order_by(sort_column.desc(), id_column.desc()).limit(limit + 1)
+    rows = db.session.execute(stmt).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            getattr(last, sort_column.key),
+            getattr(last, id_column.key)
+        )
+
+    return rows, next_cursor
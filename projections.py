@@ -0,0 +1,164 @@
+"""
+Column projections for list endpoints
+
+List endpoints select only the columns they serialize (joining users for
+names/emails) and turn the raw result tuples into the same JSON shape as
+Request.to_dict() / User.to_dict(), without building ORM instances, going
+through the identity map or triggering relationship loads. Dates and
+timestamps are left as-is for the JSON provider to encode.
+"""
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+from models import db, Request, User, AuditLog
+
+Employee = aliased(User, name='employee')
+Manager = aliased(User, name='manager')
+Supervisor = aliased(User, name='supervisor')
+
+REQUEST_COLUMNS = (
+    Request.id,
+    Request.employee_id,
+    Employee.first_name.label('employee_first_name'),
+    Employee.last_name.label('employee_last_name'),
+    Employee.email.label('employee_email'),
+    Request.manager_id,
+    Manager.first_name.label('manager_first_name'),
+    Manager.last_name.label('manager_last_name'),
+    Manager.email.label('manager_email'),
+    Request.date,
+    Request.time_out,
+    Request.time_return,
+    Request.reason,
+    Request.status,
+    Request.created_at,
+    Request.decision_date,
+    Request.manager_comment,
+)
+
+USER_COLUMNS = (
+    User.id,
+    User.email,
+    User.first_name,
+    User.last_name,
+    User.role,
+    User.created_at,
+    User.is_active,
+    User.supervisor_id,
+    Supervisor.first_name.label('supervisor_first_name'),
+    Supervisor.last_name.label('supervisor_last_name'),
+)
+
+AUDIT_COLUMNS = (
+    AuditLog.id,
+    AuditLog.user_id,
+    User.first_name,
+    User.last_name,
+    AuditLog.action,
+    AuditLog.details,
+    AuditLog.timestamp,
+)
+
+
+def request_list_select():
+    """SELECT of request columns joined with employee and manager names"""
+    return (
+        select(*REQUEST_COLUMNS)
+        .join(Employee, Employee.id == Request.employee_id)
+        .join(Manager, Manager.id == Request.manager_id)
+    )
+
+
+def user_list_select():
+    """SELECT of user columns outer-joined with supervisor name"""
+    return (
+        select(*USER_COLUMNS)
+        .outerjoin(Supervisor, Supervisor.id == User.supervisor_id)
+    )
+
+
+def audit_list_select():
+    """SELECT of audit log columns outer-joined with the acting user's name"""
+    return (
+        select(*AUDIT_COLUMNS)
+        .outerjoin(User, User.id == AuditLog.user_id)
+    )
+
+
+def fetch_rows(stmt):
+    """Execute a projection SELECT and return plain result tuples"""
+    return db.session.execute(stmt).all()
+
+
+def _hhmm(value):
+    return f"{value.hour:02d}:{value.minute:02d}" if value else None
+
+
+def serialize_request_rows(rows):
+    """Serialize request_list_select() rows - same shape as Request.to_dict()"""
+    return [
+        {
+            'id': rid,
+            'employee': {
+                'id': employee_id,
+                'name': f"{e_first} {e_last}",
+                'email': e_email
+            },
+            'manager': {
+                'id': manager_id,
+                'name': f"{m_first} {m_last}",
+                'email': m_email
+            },
+            'date': req_date,
+            'time_out': _hhmm(time_out),
+            'time_return': _hhmm(time_return),
+            'reason': reason,
+            'status': status,
+            'created_at': created_at,
+            'decision_date': decision_date,
+            'manager_comment': manager_comment
+        }
+        for (rid, employee_id, e_first, e_last, e_email,
+             manager_id, m_first, m_last, m_email,
+             req_date, time_out, time_return, reason, status,
+             created_at, decision_date, manager_comment) in rows
+    ]
+
+
+def serialize_user_rows(rows):
+    """Serialize user_list_select() rows - same shape as User.to_dict()"""
+    result = []
+    for (uid, email, first_name, last_name, role, created_at, is_active,
+         supervisor_id, s_first, s_last) in rows:
+        data = {
+            'id': uid,
+            'email': email,
+            'first_name': first_name,
+            'last_name': last_name,
+            'role': role,
+            'created_at': created_at,
+            'is_active': is_active
+        }
+        if s_first is not None:
+            data['supervisor'] = {
+                'id': supervisor_id,
+                'name': f"{s_first} {s_last}"
+            }
+        elif supervisor_id:
+            data['supervisor_id'] = supervisor_id
+        result.append(data)
+    return result
+
+
+def serialize_audit_rows(rows):
+    """Serialize audit_list_select() rows - same shape as AuditLog.to_dict()"""
+    return [
+        {
+            'id': log_id,
+            'user_id': user_id,
+            'user': f"{first_name} {last_name}" if first_name is not None else 'System',
+            'action': action,
+            'details': details,
+            'timestamp': timestamp
+        }
+        for (log_id, user_id, first_name, last_name, action, details, timestamp) in rows
+    ]
@@ -1,15 +1,19 @@
 """Authentication routes"""
 from flask import Blueprint, request, jsonify, g
 from models import db, User
-from auth import generate_token, verify_password, token_required
+from auth import (
+    generate_token, verify_password, hash_password, password_needs_rehash,
+    token_required, PasswordHasherBusy
+)
 from services.audit_service import log_action
+from services.user_cache import get_user_snapshot
 from security import rate_limit, validate_email
 
 auth_bp = Blueprint('auth', __name__)
 
 
 @auth_bp.route('/login', methods=['POST'])
-@rate_limit(max_requests=5, window_seconds=60)
+@rate_limit(max_requests=5, window_seconds=60, scope=('ip', 'login'))
 def login():
     """
     Login endpoint
@@ -44,6 +48,16 @@ def login():
         if not user.is_active:
             return jsonify({'error': 'Account is disabled'}), 403
 
+        # Upgrade hash if BCRYPT_ROUNDS changed (we have the plain password now)
+        if password_needs_rehash(user.password_hash):
+            try:
+                user.password_hash = hash_password(password)
+                db.session.commit()
+            except PasswordHasherBusy:
+                pass  # Try again on next login
+            except Exception:
+                db.session.rollback()
+
         # Generate JWT token
         token = generate_token(user)
 
@@ -58,6 +72,8 @@ def login():
             'user': user.to_dict()
         }), 200
 
+    except PasswordHasherBusy:
+        return jsonify({'error': 'Server busy. Please try again.'}), 503, {'Retry-After': '1'}
     except Exception as e:
         # Log error but don't expose details to client
         import logging
@@ -96,12 +112,12 @@ def get_current_user():
     Returns: { "id": 1, "email": "...", "first_name": "...", ... }
     """
     try:
-        user = User.query.get(g.user_id)
+        user = get_user_snapshot(g.user_id)
 
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
-        return jsonify(user.to_dict()), 200
+        return jsonify(user.data), 200
 
     except Exception as e:
         import logging
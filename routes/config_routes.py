@@ -1,12 +1,19 @@
 """SMTP Configuration routes (Admin only)"""
-from flask import Blueprint, request, jsonify, g
+from flask import Blueprint, request, jsonify, g, Response, stream_with_context, current_app
 from models import db, SmtpConfig
-from auth import require_role
-from services.audit_service import log_action
+from auth import require_role, token_cache
+from services.audit_service import log_action, audit_writer
 from security import encrypt_password
+from services.user_cache import user_cache
+from services.email_outbox import outbox_stats
+from services.email_service import smtp_pool, smtp_breaker, smtp_config_cache, invalidate_smtp_config
+from pagination import parse_limit, InvalidCursor
+from datetime import datetime, timezone
 
 config_bp = Blueprint('config', __name__)
 
+ARCHIVE_EXPORT_CHUNK = 1000
+
 
 @config_bp.route('/smtp-config', methods=['GET'])
 @require_role('admin')
@@ -85,6 +92,7 @@ def update_smtp_config():
         if 'email_from' in data:
             config.email_from = data['email_from']
 
+        invalidate_smtp_config()
         db.session.commit()
 
         # Log action
@@ -140,7 +148,9 @@ def test_smtp_config():
         </html>
         """
 
-        success, message = send_email(test_email, 'Test Email - TimeOff Manager', html_body)
+        # Goes through even while the circuit breaker is open, so the admin
+        # sees the real SMTP error (and a success closes the breaker)
+        success, message = send_email(test_email, 'Test Email - TimeOff Manager', html_body, force=True)
 
         if success:
             # Log action
@@ -163,26 +173,146 @@ def test_smtp_config():
         return jsonify({'error': str(e)}), 500
 
 
+def _parse_datetime(value, name):
+    """Parse ISO date/datetime query parameter (None when absent)"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError as e:
+        raise InvalidCursor(f'Invalid {name}, expected ISO date or datetime') from e
+    # audit_log.timestamp is naive UTC
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+# Entries returned by GET /api/audit-logs without ?limit= / ?after=
+AUDIT_LOGS_UNPAGED_LIMIT = 100
+
+
 @config_bp.route('/audit-logs', methods=['GET'])
 @require_role('admin')
 def get_audit_logs():
     """
-    Get audit logs (admin only)
-    GET /api/audit-logs?limit=50&user_id=5
+    Get audit logs, newest first (admin only)
+    GET /api/audit-logs?limit=50&user_id=5&action=USER_LOGIN,USER_LOGOUT
+                       &since=2026-10-01&until=2026-10-18T12:00:00&after=<cursor>
     Headers: { "Authorization": "Bearer <token>" }
-    Returns: [{ "id": 1, "user": "...", "action": "...", ... }]
+    Returns: [{ "id": 1, "user": "...", "action": "...", ... }] - newest 100
+    Returns (with limit or after): { "items": [...], "next_cursor": "..." | null }
+    `since` is inclusive, `until` exclusive; pass `next_cursor` as `after`
+    to get the next page.
     """
     try:
         from services.audit_service import get_audit_logs
 
-        limit = int(request.args.get('limit', 100))
+        paged = 'limit' in request.args or 'after' in request.args
+        limit = parse_limit(request.args.get('limit')) if paged else AUDIT_LOGS_UNPAGED_LIMIT
         user_id_filter = request.args.get('user_id')
+        action_filter = request.args.get('action')
 
         user_id = int(user_id_filter) if user_id_filter else None
+        actions = [a.strip() for a in action_filter.split(',') if a.strip()] if action_filter else None
+
+        logs, next_cursor = get_audit_logs(
+            limit=limit,
+            user_id=user_id,
+            actions=actions,
+            since=_parse_datetime(request.args.get('since'), 'since'),
+            until=_parse_datetime(request.args.get('until'), 'until'),
+            after=request.args.get('after')
+        )
+
+        if not paged:
+            return jsonify(logs), 200
+        return jsonify({'items': logs, 'next_cursor': next_cursor}), 200
+
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@config_bp.route('/audit-logs/archive', methods=['GET'])
+@require_role('admin')
+def export_archived_audit_logs():
+    """
+    Stream archived (retention-moved) audit logs as NDJSON, oldest first (admin only)
+    GET /api/audit-logs/archive?since=2025-01-01&until=2025-02-01&user_id=5&action=USER_LOGIN
+    Headers: { "Authorization": "Bearer <token>" }
+    Returns: streamed application/x-ndjson, one audit log entry per line
+    """
+    try:
+        from services.audit_archive import iter_archived_audit_logs, get_archive_dir, ArchiveNotConfigured
 
-        logs = get_audit_logs(limit=limit, user_id=user_id)
+        # Checked before streaming starts, so a missing setting is a clear error
+        try:
+            get_archive_dir()
+        except ArchiveNotConfigured as e:
+            return jsonify({'error': str(e)}), 503
 
-        return jsonify(logs), 200
+        user_id_filter = request.args.get('user_id')
+        action_filter = request.args.get('action')
+
+        entries = iter_archived_audit_logs(
+            since=_parse_datetime(request.args.get('since'), 'since'),
+            until=_parse_datetime(request.args.get('until'), 'until'),
+            user_id=int(user_id_filter) if user_id_filter else None,
+            actions=[a.strip() for a in action_filter.split(',') if a.strip()] if action_filter else None
+        )
+        dumps = current_app.json.dumps
+
+        def generate():
+            chunk = []
+            for entry in entries:
+                chunk.append(dumps(entry))
+                if len(chunk) >= ARCHIVE_EXPORT_CHUNK:
+                    yield '\n'.join(chunk) + '\n'
+                    chunk = []
+            if chunk:
+                yield '\n'.join(chunk) + '\n'
+
+        return Response(
+            stream_with_context(generate()),
+            mimetype='application/x-ndjson',
+            headers={
+                'Content-Disposition': 'attachment; filename="audit_log_archive.ndjson"',
+                'X-Accel-Buffering': 'no'
+            }
+        )
+
+    except InvalidCursor as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@config_bp.route('/metrics', methods=['GET'])
+@require_role('admin')
+def get_metrics():
+    """
+    Runtime counters (admin only) - caches, audit writer, SMTP pool and breaker are
+    per worker process (the one serving the call), the email outbox is shared
+    GET /api/metrics
+    Headers: { "Authorization": "Bearer <token>" }
+    Returns: { "token_cache": { "size": 12, "hits": 340, "misses": 12, ... },
+               "user_cache": { ... }, "audit_writer": { ... },
+               "email_outbox": { "pending": 0, "sent": 120, "dead": 0, ... },
+               "smtp_pool": { "idle": 1, "connects": 3, "reuses": 57, ... },
+               "smtp_breaker": { "state": "closed", "consecutive_failures": 0, ... },
+               "smtp_config": { "cached": true, "version": 2, "loads": 2 } }
+    """
+    try:
+        return jsonify({
+            'token_cache': token_cache.stats(),
+            'user_cache': user_cache.stats(),
+            'audit_writer': audit_writer.stats(),
+            'email_outbox': outbox_stats(),
+            'smtp_pool': smtp_pool.stats(),
+            'smtp_breaker': smtp_breaker.stats(),
+            'smtp_config': smtp_config_cache.stats()
+        }), 200
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -0,0 +1,70 @@
+"""Server-Sent Events routes"""
+import json
+import threading
+import time
+from flask import Blueprint, Response, g, jsonify
+from auth import token_required
+from config import Config
+from services.event_service import get_broker
+
+event_bp = Blueprint('events', __name__)
+
+# Every open stream holds a gunicorn thread for up to SSE_MAX_CONNECTION_SECONDS
+_stream_slots = threading.BoundedSemaphore(Config.SSE_MAX_STREAMS)
+
+
+@event_bp.route('/events', methods=['GET'])
+@token_required
+def request_events():
+    """
+    Stream request events for the current user (Server-Sent Events)
+    GET /api/events
+    Headers: { "Authorization": "Bearer <token>" }
+    Returns: text/event-stream with events
+        event: request
+        data: { "type": "created|accepted|rejected|cancelled",
+                "request_id": 1, "employee_id": 5, "manager_id": 2, "status": "..." }
+
+    Employees and managers only receive events for requests they are party to,
+    admins receive all. The stream is closed after SSE_MAX_CONNECTION_SECONDS
+    and the client reconnects (so an expired token stops the stream).
+    Use fetch() with the Authorization header - EventSource cannot send it.
+
+    At most SSE_MAX_STREAMS streams are open per worker; beyond that the
+    endpoint returns 503 and the client should poll /api/requests instead.
+    """
+    if not _stream_slots.acquire(blocking=False):
+        return jsonify({'error': 'Too many open event streams. Please poll instead.'}), 503, {'Retry-After': '30'}
+
+    try:
+        broker = get_broker()
+        subscription = broker.subscribe(g.user_id, g.user_role)
+    except Exception:
+        _stream_slots.release()
+        raise
+    keepalive = Config.SSE_KEEPALIVE_SECONDS
+    deadline = time.monotonic() + Config.SSE_MAX_CONNECTION_SECONDS
+
+    def stream():
+        try:
+            yield 'retry: 5000\n\n'
+            while time.monotonic() < deadline:
+                payload = subscription.get(timeout=keepalive)
+                if payload is None:
+                    yield ': keepalive\n\n'
+                    continue
+                yield f"event: request\ndata: {json.dumps(payload)}\n\n"
+        finally:
+            broker.unsubscribe(subscription)
+
+    response = Response(
+        stream(),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+    # Runs even if the client goes away before the generator is started
+    response.call_on_close(_stream_slots.release)
+    return response
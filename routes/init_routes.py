@@ -3,8 +3,10 @@ Production initialization route (one-time use)
 Endpoint do czyszczenia bazy i utworzenia pierwszego admina
 """
 from flask import Blueprint, request, jsonify
-from models import db, User, Request, SmtpConfig, AuditLog
-from auth import hash_password
+from models import db, User, Request, SmtpConfig, AuditLog, EmailOutbox
+from auth import hash_password, PasswordHasherBusy
+from services.cache_service import bump_version, SCOPE_REQUESTS, SCOPE_USERS
+from services.user_cache import invalidate_users
 import os
 
 init_bp = Blueprint('init', __name__)
@@ -68,7 +70,11 @@ def init_production():
         if len(admin_password) < 8:
             return jsonify({'error': 'Password must be at least 8 characters'}), 400
 
-        # Clear all data
+        # Hash first - nothing is deleted if the hasher is busy
+        password_hash = hash_password(admin_password)
+
+        # Clear all data (queued emails too - they were addressed to the deleted users)
+        deleted_emails = EmailOutbox.query.delete()
         deleted_requests = Request.query.delete()
         deleted_logs = AuditLog.query.delete()
         deleted_smtp = SmtpConfig.query.delete()
@@ -79,13 +85,15 @@ def init_production():
             email=admin_email,
             first_name=admin_first_name,
             last_name=admin_last_name,
-            password_hash=hash_password(admin_password),
+            password_hash=password_hash,
             role='admin',
             supervisor_id=None,
             is_active=True
         )
 
         db.session.add(admin)
+        bump_version(SCOPE_USERS, SCOPE_REQUESTS)
+        invalidate_users()
         db.session.commit()
 
         return jsonify({
@@ -95,7 +103,8 @@ def init_production():
                 'users': deleted_users,
                 'requests': deleted_requests,
                 'audit_logs': deleted_logs,
-                'smtp_configs': deleted_smtp
+                'smtp_configs': deleted_smtp,
+                'emails': deleted_emails
             },
             'admin': {
                 'email': admin_email,
@@ -110,6 +119,9 @@ def init_production():
             ]
         }), 200
 
+    except PasswordHasherBusy:
+        db.session.rollback()
+        return jsonify({'error': 'Server busy. Please try again.'}), 503, {'Retry-After': '1'}
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
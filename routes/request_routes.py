@@ -1,59 +1,226 @@
 """Request (wniosek) management routes"""
-from flask import Blueprint, request, jsonify, g
-from models import db, Request, User
+from flask import Blueprint, request, jsonify, g, Response, stream_with_context, current_app
+from models import db, Request
+from config import Config
 from auth import token_required, require_role
-from services.audit_service import log_action
-from services.email_service import send_new_request_email, send_decision_email
+from services.audit_service import log_action, log_actions
+from services.email_outbox import enqueue_email
+from services.event_service import publish_request_event
+from services.user_cache import get_user_snapshot
+from services.cache_service import bump_version, conditional_get, SCOPE_REQUESTS, SCOPE_USERS
+from security import rate_limit
+from pagination import keyset_page, parse_limit, InvalidCursor
+from projections import request_list_select, serialize_request_rows, fetch_rows
 from datetime import datetime, date, time
+import csv
+import io
 from sqlalchemy import or_
 
 request_bp = Blueprint('requests', __name__)
 
 
+class InvalidFilter(ValueError):
+    """Raised when an ?employee_id= / ?manager_id= filter is not an integer"""
+
+
+def _id_filter(name):
+    """Parse an integer id query parameter, None when absent"""
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError as e:
+        raise InvalidFilter(f'{name} must be an integer') from e
+
+
+def _scoped_request_select():
+    """
+    Build request list SELECT scoped to the current user's role and
+    filtered by ?status=, ?employee_id= and ?manager_id=
+    """
+    status_filter = request.args.get('status')
+    employee_id_filter = _id_filter('employee_id')
+    manager_id_filter = _id_filter('manager_id')
+
+    # Build query based on user role
+    query = request_list_select()
+    if g.user_role == 'pracownik':
+        # Employee sees only their own requests
+        query = query.where(Request.employee_id == g.user_id)
+    elif g.user_role == 'manager':
+        # Manager sees their own requests + requests from their team
+        query = query.where(
+            or_(
+                Request.employee_id == g.user_id,
+                Request.manager_id == g.user_id
+            )
+        )
+    # admin sees all requests
+
+    # Apply filters
+    if status_filter:
+        query = query.where(Request.status == status_filter)
+    if employee_id_filter is not None:
+        query = query.where(Request.employee_id == employee_id_filter)
+    if manager_id_filter is not None:
+        query = query.where(Request.manager_id == manager_id_filter)
+
+    return query
+
+
 @request_bp.route('/requests', methods=['GET'])
 @token_required
+@conditional_get(SCOPE_REQUESTS, SCOPE_USERS)
 def get_requests():
     """
     Get requests based on user role
     GET /api/requests?status=oczekujący&employee_id=5
+    GET /api/requests?limit=50&after=<cursor> - cursor pagination
     Headers: { "Authorization": "Bearer <token>" }
     Returns: [{ "id": 1, "employee": {...}, "manager": {...}, ... }]
+    Returns (paged): { "items": [...], "next_cursor": "..." | null }
     """
     try:
-        # Get query parameters
-        status_filter = request.args.get('status')
-        employee_id_filter = request.args.get('employee_id')
-        manager_id_filter = request.args.get('manager_id')
-
-        # Build query based on user role
-        if g.user_role == 'pracownik':
-            # Employee sees only their own requests
-            query = Request.query.filter_by(employee_id=g.user_id)
-        elif g.user_role == 'manager':
-            # Manager sees their own requests + requests from their team
-            query = Request.query.filter(
-                or_(
-                    Request.employee_id == g.user_id,
-                    Request.manager_id == g.user_id
-                )
+        query = _scoped_request_select()
+
+        # Cursor pagination - keyset on (created_at, id), newest first
+        if 'limit' in request.args or 'after' in request.args:
+            limit = parse_limit(request.args.get('limit'))
+            rows, next_cursor = keyset_page(
+                query, Request.created_at, Request.id,
+                limit, after=request.args.get('after')
             )
-        else:  # admin
-            # Admin sees all requests
-            query = Request.query
-
-        # Apply filters
-        if status_filter:
-            query = query.filter_by(status=status_filter)
-        if employee_id_filter:
-            query = query.filter_by(employee_id=int(employee_id_filter))
-        if manager_id_filter:
-            query = query.filter_by(manager_id=int(manager_id_filter))
+            return jsonify({
+                'items': serialize_request_rows(rows),
+                'next_cursor': next_cursor
+            }), 200
 
         # Order by created_at desc
-        requests = query.order_by(Request.created_at.desc()).all()
+        rows = fetch_rows(query.order_by(Request.created_at.desc()))
 
-        return jsonify([req.to_dict() for req in requests]), 200
+        return jsonify(serialize_request_rows(rows)), 200
 
+    except (InvalidCursor, InvalidFilter) as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+EXPORT_CSV_HEADER = [
+    'id', 'employee_name', 'employee_email', 'manager_name', 'manager_email',
+    'date', 'time_out', 'time_return', 'reason', 'status',
+    'created_at', 'decision_date', 'manager_comment'
+]
+EXPORT_BATCH_SIZE = 1000
+
+
+# Spreadsheets evaluate cells starting with these as formulas
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _iso(value):
+    return value.isoformat() if value else None
+
+
+def _csv_cell(value):
+    """Prefix text that a spreadsheet would run as a formula with an apostrophe"""
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _export_csv(result):
+    """Yield CSV text one partition (EXPORT_BATCH_SIZE rows) at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # UTF-8 BOM so Excel detects the encoding of Polish characters
+    buffer.write('\ufeff')
+    writer.writerow(EXPORT_CSV_HEADER)
+    yield buffer.getvalue()
+
+    for rows in result.partitions():
+        buffer.seek(0)
+        buffer.truncate()
+        for item in serialize_request_rows(rows):
+            writer.writerow([_csv_cell(value) for value in (
+                item['id'],
+                item['employee']['name'], item['employee']['email'],
+                item['manager']['name'], item['manager']['email'],
+                item['date'].isoformat(), item['time_out'], item['time_return'],
+                item['reason'], item['status'],
+                _iso(item['created_at']), _iso(item['decision_date']),
+                item['manager_comment']
+            )])
+        yield buffer.getvalue()
+
+
+def _export_ndjson(result, dumps):
+    """Yield one JSON document per line, one partition at a time"""
+    for rows in result.partitions():
+        yield ''.join(
+            dumps(item) + '\n'
+            for item in serialize_request_rows(rows)
+        )
+
+
+@request_bp.route('/requests/export', methods=['GET'])
+@token_required
+@rate_limit(max_requests=10, window_seconds=60, scope=('user',))
+def export_requests():
+    """
+    Stream requests as CSV or NDJSON (same role scoping as GET /api/requests)
+    GET /api/requests/export?format=csv&date_from=2025-10-01&date_to=2025-10-31
+    Query: format=csv|ndjson, date_from, date_to, status, employee_id, manager_id
+    Headers: { "Authorization": "Bearer <token>" }
+    Returns: streamed file (rows are fetched from a server-side cursor in
+             batches, so memory use does not depend on the size of the export)
+    """
+    try:
+        export_format = request.args.get('format', 'csv')
+        if export_format not in ('csv', 'ndjson'):
+            return jsonify({'error': 'format must be csv or ndjson'}), 400
+
+        query = _scoped_request_select()
+
+        date_from = request.args.get('date_from')
+        date_to = request.args.get('date_to')
+        if date_from:
+            query = query.where(Request.date >= datetime.strptime(date_from, '%Y-%m-%d').date())
+        if date_to:
+            query = query.where(Request.date <= datetime.strptime(date_to, '%Y-%m-%d').date())
+
+        log_action(
+            g.user_id,
+            'REQUESTS_EXPORTED',
+            f'Exported requests ({export_format}) {date_from or "*"} - {date_to or "*"}'
+        )
+
+        stmt = query.order_by(Request.date, Request.id).execution_options(
+            yield_per=EXPORT_BATCH_SIZE
+        )
+        result = db.session.execute(stmt)
+
+        if export_format == 'csv':
+            body, mimetype = _export_csv(result), 'text/csv'
+        else:
+            body, mimetype = _export_ndjson(result, current_app.json.dumps), 'application/x-ndjson'
+
+        filename = f"wnioski_{date.today().isoformat()}.{export_format}"
+        return Response(
+            stream_with_context(body),
+            mimetype=mimetype,
+            headers={
+                'Content-Disposition': f'attachment; filename="{filename}"',
+                'X-Accel-Buffering': 'no'
+            }
+        )
+
+    except InvalidFilter as e:
+        return jsonify({'error': str(e)}), 400
+    except ValueError as ve:
+        return jsonify({'error': f'Invalid date format: {str(ve)}'}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -70,7 +237,7 @@ def create_request():
         "time_return": "12:00",
         "reason": "Wizyta u lekarza"
     }
-    Returns: { "success": true, "request_id": 1, "email_sent": true }
+    Returns: { "success": true, "request_id": 1, "email_queued": true }
     Note: manager_id is automatically determined from user's supervisor_id
     """
     try:
@@ -100,11 +267,11 @@ def create_request():
             return jsonify({'error': 'Return time must be after out time'}), 400
 
         # Get current user's supervisor (this becomes the manager for the request)
-        current_user = User.query.get(g.user_id)
+        current_user = get_user_snapshot(g.user_id)
         if not current_user.supervisor_id:
             return jsonify({'error': 'You must have a supervisor assigned to create requests'}), 400
 
-        supervisor = User.query.get(current_user.supervisor_id)
+        supervisor = get_user_snapshot(current_user.supervisor_id)
         if not supervisor:
             return jsonify({'error': 'Your supervisor not found in system'}), 404
 
@@ -120,28 +287,30 @@ def create_request():
         )
 
         db.session.add(new_request)
-        db.session.commit()
 
         # Get employee info
-        employee = User.query.get(g.user_id)
-        employee_name = f"{employee.first_name} {employee.last_name}"
-
-        # Send email to supervisor (manager of the request)
-        email_sent = False
-        try:
-            success, msg = send_new_request_email(
+        employee_name = current_user.full_name
+
+        # Email to supervisor (manager of the request) - delivered by email_worker.py;
+        # in digest mode the request waits for the manager's next summary instead
+        email_queued = not Config.EMAIL_DIGEST_ENABLED
+        if email_queued:
+            new_request.notified_at = datetime.utcnow()
+            enqueue_email(
+                'new_request',
                 supervisor.email,
-                employee_name,
-                {
+                employee_name=employee_name,
+                request_data={
                     'date': data['date'],
                     'time_out': data['time_out'],
                     'time_return': data['time_return'],
                     'reason': data['reason']
                 }
             )
-            email_sent = success
-        except Exception as email_error:
-            print(f"Email error: {str(email_error)}")
+
+        publish_request_event('created', new_request)
+        bump_version(SCOPE_REQUESTS)
+        db.session.commit()
 
         # Log action
         log_action(
@@ -153,7 +322,7 @@ def create_request():
         return jsonify({
             'success': True,
             'request_id': new_request.id,
-            'email_sent': email_sent
+            'email_queued': email_queued
         }), 201
 
     except ValueError as ve:
@@ -170,10 +339,12 @@ def accept_request(request_id):
     Accept request
     PUT /api/requests/:id/accept
     Headers: { "Authorization": "Bearer <token>" }
-    Returns: { "success": true, "email_sent": true }
+    Returns: { "success": true, "email_queued": true }
     """
     try:
-        req = Request.query.get(request_id)
+        # Row lock until commit - a concurrent decision or cancel waits and
+        # then sees the new status
+        req = Request.query.filter_by(id=request_id).with_for_update().first()
 
         if not req:
             return jsonify({'error': 'Request not found'}), 404
@@ -189,28 +360,27 @@ def accept_request(request_id):
         # Update request
         req.status = 'zaakceptowany'
         req.decision_date = datetime.utcnow()
-        db.session.commit()
 
         # Get employee info
         employee = req.employee
         employee_name = f"{employee.first_name} {employee.last_name}"
 
-        # Send email to employee
-        email_sent = False
-        try:
-            success, msg = send_decision_email(
-                employee.email,
-                employee_name,
-                {
-                    'date': req.date.isoformat(),
-                    'time_out': req.time_out.strftime('%H:%M'),
-                    'time_return': req.time_return.strftime('%H:%M')
-                },
-                'zaakceptowany'
-            )
-            email_sent = success
-        except Exception as email_error:
-            print(f"Email error: {str(email_error)}")
+        # Email to employee - delivered by email_worker.py
+        enqueue_email(
+            'decision',
+            employee.email,
+            employee_name=employee_name,
+            request_data={
+                'date': req.date.isoformat(),
+                'time_out': req.time_out.strftime('%H:%M'),
+                'time_return': req.time_return.strftime('%H:%M')
+            },
+            decision='zaakceptowany'
+        )
+
+        publish_request_event('accepted', req)
+        bump_version(SCOPE_REQUESTS)
+        db.session.commit()
 
         # Log action
         log_action(
@@ -221,7 +391,7 @@ def accept_request(request_id):
 
         return jsonify({
             'success': True,
-            'email_sent': email_sent
+            'email_queued': True
         }), 200
 
     except Exception as e:
@@ -237,13 +407,15 @@ def reject_request(request_id):
     PUT /api/requests/:id/reject
     Body: { "comment": "Zbyt krótkie wyprzedzenie" }
     Headers: { "Authorization": "Bearer <token>" }
-    Returns: { "success": true, "email_sent": true }
+    Returns: { "success": true, "email_queued": true }
     """
     try:
         data = request.get_json()
         comment = data.get('comment', '')
 
-        req = Request.query.get(request_id)
+        # Row lock until commit - a concurrent decision or cancel waits and
+        # then sees the new status
+        req = Request.query.filter_by(id=request_id).with_for_update().first()
 
         if not req:
             return jsonify({'error': 'Request not found'}), 404
@@ -260,29 +432,28 @@ def reject_request(request_id):
         req.status = 'odrzucony'
         req.decision_date = datetime.utcnow()
         req.manager_comment = comment
-        db.session.commit()
 
         # Get employee info
         employee = req.employee
         employee_name = f"{employee.first_name} {employee.last_name}"
 
-        # Send email to employee
-        email_sent = False
-        try:
-            success, msg = send_decision_email(
-                employee.email,
-                employee_name,
-                {
-                    'date': req.date.isoformat(),
-                    'time_out': req.time_out.strftime('%H:%M'),
-                    'time_return': req.time_return.strftime('%H:%M')
-                },
-                'odrzucony',
-                comment
-            )
-            email_sent = success
-        except Exception as email_error:
-            print(f"Email error: {str(email_error)}")
+        # Email to employee - delivered by email_worker.py
+        enqueue_email(
+            'decision',
+            employee.email,
+            employee_name=employee_name,
+            request_data={
+                'date': req.date.isoformat(),
+                'time_out': req.time_out.strftime('%H:%M'),
+                'time_return': req.time_return.strftime('%H:%M')
+            },
+            decision='odrzucony',
+            comment=comment
+        )
+
+        publish_request_event('rejected', req)
+        bump_version(SCOPE_REQUESTS)
+        db.session.commit()
 
         # Log action
         log_action(
@@ -293,7 +464,125 @@ def reject_request(request_id):
 
         return jsonify({
             'success': True,
-            'email_sent': email_sent
+            'email_queued': True
+        }), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+
+BULK_DECISION_LIMIT = 200
+BULK_DECISIONS = {'accept': 'zaakceptowany', 'reject': 'odrzucony'}
+
+
+@request_bp.route('/requests/bulk-decision', methods=['POST'])
+@require_role('manager', 'admin')
+def bulk_decision():
+    """
+    Accept and/or reject many requests at once (all or nothing)
+    POST /api/requests/bulk-decision
+    Body: {
+        "decisions": [
+            { "id": 1, "decision": "accept" },
+            { "id": 2, "decision": "reject", "comment": "Brak zastępstwa" }
+        ]
+    }
+    Headers: { "Authorization": "Bearer <token>" }
+    Returns: { "success": true, "processed": 2, "emails_queued": 2 }
+    Errors: { "error": "...", "failed": [{ "id": 2, "error": "..." }] }
+    """
+    try:
+        data = request.get_json() or {}
+        decisions = data.get('decisions')
+
+        if not isinstance(decisions, list) or not decisions:
+            return jsonify({'error': 'decisions must be a non-empty list'}), 400
+        if len(decisions) > BULK_DECISION_LIMIT:
+            return jsonify({'error': f'At most {BULK_DECISION_LIMIT} decisions per call'}), 400
+
+        by_id = {}
+        for item in decisions:
+            if not isinstance(item, dict) or item.get('decision') not in BULK_DECISIONS:
+                return jsonify({'error': 'Each decision needs an id and decision accept|reject'}), 400
+            try:
+                request_id = int(item.get('id'))
+            except (TypeError, ValueError):
+                return jsonify({'error': 'Each decision needs an id and decision accept|reject'}), 400
+            if request_id in by_id:
+                return jsonify({'error': f'Duplicate request id: {request_id}'}), 400
+            by_id[request_id] = item
+
+        # Load and lock all requests (with employees for the emails) in one
+        # query; the locks hold until commit, so a concurrent decision or
+        # cancel cannot change a request between validation and update.
+        # Locking in id order keeps two overlapping bulk calls from deadlocking
+        requests = Request.with_parties(Request.query).filter(
+            Request.id.in_(by_id.keys())
+        ).order_by(Request.id).with_for_update(of=Request).all()
+        found = {req.id: req for req in requests}
+
+        # Validate ownership and status of every request before changing any
+        failed = []
+        for request_id in by_id:
+            req = found.get(request_id)
+            if not req:
+                failed.append({'id': request_id, 'error': 'Request not found'})
+            elif g.user_role == 'manager' and req.manager_id != g.user_id:
+                failed.append({'id': request_id, 'error': 'Request is not assigned to you'})
+            elif req.status != 'oczekujący':
+                failed.append({'id': request_id, 'error': f'Request has status: {req.status}'})
+        if failed:
+            return jsonify({'error': 'Some requests cannot be decided', 'failed': failed}), 400
+
+        # Apply all decisions in one transaction
+        now = datetime.utcnow()
+        audit_entries = []
+        for request_id, item in by_id.items():
+            req = found[request_id]
+            decision = BULK_DECISIONS[item['decision']]
+            comment = item.get('comment') or None
+
+            req.status = decision
+            req.decision_date = now
+            if decision == 'odrzucony':
+                req.manager_comment = comment
+            publish_request_event('accepted' if decision == 'zaakceptowany' else 'rejected', req)
+
+            employee_name = f"{req.employee.first_name} {req.employee.last_name}"
+            if decision == 'zaakceptowany':
+                audit_entries.append((
+                    'REQUEST_ACCEPTED',
+                    f'Accepted request #{request_id} from {employee_name}'
+                ))
+            else:
+                audit_entries.append((
+                    'REQUEST_REJECTED',
+                    f'Rejected request #{request_id} from {employee_name}. Comment: {comment or ""}'
+                ))
+
+            enqueue_email(
+                'decision',
+                req.employee.email,
+                employee_name=employee_name,
+                request_data={
+                    'date': req.date.isoformat(),
+                    'time_out': req.time_out.strftime('%H:%M'),
+                    'time_return': req.time_return.strftime('%H:%M')
+                },
+                decision=decision,
+                comment=comment if decision == 'odrzucony' else None
+            )
+
+        log_actions(g.user_id, audit_entries)
+        bump_version(SCOPE_REQUESTS)
+        # Requests, audit entries and outbox emails commit together
+        db.session.commit()
+
+        return jsonify({
+            'success': True,
+            'processed': len(by_id),
+            'emails_queued': len(by_id)
         }), 200
 
     except Exception as e:
@@ -311,7 +600,9 @@ def cancel_request(request_id):
     Returns: { "success": true }
     """
     try:
-        req = Request.query.get(request_id)
+        # Row lock until commit - a concurrent decision or cancel waits and
+        # then sees the new status
+        req = Request.query.filter_by(id=request_id).with_for_update().first()
 
         if not req:
             return jsonify({'error': 'Request not found'}), 404
@@ -326,6 +617,8 @@ def cancel_request(request_id):
 
         # Change status to anulowany instead of deleting
         req.status = 'anulowany'
+        publish_request_event('cancelled', req)
+        bump_version(SCOPE_REQUESTS)
         db.session.commit()
 
         # Log action
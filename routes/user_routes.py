@@ -1,15 +1,20 @@
 """User management routes (Admin only)"""
 from flask import Blueprint, request, jsonify, g
 from models import db, User, Request
-from auth import require_role, hash_password
+from auth import require_role, hash_password, PasswordHasherBusy
 from services.audit_service import log_action
 from security import validate_email
+from services.cache_service import bump_version, conditional_get, SCOPE_REQUESTS, SCOPE_USERS
+from services.user_cache import get_user_snapshot, invalidate_users
+from projections import user_list_select, serialize_user_rows, fetch_rows
+from sqlalchemy.orm import joinedload
 
 user_bp = Blueprint('users', __name__)
 
 
 @user_bp.route('/users', methods=['GET'])
 @require_role('admin', 'manager', 'pracownik')
+@conditional_get(SCOPE_USERS)
 def get_users():
     """
     Get all users (admin) or managers (all roles)
@@ -22,12 +27,12 @@ def get_users():
         role_filter = request.args.get('role')
 
         # Build query
-        query = User.query
+        query = user_list_select()
 
         # If role=manager filter requested, allow all authenticated users
         # (needed for employee to select manager in request form)
         if role_filter == 'manager':
-            query = query.filter_by(role='manager')
+            query = query.where(User.role == 'manager')
         else:
             # Full user list - only admin and manager can access
             if g.user_role not in ['admin', 'manager']:
@@ -35,15 +40,15 @@ def get_users():
 
             # Filter by role if provided
             if role_filter:
-                query = query.filter_by(role=role_filter)
+                query = query.where(User.role == role_filter)
 
             # If manager is requesting, only show managers and admins
             if g.user_role == 'manager':
-                query = query.filter(User.role.in_(['manager', 'admin']))
+                query = query.where(User.role.in_(['manager', 'admin']))
 
-        users = query.order_by(User.created_at.desc()).all()
+        rows = fetch_rows(query.order_by(User.created_at.desc()))
 
-        return jsonify([user.to_dict() for user in users]), 200
+        return jsonify(serialize_user_rows(rows)), 200
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -109,6 +114,7 @@ def create_user():
         )
 
         db.session.add(new_user)
+        bump_version(SCOPE_USERS)
         db.session.commit()
 
         # Log action
@@ -123,6 +129,9 @@ def create_user():
             'user_id': new_user.id
         }), 201
 
+    except PasswordHasherBusy:
+        db.session.rollback()
+        return jsonify({'error': 'Server busy. Please try again.'}), 503, {'Retry-After': '1'}
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -176,6 +185,9 @@ def update_user(user_id):
                 return jsonify({'error': 'Password must be at least 8 characters long'}), 400
             user.password_hash = hash_password(data['password'])
 
+        # Names/emails are embedded in request lists too
+        bump_version(SCOPE_USERS, SCOPE_REQUESTS)
+        invalidate_users([user_id])
         db.session.commit()
 
         # Log action
@@ -187,6 +199,9 @@ def update_user(user_id):
 
         return jsonify({'success': True}), 200
 
+    except PasswordHasherBusy:
+        db.session.rollback()
+        return jsonify({'error': 'Server busy. Please try again.'}), 503, {'Retry-After': '1'}
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -208,7 +223,7 @@ def get_user_subordinates(user_id):
             return jsonify({'error': 'User not found'}), 404
 
         # Find all users who have this user as supervisor
-        subordinates = User.query.filter_by(supervisor_id=user_id).all()
+        subordinates = User.query.options(joinedload(User.supervisor)).filter_by(supervisor_id=user_id).all()
 
         return jsonify({
             'count': len(subordinates),
@@ -248,6 +263,8 @@ def reassign_subordinates(user_id):
         for subordinate in subordinates:
             subordinate.supervisor_id = new_supervisor_id
 
+        bump_version(SCOPE_USERS)
+        invalidate_users([user_id] + [s.id for s in subordinates])
         db.session.commit()
 
         # Log action
@@ -295,6 +312,8 @@ def delete_user(user_id):
 
         email = user.email
         db.session.delete(user)
+        bump_version(SCOPE_USERS, SCOPE_REQUESTS)
+        invalidate_users([user_id])
         db.session.commit()
 
         # Log action
@@ -321,12 +340,12 @@ def get_user(user_id):
     Returns: { "id": 1, "email": "...", ... }
     """
     try:
-        user = User.query.get(user_id)
+        user = get_user_snapshot(user_id)
 
         if not user:
             return jsonify({'error': 'User not found'}), 404
 
-        return jsonify(user.to_dict()), 200
+        return jsonify(user.data), 200
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
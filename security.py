@@ -1,17 +1,34 @@
 """Production security enhancements"""
 from functools import wraps
-from flask import request, jsonify
+from collections import OrderedDict
+from flask import request, jsonify, g
+from sqlalchemy import case
+from sqlalchemy.dialects import postgresql, sqlite
 import re
+import threading
+import time
 from cryptography.fernet import Fernet
 import os
 import base64
 from hashlib import sha256
+from config import Config
+from models import db, RateLimitCounter
+
+
+# Input validation patterns - compiled once at import. Every pattern and
+# scanner below runs in time linear in the input length, including inputs
+# built to make a backtracking regex rescan the text from every position
+# (see benchmarks/bench_input_validation.py).
+EMAIL_MAX_LENGTH = 254
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+_UPPERCASE_RE = re.compile(r'[A-Z]')
+_LOWERCASE_RE = re.compile(r'[a-z]')
+_DIGIT_RE = re.compile(r'\d')
 
 
 def validate_email(email):
     """Validate email format"""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return len(email) <= EMAIL_MAX_LENGTH and _EMAIL_RE.fullmatch(email) is not None
 
 
 def validate_password_strength(password):
@@ -25,64 +42,300 @@ def validate_password_strength(password):
     if len(password) < 8:
         return False, "Hasło musi mieć minimum 8 znaków"
 
-    if not re.search(r'[A-Z]', password):
+    if not _UPPERCASE_RE.search(password):
         return False, "Hasło musi zawierać przynajmniej jedną wielką literę"
 
-    if not re.search(r'[a-z]', password):
+    if not _LOWERCASE_RE.search(password):
         return False, "Hasło musi zawierać przynajmniej jedną małą literę"
 
-    if not re.search(r'\d', password):
+    if not _DIGIT_RE.search(password):
         return False, "Hasło musi zawierać przynajmniej jedną cyfrę"
 
     return True, "OK"
 
 
-def rate_limit(max_requests=5, window_seconds=60):
+class MemoryRateLimitBackend:
     """
-    Simple rate limiting decorator
-    In production, use Redis-based rate limiting
+    In-process sliding-window counters with LRU eviction
+
+    Each key keeps (window index, count, previous window count), so a hit is
+    O(1) and memory is bounded by `max_keys` regardless of how many distinct
+    IPs/users are seen. Counters are private to one worker process.
     """
-    requests_dict = {}
 
-    def decorator(f):
-        @wraps(f)
-        def wrapper(*args, **kwargs):
-            import time
-            client_ip = request.remote_addr
-            current_time = time.time()
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._counters = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, window, window_seconds):
+        """Count a hit in `window` and return (count, prev_count)"""
+        with self._lock:
+            entry = self._counters.get(key)
+            if entry is None:
+                count, prev_count = 1, 0
+            else:
+                entry_window, entry_count, entry_prev = entry
+                if entry_window == window:
+                    count, prev_count = entry_count + 1, entry_prev
+                elif entry_window == window - 1:
+                    count, prev_count = 1, entry_count
+                else:
+                    count, prev_count = 1, 0
+            self._counters[key] = (window, count, prev_count)
+            self._counters.move_to_end(key)
+            while len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+            return count, prev_count
+
+
+class DatabaseRateLimitBackend:
+    """
+    Sliding-window counters in the rate_limit_counters table
 
-            # Clean old entries
-            requests_dict[client_ip] = [
-                req_time for req_time in requests_dict.get(client_ip, [])
-                if current_time - req_time < window_seconds
-            ]
+    Shared by all worker processes - one atomic upsert per hit, on its own
+    connection so it never touches the request's session transaction.
+    Each row stores when it stops counting (two of its own windows after
+    the last hit); expired rows are pruned periodically.
+    """
+
+    PRUNE_INTERVAL = 600
+
+    def __init__(self, engine):
+        self.engine = engine
+        self._last_prune = 0
+
+    def _insert(self):
+        dialect = postgresql if self.engine.dialect.name == 'postgresql' else sqlite
+        return dialect.insert(RateLimitCounter.__table__)
+
+    def hit(self, key, window, window_seconds):
+        """Count a hit in `window` and return (count, prev_count)"""
+        table = RateLimitCounter.__table__
+        # Counts of `window` are used until the end of the next one
+        expires_at = (window + 2) * window_seconds
+        stmt = self._insert().values(key=key, window=window, count=1, prev_count=0,
+                                     expires_at=expires_at)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.key],
+            set_={
+                # SET expressions see the old row values
+                'prev_count': case(
+                    (table.c.window == window, table.c.prev_count),
+                    (table.c.window == window - 1, table.c.count),
+                    else_=0
+                ),
+                'count': case(
+                    (table.c.window == window, table.c.count + 1),
+                    else_=1
+                ),
+                'window': window,
+                'expires_at': expires_at
+            }
+        ).returning(table.c.count, table.c.prev_count)
+
+        with self.engine.begin() as conn:
+            count, prev_count = conn.execute(stmt).one()
+            now = time.time()
+            if now - self._last_prune > self.PRUNE_INTERVAL:
+                self._last_prune = now
+                conn.execute(table.delete().where(table.c.expires_at < int(now)))
+        return count, prev_count
+
+
+_rate_limit_backend = None
+
+
+def get_rate_limit_backend():
+    """Process-wide backend chosen by RATE_LIMIT_BACKEND (auto by default)"""
+    global _rate_limit_backend
+    if _rate_limit_backend is None:
+        backend = Config.RATE_LIMIT_BACKEND
+        if backend == 'auto':
+            backend = 'database' if db.engine.dialect.name == 'postgresql' else 'memory'
+        if backend == 'database':
+            _rate_limit_backend = DatabaseRateLimitBackend(db.engine)
+        else:
+            _rate_limit_backend = MemoryRateLimitBackend(Config.RATE_LIMIT_MAX_KEYS)
+    return _rate_limit_backend
+
+
+def _rate_limit_keys(scope):
+    """Yield identities (ip / user / login account) the current call is limited by"""
+    for kind in scope:
+        if kind == 'ip':
+            yield f'ip:{request.remote_addr}'
+        elif kind == 'user' and getattr(g, 'user_id', None):
+            yield f'user:{g.user_id}'
+        elif kind == 'login':
+            data = request.get_json(silent=True) or {}
+            email = str(data.get('email') or '').strip().lower()
+            if email:
+                yield f'login:{sha256(email.encode()).hexdigest()}'
+
+
+def rate_limit(max_requests=5, window_seconds=60, scope=('ip',)):
+    """
+    Sliding-window rate limiting decorator
 
-            # Check rate limit
-            if len(requests_dict.get(client_ip, [])) >= max_requests:
-                return jsonify({'error': 'Too many requests. Please try again later.'}), 429
+    Estimates the number of calls in the last `window_seconds` from the
+    current and previous fixed-window counters (O(1) per call) and returns
+    429 once it exceeds `max_requests`.
 
-            # Add current request
-            if client_ip not in requests_dict:
-                requests_dict[client_ip] = []
-            requests_dict[client_ip].append(current_time)
+    Args:
+        max_requests: Allowed calls per window
+        window_seconds: Window length
+        scope: Identities limited independently - 'ip', 'user' (needs
+               token_required above) and/or 'login' (email from JSON body)
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            now = time.time()
+            window = int(now // window_seconds)
+            elapsed = (now % window_seconds) / window_seconds
+
+            backend = get_rate_limit_backend()
+            for identity in _rate_limit_keys(scope):
+                key = f'{f.__name__}:{window_seconds}:{identity}'
+                try:
+                    count, prev_count = backend.hit(key, window, window_seconds)
+                except Exception as e:
+                    # Fail open - rate limiting must not take the API down
+                    print(f"⚠️  Rate limit backend error: {str(e)}")
+                    continue
+
+                if prev_count * (1 - elapsed) + count > max_requests:
+                    retry_after = int(window_seconds * (1 - elapsed)) + 1
+                    return jsonify({'error': 'Too many requests. Please try again later.'}), 429, \
+                        {'Retry-After': str(retry_after)}
 
             return f(*args, **kwargs)
         return wrapper
     return decorator
 
 
+# sanitize_input. Each pass removes the same text as the re.sub it replaces
+# (noted on the function) but finds it with forward-only searches, so a pass
+# is linear in the length of the text. A removal can make a new construct
+# ("java<script></script>script:"), so the passes are repeated until nothing
+# changes - at most SANITIZE_MAX_PASSES times.
+SANITIZE_MAX_PASSES = 8
+_SCRIPT_OPEN_RE = re.compile(r'<script', re.IGNORECASE)
+_SCRIPT_CLOSE_RE = re.compile(r'</script>', re.IGNORECASE)
+_IFRAME_OPEN_RE = re.compile(r'<iframe', re.IGNORECASE)
+_IFRAME_CLOSE_RE = re.compile(r'</iframe>', re.IGNORECASE)
+_JAVASCRIPT_RE = re.compile(r'javascript:', re.IGNORECASE)
+# A whole word followed by "=" - starts only at a word start, so each word
+# is matched at most once
+_ASSIGNED_WORD_RE = re.compile(r'(?<!\w)(\w+)\s*=')
+_ON_RE = re.compile(r'on', re.IGNORECASE)
+_ANGLE_BRACKETS_RE = re.compile(r'[<>]')
+
+# Any of: an SQL keyword, a comment or statement separator, or OR/AND with
+# "=" later on the same line. The OR/AND branch starts only at a line start
+# and stops at the first OR/AND of the line, so it scans each line once.
+_SQL_INJECTION_RE = re.compile(r"""
+    \b(?:SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC|EXECUTE)\b
+  | --|;|/\*|\*/
+  | ^(?:(?!\b(?:OR|AND)\b).)*\b(?:OR|AND)\b.*=
+""", re.IGNORECASE | re.MULTILINE | re.VERBOSE)
+
+
+def _remove_elements(text, opening, closing):
+    """
+    re.sub(r'<tag[^>]*>.*?</tag>', '', text, flags=re.IGNORECASE | re.DOTALL)
+
+    Once an opening tag has no '>' or no closing tag after it, no later
+    one has either, so the scan stops instead of trying every position.
+    """
+    parts = []
+    pos = 0
+    while True:
+        start = opening.search(text, pos)
+        if not start:
+            break
+        tag_end = text.find('>', start.end())
+        if tag_end < 0:
+            break
+        end = closing.search(text, tag_end + 1)
+        if not end:
+            break
+        parts.append(text[pos:start.start()])
+        pos = end.end()
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+def _remove_javascript(text):
+    """
+    re.sub('javascript:', '', text, flags=re.IGNORECASE), repeated until
+    nothing changes ("javajavascript:script:"), in one pass
+    """
+    cleaned = _JAVASCRIPT_RE.sub('', text)
+    if cleaned == text or not _JAVASCRIPT_RE.search(cleaned):
+        return cleaned
+    out = []
+    for c in text:
+        out.append(c)
+        if c == ':' and len(out) >= 11 and _JAVASCRIPT_RE.fullmatch(''.join(out[-11:])):
+            del out[-11:]
+    return ''.join(out)
+
+
+def _remove_event_handlers(text):
+    r"""
+    re.sub(r'on\w+\s*=', '', text, flags=re.IGNORECASE)
+
+    Looks at each word followed by "=" once: a match starts at its first
+    "on" that has another word character after it.
+    """
+    if '=' not in text:
+        return text
+    parts = []
+    pos = 0
+    for assign in _ASSIGNED_WORD_RE.finditer(text):
+        on = _ON_RE.search(text, assign.start(), assign.end(1) - 1)
+        if not on:
+            continue
+        parts.append(text[pos:on.start()])
+        pos = assign.end()
+    if not parts:
+        return text
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
 def sanitize_input(text):
-    """Sanitize user input to prevent XSS"""
+    """
+    Sanitize user input to prevent XSS
+
+    Removes <script>/<iframe> elements with their content, "javascript:"
+    and event handler attributes (on...=). The passes are repeated until
+    nothing changes, so constructs that only form once something between
+    their parts is removed ("java<script></script>script:") go as well.
+    Text still changing after SANITIZE_MAX_PASSES passes is built to get
+    through the filter; its '<' and '>' are removed, so no tag can form.
+    Linear in the length of the text.
+    """
     if not text:
         return text
 
-    # Remove potential script tags and harmful HTML
-    text = re.sub(r'<script[^>]*>.*?</script>', '', text, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r'<iframe[^>]*>.*?</iframe>', '', text, flags=re.IGNORECASE | re.DOTALL)
-    text = re.sub(r'javascript:', '', text, flags=re.IGNORECASE)
-    text = re.sub(r'on\w+\s*=', '', text, flags=re.IGNORECASE)
+    # Every construct needs one of these characters
+    if '<' not in text and ':' not in text and '=' not in text:
+        return text.strip()
 
-    return text.strip()
+    for _ in range(SANITIZE_MAX_PASSES):
+        cleaned = _remove_elements(text, _SCRIPT_OPEN_RE, _SCRIPT_CLOSE_RE)
+        cleaned = _remove_elements(cleaned, _IFRAME_OPEN_RE, _IFRAME_CLOSE_RE)
+        cleaned = _remove_event_handlers(_remove_javascript(cleaned))
+        if cleaned == text:
+            return text.strip()
+        text = cleaned
+
+    return _ANGLE_BRACKETS_RE.sub('', text).strip()
 
 
 def validate_sql_injection(text):
@@ -90,19 +343,7 @@ def validate_sql_injection(text):
     if not text:
         return True
 
-    # Suspicious patterns
-    patterns = [
-        r"(\b(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC|EXECUTE)\b)",
-        r"(--|\;|\/\*|\*\/)",
-        r"(\bOR\b.*=.*)",
-        r"(\bAND\b.*=.*)"
-    ]
-
-    for pattern in patterns:
-        if re.search(pattern, str(text), re.IGNORECASE):
-            return False
-
-    return True
+    return _SQL_INJECTION_RE.search(str(text)) is None
 
 
 def get_encryption_key():
@@ -120,6 +361,25 @@ def get_encryption_key():
     return base64.urlsafe_b64encode(key_bytes)
 
 
+_cipher = None
+_cipher_lock = threading.Lock()
+
+
+def get_cipher():
+    """
+    Fernet cipher for SMTP credentials, built once per process
+
+    SECRET_KEY does not change while the process runs, so the key
+    derivation and Fernet setup are not repeated on every call.
+    """
+    global _cipher
+    if _cipher is None:
+        with _cipher_lock:
+            if _cipher is None:
+                _cipher = Fernet(get_encryption_key())
+    return _cipher
+
+
 def encrypt_password(password):
     """
     Encrypt a password for secure storage
@@ -133,9 +393,7 @@ def encrypt_password(password):
     if not password:
         return None
 
-    key = get_encryption_key()
-    f = Fernet(key)
-    encrypted = f.encrypt(password.encode())
+    encrypted = get_cipher().encrypt(password.encode())
     return encrypted.decode()
 
 
@@ -153,9 +411,7 @@ def decrypt_password(encrypted_password):
         return None
 
     try:
-        key = get_encryption_key()
-        f = Fernet(key)
-        decrypted = f.decrypt(encrypted_password.encode())
+        decrypted = get_cipher().decrypt(encrypted_password.encode())
         return decrypted.decode()
     except Exception as e:
         print(f"⚠️  Failed to decrypt password: {str(e)}")
@@ -0,0 +1,186 @@
+"""
+Audit log retention and archive
+
+Rows older than AUDIT_RETENTION_DAYS are moved out of `audit_log` into
+gzip-compressed JSONL segments in AUDIT_ARCHIVE_DIR, one segment per batch
+of AUDIT_ARCHIVE_BATCH_SIZE rows. Each segment is written to a temporary
+file, fsynced and renamed before its rows are deleted, and is never
+modified afterwards. Segment names carry the timestamp range of their
+rows, so readers only open segments that overlap the requested range.
+
+Archived rows have the same shape as GET /api/audit-logs items, with the
+user name captured at archive time.
+
+The archive is the only copy of the rows it holds, so AUDIT_ARCHIVE_DIR
+must be an absolute path on persistent storage shared by the web app and
+the cron job - nothing is archived (or read) without it.
+"""
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import delete
+from config import Config
+from models import db, AuditLog
+from projections import audit_list_select, serialize_audit_rows
+
+SEGMENT_PREFIX = 'audit_'
+SEGMENT_SUFFIX = '.jsonl.gz'
+_TS_FORMAT = '%Y%m%dT%H%M%S%f'
+
+
+class ArchiveNotConfigured(Exception):
+    """Raised when AUDIT_ARCHIVE_DIR is missing or not an absolute path"""
+
+
+def get_archive_dir(archive_dir=None):
+    """Archive directory - the argument or AUDIT_ARCHIVE_DIR, as an absolute path"""
+    archive_dir = archive_dir or Config.AUDIT_ARCHIVE_DIR
+    if not archive_dir:
+        raise ArchiveNotConfigured('AUDIT_ARCHIVE_DIR is not set')
+    if not os.path.isabs(archive_dir):
+        raise ArchiveNotConfigured(f'AUDIT_ARCHIVE_DIR must be an absolute path, got: {archive_dir}')
+    return archive_dir
+
+
+def _segment_name(items):
+    first = items[0]['timestamp'].strftime(_TS_FORMAT)
+    last = items[-1]['timestamp'].strftime(_TS_FORMAT)
+    return f"{SEGMENT_PREFIX}{first}_{last}_{items[-1]['id']}{SEGMENT_SUFFIX}"
+
+
+def _write_segment(archive_dir, items):
+    """Write items to a new segment atomically; return its path"""
+    path = os.path.join(archive_dir, _segment_name(items))
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as raw:
+        with gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=9, mtime=0) as gz:
+            for item in items:
+                line = dict(item, timestamp=item['timestamp'].isoformat())
+                gz.write(json.dumps(line, ensure_ascii=False).encode('utf-8') + b'\n')
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp_path, path)
+    return path
+
+
+def list_segments(archive_dir=None):
+    """
+    List archive segments, oldest first
+
+    Returns:
+        list of (path, first_timestamp, last_timestamp) tuples
+    """
+    archive_dir = get_archive_dir(archive_dir)
+    if not os.path.isdir(archive_dir):
+        return []
+
+    segments = []
+    for name in os.listdir(archive_dir):
+        if not (name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX)):
+            continue
+        try:
+            first, last, _last_id = name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)].split('_')
+            segments.append((
+                os.path.join(archive_dir, name),
+                datetime.strptime(first, _TS_FORMAT),
+                datetime.strptime(last, _TS_FORMAT)
+            ))
+        except ValueError:
+            continue
+    segments.sort(key=lambda segment: (segment[1], segment[2]))
+    return segments
+
+
+def archive_audit_logs(older_than_days=None, batch_size=None, archive_dir=None, max_batches=None):
+    """
+    Move audit log rows older than the retention period into archive segments
+
+    Works in batches, oldest first, with one short transaction per batch,
+    so the live table is never locked for long and the job can be stopped
+    and resumed at any point.
+
+    Args:
+        older_than_days: Retention period (default AUDIT_RETENTION_DAYS)
+        batch_size: Rows per batch/segment (default AUDIT_ARCHIVE_BATCH_SIZE)
+        archive_dir: Target directory (default AUDIT_ARCHIVE_DIR)
+        max_batches: Optional limit of batches for this run
+
+    Returns:
+        dict: { "archived": rows moved, "segments": [paths], "cutoff": datetime }
+    """
+    older_than_days = Config.AUDIT_RETENTION_DAYS if older_than_days is None else older_than_days
+    batch_size = batch_size or Config.AUDIT_ARCHIVE_BATCH_SIZE
+    archive_dir = get_archive_dir(archive_dir)
+    os.makedirs(archive_dir, exist_ok=True)
+
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    stmt = (
+        audit_list_select()
+        .where(AuditLog.timestamp < cutoff)
+        .order_by(AuditLog.timestamp, AuditLog.id)
+        .limit(batch_size)
+    )
+
+    archived = 0
+    segments = []
+    while max_batches is None or len(segments) < max_batches:
+        rows = db.session.execute(stmt).all()
+        if not rows:
+            break
+
+        items = serialize_audit_rows(rows)
+        path = _write_segment(archive_dir, items)
+        try:
+            db.session.execute(
+                delete(AuditLog)
+                .where(AuditLog.id.in_([item['id'] for item in items]))
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            # Rows stay in the live table - drop the segment to avoid duplicates
+            os.remove(path)
+            raise
+
+        archived += len(items)
+        segments.append(path)
+
+    return {'archived': archived, 'segments': segments, 'cutoff': cutoff}
+
+
+def iter_archived_audit_logs(since=None, until=None, user_id=None, actions=None, archive_dir=None):
+    """
+    Stream archived audit log entries, oldest first
+
+    Only segments overlapping [since, until) are opened, and they are read
+    line by line, so memory use does not depend on the archive size.
+
+    Args:
+        since: Optional datetime - only entries at or after it
+        until: Optional datetime - only entries before it
+        user_id: Optional user ID filter
+        actions: Optional list of actions to include
+        archive_dir: Archive directory (default AUDIT_ARCHIVE_DIR)
+
+    Yields:
+        dict per entry (same shape as GET /api/audit-logs items)
+    """
+    actions = set(actions) if actions else None
+
+    for path, first, last in list_segments(archive_dir):
+        if (since and last < since) or (until and first >= until):
+            continue
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                item = json.loads(line)
+                if user_id and item['user_id'] != user_id:
+                    continue
+                if actions and item['action'] not in actions:
+                    continue
+                if since or until:
+                    timestamp = datetime.fromisoformat(item['timestamp'])
+                    if (since and timestamp < since) or (until and timestamp >= until):
+                        continue
+                yield item
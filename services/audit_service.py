@@ -1,17 +1,163 @@
-"""Audit logging service"""
+"""
+Audit logging service
+
+log_action() does not write to the database in the request thread: entries
+are queued and a background thread stores them with multi-row INSERTs once
+AUDIT_BATCH_SIZE entries are waiting or AUDIT_FLUSH_INTERVAL seconds have
+passed. The queue is flushed when the worker process exits. With
+AUDIT_ASYNC=false, or when the queue is full, entries are written
+synchronously as before.
+"""
+import atexit
+import os
+import queue
+import threading
+import time
 from models import db, AuditLog
+from config import Config
+from pagination import keyset_page
+from projections import audit_list_select, serialize_audit_rows
 from datetime import datetime
 
 
+class AuditWriter:
+    """Buffered, batching writer of audit_log rows (one per process)"""
+
+    def __init__(self, batch_size, flush_interval, max_queue):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._engine = None
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        self.overflows = 0
+
+    def _ensure_started(self):
+        # Threads do not survive fork - start one per gunicorn worker, on first use
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._engine = db.engine
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='audit-writer', daemon=True)
+            self._thread.start()
+
+    def enqueue(self, entry):
+        """Queue an entry (dict of AuditLog columns); False if the queue is full"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            self.overflows += 1
+            return False
+
+    def _drain(self, limit):
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            # Wait for more entries until the batch is full or the interval ends
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch):
+        if not batch:
+            return
+        try:
+            with self._write_lock, self._engine.begin() as conn:
+                conn.execute(AuditLog.__table__.insert(), batch)
+            self.written += len(batch)
+            self.batches += 1
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"Error writing audit batch ({len(batch)} entries): {str(e)}")
+
+    def flush(self):
+        """Write all queued entries now, in the calling thread"""
+        if self._engine is None:
+            return
+        while True:
+            batch = self._drain(self.batch_size)
+            if not batch:
+                return
+            self._write(batch)
+
+    def stop(self):
+        """Stop the background thread and flush what is left (worker shutdown)"""
+        if self._pid != os.getpid():
+            return
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def stats(self):
+        """Counters for monitoring"""
+        return {
+            'queued': self._queue.qsize(),
+            'written': self.written,
+            'batches': self.batches,
+            'failed': self.failed,
+            'overflows': self.overflows
+        }
+
+
+audit_writer = AuditWriter(Config.AUDIT_BATCH_SIZE, Config.AUDIT_FLUSH_INTERVAL,
+                           Config.AUDIT_MAX_QUEUE)
+atexit.register(audit_writer.stop)
+
+
 def log_action(user_id, action, details=None):
     """
     Log an action to the audit log
 
+    The entry is queued for the background writer (see module docstring);
+    the caller's session is not touched or committed.
+
     Args:
         user_id: ID of the user performing the action (can be None for system actions)
         action: Description of the action (e.g., "USER_CREATED", "REQUEST_APPROVED")
         details: Optional additional details as string
     """
+    if Config.AUDIT_ASYNC:
+        entry = {
+            'user_id': user_id,
+            'action': action,
+            'details': details,
+            'timestamp': datetime.utcnow()
+        }
+        if audit_writer.enqueue(entry):
+            return True
+
+    # Synchronous fallback
     try:
         audit_entry = AuditLog(
             user_id=user_id,
@@ -28,21 +174,60 @@ def log_action(user_id, action, details=None):
         return False
 
 
-def get_audit_logs(limit=100, user_id=None):
+def log_actions(user_id, entries):
+    """
+    Add several audit entries with one multi-row INSERT
+
+    Runs inside the caller's transaction (no commit), so the entries are
+    stored atomically with the change they describe.
+
+    Args:
+        user_id: ID of the user performing the actions
+        entries: List of (action, details) tuples
+    """
+    if not entries:
+        return
+    now = datetime.utcnow()
+    db.session.execute(
+        AuditLog.__table__.insert(),
+        [
+            {'user_id': user_id, 'action': action, 'details': details, 'timestamp': now}
+            for action, details in entries
+        ]
+    )
+
+
+def get_audit_logs(limit=50, user_id=None, actions=None, since=None, until=None, after=None):
     """
-    Retrieve audit logs
+    Retrieve a page of audit logs, newest first
+
+    Uses keyset pagination on (timestamp, id) with the user name joined in
+    the same query, so every page costs one indexed range scan.
 
     Args:
-        limit: Maximum number of logs to retrieve
+        limit: Page size
         user_id: Optional user ID to filter logs
+        actions: Optional list of actions to filter logs
+        since: Optional datetime - only entries at or after it
+        until: Optional datetime - only entries before it
+        after: Optional cursor from a previous page
 
     Returns:
-        List of audit log entries
+        tuple: (list of audit log entries, next_cursor or None)
     """
-    query = AuditLog.query
+    # Make this worker's queued entries visible to the reader
+    audit_writer.flush()
+
+    query = audit_list_select()
 
     if user_id:
-        query = query.filter_by(user_id=user_id)
+        query = query.where(AuditLog.user_id == user_id)
+    if actions:
+        query = query.where(AuditLog.action.in_(actions))
+    if since:
+        query = query.where(AuditLog.timestamp >= since)
+    if until:
+        query = query.where(AuditLog.timestamp < until)
 
-    logs = query.order_by(AuditLog.timestamp.desc()).limit(limit).all()
-    return [log.to_dict() for log in logs]
+    rows, next_cursor = keyset_page(query, AuditLog.timestamp, AuditLog.id, limit, after=after)
+    return serialize_audit_rows(rows), next_cursor
@@ -0,0 +1,80 @@
+"""Version stamps and conditional GET (ETag) support for list endpoints"""
+from functools import wraps
+from hashlib import sha1
+from flask import request, g, make_response
+from sqlalchemy import update
+from models import db, CacheVersion
+
+# Scopes - bump the scope whenever data rendered by its endpoints changes
+SCOPE_REQUESTS = 'requests'
+SCOPE_USERS = 'users'
+
+
+def bump_version(*scopes):
+    """
+    Increment version stamp of the given scopes
+
+    Runs inside the caller's transaction (no commit), so the new version
+    becomes visible to other workers exactly when the data change does.
+
+    Args:
+        scopes: Scope names, e.g. SCOPE_REQUESTS, SCOPE_USERS
+    """
+    for scope in scopes:
+        result = db.session.execute(
+            update(CacheVersion)
+            .where(CacheVersion.scope == scope)
+            .values(version=CacheVersion.version + 1)
+        )
+        if result.rowcount == 0:
+            db.session.add(CacheVersion(scope=scope, version=1))
+
+
+def get_versions(scopes):
+    """
+    Read current version stamps of the given scopes with one query
+
+    Returns:
+        tuple of versions in the order of `scopes` (0 for unknown scopes)
+    """
+    rows = dict(
+        db.session.query(CacheVersion.scope, CacheVersion.version)
+        .filter(CacheVersion.scope.in_(scopes))
+        .all()
+    )
+    return tuple(rows.get(scope, 0) for scope in scopes)
+
+
+def conditional_get(*scopes):
+    """
+    Decorator adding ETag / If-None-Match support to a GET endpoint
+
+    The ETag is derived from the scope versions, the caller's identity/role
+    (lists are role-scoped) and the full query string. When the client sends
+    a matching If-None-Match, 304 is returned before the view runs, so
+    unchanged lists cost a single primary-key lookup.
+
+    Must be applied below token_required/require_role (needs g.user_id).
+    """
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            versions = get_versions(scopes)
+            raw = f"{versions}|{g.user_id}|{g.user_role}|{request.full_path}"
+            etag = sha1(raw.encode()).hexdigest()
+
+            # Weak match: compression turns the ETag into a weak one
+            if request.if_none_match.contains_weak(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            # Browser must revalidate on every use; response is per-user
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response.vary.add('Authorization')
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,287 @@
+"""
+Transactional email outbox
+
+Routes call enqueue_email() before committing a change: the email is
+stored in `email_outbox` in the same transaction, so it exists if and only
+if the change does, and the request returns without talking to SMTP.
+email_worker.py drains the outbox with deliver_pending():
+
+- due rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED and leased
+  (next_attempt_at moved EMAIL_OUTBOX_LEASE_SECONDS ahead) in a short
+  transaction, so several workers never pick the same email and no lock is
+  held while talking to SMTP; the outcomes are recorded in a second short
+  transaction;
+- a failed send is retried with exponential backoff (plus jitter) up to
+  EMAIL_MAX_ATTEMPTS, after which the row is parked as 'dead' for an admin
+  to inspect and requeue (email_worker.py --retry-dead);
+- while the SMTP circuit breaker is open, emails stay pending untouched
+  and do not use up their attempts.
+
+With EMAIL_DIGEST_ENABLED, new requests are not emailed one by one:
+flush_digests() (run by the worker every EMAIL_DIGEST_INTERVAL_MINUTES)
+queues one summary per manager instead.
+
+Delivery is at-least-once: a worker that dies mid-batch leaves its rows
+pending and they are sent again once their lease expires.
+"""
+import random
+from datetime import datetime, timedelta
+from itertools import groupby
+from sqlalchemy import func, update
+from config import Config
+from models import db, EmailOutbox, Request
+from projections import request_list_select
+from services.email_service import (
+    send_new_request_email, send_decision_email, send_digest_email, smtp_breaker
+)
+from services.event_service import publish_event, SESSION_KEY
+
+STATUS_PENDING = 'pending'
+STATUS_SENT = 'sent'
+STATUS_DEAD = 'dead'
+
+EVENT_KIND = 'email'
+
+# kind -> sender(recipient, **payload) returning (success, message)
+SENDERS = {
+    'new_request': send_new_request_email,
+    'decision': send_decision_email,
+    'digest': send_digest_email,
+}
+
+
+def enqueue_email(kind, recipient, **payload):
+    """
+    Add an email to the outbox inside the caller's transaction (no commit)
+
+    Args:
+        kind: Key of SENDERS, e.g. 'decision'
+        recipient: Recipient email address
+        payload: JSON-serializable keyword arguments of the sender
+
+    Returns:
+        EmailOutbox: the pending row
+    """
+    if kind not in SENDERS:
+        raise ValueError(f'Unknown email kind: {kind}')
+
+    entry = EmailOutbox(
+        kind=kind,
+        recipient=recipient,
+        payload=payload,
+        status=STATUS_PENDING,
+        attempts=0,
+        next_attempt_at=datetime.utcnow()
+    )
+    db.session.add(entry)
+
+    # Wake up the worker once the transaction commits (one event per transaction)
+    wake_event = {'kind': EVENT_KIND}
+    if wake_event not in db.session.info.get(SESSION_KEY, ()):
+        publish_event(wake_event)
+    return entry
+
+
+def flush_digests():
+    """
+    Queue one digest email per manager with new pending requests (commits)
+
+    Reads all pending, not yet notified requests (with employee and manager
+    names) in one query ordered by manager, groups them in memory and marks
+    them notified in the same transaction that queues the digests. Rows are
+    locked with SKIP LOCKED, so concurrent workers never digest a request twice.
+
+    Returns:
+        dict: { "managers": n, "requests": n }
+    """
+    rows = db.session.execute(
+        request_list_select()
+        .where(Request.status == 'oczekujący', Request.notified_at.is_(None))
+        .order_by(Request.manager_id, Request.created_at, Request.id)
+        .with_for_update(of=Request, skip_locked=True)
+    ).all()
+
+    if not rows:
+        db.session.rollback()
+        return {'managers': 0, 'requests': 0}
+
+    for _manager_id, group in groupby(rows, key=lambda row: row.manager_id):
+        group = list(group)
+        first = group[0]
+        enqueue_email(
+            'digest',
+            first.manager_email,
+            manager_name=f"{first.manager_first_name} {first.manager_last_name}",
+            requests=[
+                {
+                    'employee_name': f"{row.employee_first_name} {row.employee_last_name}",
+                    'date': row.date.isoformat(),
+                    'time_out': row.time_out.strftime('%H:%M'),
+                    'time_return': row.time_return.strftime('%H:%M'),
+                    'reason': row.reason
+                }
+                for row in group
+            ]
+        )
+
+    db.session.execute(
+        update(Request)
+        .where(Request.id.in_([row.id for row in rows]))
+        .values(notified_at=datetime.utcnow())
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return {'managers': len({row.manager_id for row in rows}), 'requests': len(rows)}
+
+
+def retry_delay(attempts):
+    """Seconds to wait before the next attempt after `attempts` failures"""
+    delay = min(Config.EMAIL_RETRY_MAX_SECONDS, Config.EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _claim_due(batch_size, now):
+    """
+    Lease up to batch_size due emails to this worker (commits)
+
+    Returns:
+        tuple: (list of claimed email dicts, lease deadline)
+    """
+    rows = (
+        EmailOutbox.query
+        .filter(EmailOutbox.status == STATUS_PENDING, EmailOutbox.next_attempt_at <= now)
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    # Whole seconds, so the ownership check in _record() compares equal on every database
+    lease_until = (now + timedelta(seconds=Config.EMAIL_OUTBOX_LEASE_SECONDS)).replace(microsecond=0)
+    claimed = [
+        {'id': row.id, 'kind': row.kind, 'recipient': row.recipient, 'payload': row.payload,
+         'attempts': row.attempts, 'next_attempt_at': row.next_attempt_at}
+        for row in rows
+    ]
+    for row in rows:
+        row.next_attempt_at = lease_until
+    db.session.commit()
+    return claimed, lease_until
+
+
+def _record(email, lease_until, **values):
+    """Update a claimed email unless its lease expired and another worker took it over"""
+    db.session.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id == email['id'],
+               EmailOutbox.status == STATUS_PENDING,
+               EmailOutbox.next_attempt_at == lease_until)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def deliver_pending(batch_size=None):
+    """
+    Send one batch of due emails and record the outcome (commits)
+
+    The batch is claimed and committed before the first send, so no row
+    lock is held during SMTP - deleting outbox rows (init_production.py,
+    clear_prod_data.py) never waits for the mail host. Stops early, leaving
+    the remaining rows pending, when the SMTP circuit breaker opens or the
+    lease runs out - they are due again right away.
+
+    Returns:
+        dict: { "processed": n, "sent": n, "retried": n, "dead": n, "deferred": n }
+    """
+    batch_size = batch_size or Config.EMAIL_OUTBOX_BATCH_SIZE
+    now = datetime.utcnow()
+
+    if not smtp_breaker.available():
+        return {'processed': 0, 'sent': 0, 'retried': 0, 'dead': 0, 'deferred': 0}
+
+    claimed, lease_until = _claim_due(batch_size, now)
+
+    result = {'processed': len(claimed), 'sent': 0, 'retried': 0, 'dead': 0, 'deferred': 0}
+    outcomes = []
+    for index, email in enumerate(claimed):
+        if not smtp_breaker.available() or datetime.utcnow() >= lease_until:
+            result['processed'] = index
+            result['deferred'] = len(claimed) - index
+            break
+        try:
+            success, message = SENDERS[email['kind']](email['recipient'], **email['payload'])
+        except Exception as e:
+            success, message = False, str(e)
+        outcomes.append((email, success, message, datetime.utcnow()))
+
+    for email, success, message, finished_at in outcomes:
+        attempts = email['attempts'] + 1
+        if success:
+            _record(email, lease_until, attempts=attempts, status=STATUS_SENT,
+                    sent_at=finished_at, last_error=None)
+            result['sent'] += 1
+        elif attempts >= Config.EMAIL_MAX_ATTEMPTS:
+            _record(email, lease_until, attempts=attempts, status=STATUS_DEAD, last_error=message)
+            result['dead'] += 1
+        else:
+            _record(email, lease_until, attempts=attempts, last_error=message,
+                    next_attempt_at=finished_at + timedelta(seconds=retry_delay(attempts)))
+            result['retried'] += 1
+
+    # Deferred emails get their old due time back, keeping their place in the queue
+    for email in claimed[len(outcomes):]:
+        _record(email, lease_until, next_attempt_at=email['next_attempt_at'])
+
+    db.session.commit()
+    return result
+
+
+def retry_dead(ids=None):
+    """
+    Move dead emails back to pending (all of them, or the given IDs)
+
+    Returns:
+        int: Number of requeued emails
+    """
+    query = EmailOutbox.query.filter(EmailOutbox.status == STATUS_DEAD)
+    if ids:
+        query = query.filter(EmailOutbox.id.in_(ids))
+    count = query.update(
+        {'status': STATUS_PENDING, 'attempts': 0, 'next_attempt_at': datetime.utcnow()},
+        synchronize_session=False
+    )
+    db.session.commit()
+    return count
+
+
+def prune_sent(older_than_days=None):
+    """Delete sent emails older than EMAIL_OUTBOX_RETENTION_DAYS (commits)"""
+    days = Config.EMAIL_OUTBOX_RETENTION_DAYS if older_than_days is None else older_than_days
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    count = (
+        EmailOutbox.query
+        .filter(EmailOutbox.status == STATUS_SENT, EmailOutbox.sent_at < cutoff)
+        .delete(synchronize_session=False)
+    )
+    db.session.commit()
+    return count
+
+
+def outbox_stats():
+    """Number of outbox rows per status, plus the age of the oldest pending email"""
+    counts = dict(
+        db.session.query(EmailOutbox.status, func.count(EmailOutbox.id))
+        .group_by(EmailOutbox.status)
+        .all()
+    )
+    oldest = (
+        db.session.query(func.min(EmailOutbox.created_at))
+        .filter(EmailOutbox.status == STATUS_PENDING)
+        .scalar()
+    )
+    return {
+        STATUS_PENDING: counts.get(STATUS_PENDING, 0),
+        STATUS_SENT: counts.get(STATUS_SENT, 0),
+        STATUS_DEAD: counts.get(STATUS_DEAD, 0),
+        'oldest_pending_seconds': int((datetime.utcnow() - oldest).total_seconds()) if oldest else None
+    }
@@ -1,74 +1,561 @@
 """Email notification service"""
+import atexit
 import smtplib
 import os
+import threading
+import time
+from functools import lru_cache
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from jinja2 import Environment, FileSystemLoader, select_autoescape
 from models import SmtpConfig, db
 from security import decrypt_password
+from services.event_service import get_broker, publish_event
+from config import Config
+
+
+EVENT_KIND = 'smtp_config'
+
+
+class SmtpSettings:
+    """Immutable SMTP configuration with the password already decrypted"""
+
+    __slots__ = ('server', 'port', 'use_ssl', 'login', 'password', 'email_from',
+                 'password_error', 'version')
+
+    def __init__(self, server, port, use_ssl, login, password, email_from,
+                 password_error=None, version=0):
+        self.server = server
+        self.port = port
+        self.use_ssl = use_ssl
+        self.login = login
+        self.password = password
+        self.email_from = email_from
+        self.password_error = password_error
+        self.version = version
+
+    @classmethod
+    def from_model(cls, config, version=0):
+        password = decrypt_password(config.password) if config.password else None
+        return cls(
+            config.server, config.port, config.use_ssl, config.login, password,
+            config.email_from,
+            password_error="Failed to decrypt SMTP password" if config.password and not password else None,
+            version=version
+        )
+
+
+class SmtpConfigCache:
+    """
+    Per-process cache of the SMTP configuration
+
+    Loaded (and the password decrypted) once, then served from memory, so
+    sending an email does no database read or decryption. update_smtp_config
+    calls invalidate_smtp_config() before committing; the invalidation
+    reaches every process (API workers and email_worker.py) through the
+    event broker and also closes that process's SMTP circuit breaker.
+    SMTP_CONFIG_TTL bounds staleness if one is missed.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entry = None  # (expires_at, SmtpSettings or None)
+        self._subscribed = False
+        # Bumped on every invalidation - a load racing with one is not stored
+        self._generation = 0
+        self.loads = 0
+
+    def _subscribe(self):
+        # Register once per process, on first use (after gunicorn forks)
+        if not self._subscribed:
+            self._subscribed = True
+            get_broker().add_listener(self._on_event)
+
+    def _on_event(self, payload):
+        if payload.get('kind') == EVENT_KIND:
+            self.invalidate()
+            # Failures of the previous server say nothing about the new one
+            smtp_breaker.reset()
+
+    def get(self):
+        """Current SmtpSettings, or None when SMTP is not configured"""
+        self._subscribe()
+
+        with self._lock:
+            entry = self._entry
+            generation = self._generation
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+
+        config = SmtpConfig.query.first()
+        settings = SmtpSettings.from_model(config, generation) if config and config.server else None
+        self.loads += 1
+
+        with self._lock:
+            if generation == self._generation:
+                self._entry = (time.monotonic() + self.ttl, settings)
+        return settings
+
+    def invalidate(self):
+        """Drop the cached configuration in this process"""
+        with self._lock:
+            self._generation += 1
+            self._entry = None
+
+    def stats(self):
+        """Counters for monitoring"""
+        with self._lock:
+            return {
+                'cached': self._entry is not None,
+                'version': self._generation,
+                'loads': self.loads
+            }
+
+
+smtp_config_cache = SmtpConfigCache(Config.SMTP_CONFIG_TTL)
 
 
 def get_smtp_config():
-    """Get SMTP configuration from database"""
-    config = SmtpConfig.query.first()
-    return config
+    """Get SMTP configuration (SmtpSettings, cached per process) or None"""
+    return smtp_config_cache.get()
 
 
-def send_email(to_email, subject, html_body):
+def invalidate_smtp_config():
+    """
+    Reload SMTP configuration and close the circuit breaker in every
+    process once the transaction commits
+    """
+    publish_event({'kind': EVENT_KIND})
+
+
+class SMTPCircuitOpen(Exception):
+    """Raised instead of connecting while the SMTP circuit breaker is open"""
+
+
+class SMTPCircuitBreaker:
+    """
+    Fail fast while the SMTP host is unreachable (one breaker per process)
+
+    After `threshold` consecutive connection-level failures (refused,
+    timed out, dropped) the breaker opens and sends fail immediately for
+    `cooldown` seconds instead of each one waiting for a timeout. Then a
+    single probe send is let through (half-open): success closes the
+    breaker, failure opens it for another cooldown. Replies from the server
+    (bad recipient, wrong password) prove the host is up and do not count.
+    A change of the SMTP configuration closes the breaker (reset()).
     """
-    Send email using SMTP configuration from database
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0
+        self._probing = False
+        self.trips = 0
+        self.rejected = 0
+        self.last_error = None
+
+    @staticmethod
+    def is_host_failure(error):
+        """True for errors that say nothing answered (network, timeout, disconnect)"""
+        if isinstance(error, smtplib.SMTPConnectError):
+            return True
+        if isinstance(error, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)):
+            return False
+        # SMTPServerDisconnected, socket.timeout, ConnectionRefusedError, ...
+        return isinstance(error, OSError)
+
+    def _retry_in(self):
+        return max(0.0, self._opened_at + self.cooldown - time.monotonic())
+
+    def available(self):
+        """Whether a send would be attempted now (does not take the probe)"""
+        with self._lock:
+            if self._state == self.OPEN:
+                return self._retry_in() == 0
+            return not (self._state == self.HALF_OPEN and self._probing)
+
+    def before_send(self, force=False):
+        """
+        Raise SMTPCircuitOpen unless a send may go ahead
+
+        force=True lets the send through in any state (admin test email);
+        its outcome is recorded like any other send.
+        """
+        with self._lock:
+            if force:
+                return
+            if self._state == self.OPEN and self._retry_in() == 0:
+                self._state = self.HALF_OPEN
+                self._probing = False
+            if self._state == self.HALF_OPEN and not self._probing:
+                # This send is the probe; the others keep failing fast
+                self._probing = True
+                return
+            if self._state != self.CLOSED:
+                self.rejected += 1
+                raise SMTPCircuitOpen(
+                    f"SMTP server unavailable, next attempt in {int(self._retry_in()) + 1}s "
+                    f"(last error: {self.last_error})"
+                )
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self, error):
+        with self._lock:
+            self._failures += 1
+            self.last_error = str(error) or error.__class__.__name__
+            if self._state == self.HALF_OPEN or self._failures >= self.threshold:
+                if self._state != self.OPEN:
+                    self.trips += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._probing = False
+
+    def reset(self):
+        """Close the breaker, e.g. after the SMTP configuration changed"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def stats(self):
+        """State and counters for monitoring"""
+        with self._lock:
+            return {
+                'state': self._state,
+                'consecutive_failures': self._failures,
+                'retry_in_seconds': round(self._retry_in(), 1) if self._state == self.OPEN else None,
+                'trips': self.trips,
+                'rejected': self.rejected,
+                'last_error': self.last_error
+            }
+
+
+smtp_breaker = SMTPCircuitBreaker(Config.SMTP_BREAKER_THRESHOLD, Config.SMTP_BREAKER_COOLDOWN)
+
+
+class SMTPConnectionPool:
+    """
+    Reusable, authenticated SMTP connections (one pool per process)
+
+    Connecting, STARTTLS and AUTH cost several round trips, so connections
+    are kept open between sends. A connection idle for longer than
+    SMTP_POOL_NOOP_AFTER seconds is checked with NOOP before reuse, and one
+    idle for longer than SMTP_POOL_IDLE_SECONDS is closed, since servers
+    drop idle sessions on their own. Connections are keyed by the SMTP
+    configuration, so a config change never reuses an old session.
+
+    Connecting is bounded by `connect_timeout` and every later command by
+    `command_timeout`, so a hung mail host cannot block the caller for
+    longer. With a `breaker`, sends fail fast while the host is down.
+    """
+
+    def __init__(self, max_idle, idle_timeout, noop_after,
+                 connect_timeout=Config.SMTP_CONNECT_TIMEOUT,
+                 command_timeout=Config.SMTP_COMMAND_TIMEOUT, breaker=None):
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self.noop_after = noop_after
+        self.connect_timeout = connect_timeout
+        self.command_timeout = command_timeout
+        self.breaker = breaker
+        self._idle = []  # (key, server, last_used)
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.reuses = 0
+        self.stale = 0
+
+    @staticmethod
+    def _key(smtp_config):
+        return (smtp_config.server, smtp_config.port, smtp_config.use_ssl,
+                smtp_config.login, smtp_config.password)
+
+    def _connect(self, smtp_config):
+        server = smtplib.SMTP(smtp_config.server, smtp_config.port, timeout=self.connect_timeout)
+        try:
+            server.sock.settimeout(self.command_timeout)
+            if smtp_config.use_ssl:
+                server.starttls()
+
+            if smtp_config.password_error:
+                raise Exception(smtp_config.password_error)
+
+            # Login if credentials provided
+            if smtp_config.login and smtp_config.password:
+                server.login(smtp_config.login, smtp_config.password)
+        except Exception:
+            self._close(server)
+            raise
+
+        self.connects += 1
+        return server
+
+    @staticmethod
+    def _close(server):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _checkout(self, key):
+        """Take a live idle connection for key, or None"""
+        now = time.monotonic()
+        expired = []
+        found = None
+        with self._lock:
+            for entry in list(self._idle):
+                if now - entry[2] > self.idle_timeout:
+                    self._idle.remove(entry)
+                    expired.append(entry[1])
+                elif found is None and entry[0] == key:
+                    self._idle.remove(entry)
+                    found = entry
+        for server in expired:
+            self._close(server)
+
+        if found is None:
+            return None
+        _key, server, last_used = found
+        if now - last_used > self.noop_after:
+            try:
+                if server.noop()[0] != 250:
+                    raise smtplib.SMTPServerDisconnected('NOOP failed')
+            except Exception:
+                self.stale += 1
+                self._close(server)
+                return None
+        self.reuses += 1
+        return server
+
+    def _checkin(self, key, server):
+        with self._lock:
+            if len(self._idle) < self.max_idle:
+                self._idle.append((key, server, time.monotonic()))
+                return
+        self._close(server)
+
+    def send_messages(self, smtp_config, messages, force=False):
+        """
+        Send messages over one SMTP session
+
+        A connection that turns out to be dead on the first command is
+        replaced once; any other error ends the batch and marks the
+        remaining messages as failed. While the breaker is open, all
+        messages fail at once without touching the network.
+
+        Args:
+            smtp_config: SmtpSettings
+            messages: List of email.message.Message
+            force: Send even while the breaker is open
+
+        Returns:
+            list of (success: bool, message: str), one per message
+        """
+        if self.breaker is not None:
+            try:
+                self.breaker.before_send(force=force)
+            except SMTPCircuitOpen as e:
+                return [(False, f"Failed to send email: {str(e)}")] * len(messages)
+
+        key = self._key(smtp_config)
+        server = self._checkout(key)
+        reused = server is not None
+        results = []
+        try:
+            if server is None:
+                server = self._connect(smtp_config)
+            for msg in messages:
+                try:
+                    server.send_message(msg)
+                except smtplib.SMTPServerDisconnected:
+                    if not (reused and not results):
+                        raise
+                    # Server dropped the session after the NOOP check - reconnect once
+                    self.stale += 1
+                    self._close(server)
+                    server = self._connect(smtp_config)
+                    server.send_message(msg)
+                except smtplib.SMTPRecipientsRefused as e:
+                    # Connection is still usable - fail this message only
+                    results.append((False, f"Failed to send email: {str(e)}"))
+                    continue
+                results.append((True, "Email sent successfully"))
+        except Exception as e:
+            if server is not None:
+                self._close(server)
+            if self.breaker is not None:
+                if self.breaker.is_host_failure(e):
+                    self.breaker.record_failure(e)
+                else:
+                    self.breaker.record_success()
+            error_msg = f"Failed to send email: {str(e)}"
+            results.extend([(False, error_msg)] * (len(messages) - len(results)))
+            return results
+
+        if self.breaker is not None:
+            self.breaker.record_success()
+        self._checkin(key, server)
+        return results
+
+    def close_all(self):
+        """Close all idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for _key, server, _last_used in idle:
+            self._close(server)
+
+    def stats(self):
+        """Counters for monitoring"""
+        with self._lock:
+            idle = len(self._idle)
+        return {
+            'idle': idle,
+            'connects': self.connects,
+            'reuses': self.reuses,
+            'stale': self.stale
+        }
+
+
+smtp_pool = SMTPConnectionPool(Config.SMTP_POOL_SIZE, Config.SMTP_POOL_IDLE_SECONDS,
+                               Config.SMTP_POOL_NOOP_AFTER, breaker=smtp_breaker)
+atexit.register(smtp_pool.close_all)
+
+
+def build_message(smtp_config, to_email, subject, html_body, text_body=None):
+    """Build MIME message for an HTML email with an optional plain-text part"""
+    msg = MIMEMultipart('alternative')
+    msg['From'] = smtp_config.email_from
+    msg['To'] = to_email
+    msg['Subject'] = subject
+
+    # Plain text first - clients show the last part they support
+    if text_body:
+        msg.attach(MIMEText(text_body, 'plain', 'utf-8'))
+
+    # Attach HTML body
+    html_part = MIMEText(html_body, 'html')
+    msg.attach(html_part)
+    return msg
+
+
+def send_emails(emails, force=False):
+    """
+    Send several emails over one pooled SMTP session
 
     Args:
-        to_email: Recipient email address
-        subject: Email subject
-        html_body: HTML body content
+        emails: List of (to_email, subject, html_body[, text_body]) tuples
+        force: Send even while the SMTP circuit breaker is open
 
     Returns:
-        tuple: (success: bool, message: str)
+        list of (success: bool, message: str), one per email
     """
+    if not emails:
+        return []
+
     # Get SMTP config from database
     smtp_config = get_smtp_config()
 
     if not smtp_config or not smtp_config.server:
         print("⚠️  SMTP not configured - email not sent")
-        return False, "SMTP not configured"
+        return [(False, "SMTP not configured")] * len(emails)
 
     try:
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['From'] = smtp_config.email_from
-        msg['To'] = to_email
-        msg['Subject'] = subject
-
-        # Attach HTML body
-        html_part = MIMEText(html_body, 'html')
-        msg.attach(html_part)
-
-        # Connect to SMTP server
-        if smtp_config.use_ssl:
-            server = smtplib.SMTP(smtp_config.server, smtp_config.port)
-            server.starttls()
+        messages = [build_message(smtp_config, *email) for email in emails]
+    except Exception as e:
+        return [(False, f"Failed to send email: {str(e)}")] * len(emails)
+
+    results = smtp_pool.send_messages(smtp_config, messages, force=force)
+    for email, (success, message) in zip(emails, results):
+        if success:
+            print(f"✅ Email sent to {email[0]}")
         else:
-            server = smtplib.SMTP(smtp_config.server, smtp_config.port)
+            print(f"❌ {message}")
+    return results
 
-        # Login if credentials provided
-        if smtp_config.login and smtp_config.password:
-            # Decrypt password before using
-            decrypted_password = decrypt_password(smtp_config.password)
-            if not decrypted_password:
-                raise Exception("Failed to decrypt SMTP password")
-            server.login(smtp_config.login, decrypted_password)
 
-        # Send email
-        server.send_message(msg)
-        server.quit()
+def send_email(to_email, subject, html_body, text_body=None, force=False):
+    """
+    Send email using SMTP configuration from database
 
-        print(f"✅ Email sent to {to_email}")
-        return True, "Email sent successfully"
+    Args:
+        to_email: Recipient email address
+        subject: Email subject
+        html_body: HTML body content
+        text_body: Optional plain-text alternative
+        force: Send even while the SMTP circuit breaker is open
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    return send_emails([(to_email, subject, html_body, text_body)], force=force)[0]
+
+
+# Email templates (templates/email) are compiled once per process and kept
+# in the environment's cache; HTML templates are auto-escaped, so user text
+# (reason, comment, names) can never inject markup. Text parts are not.
+_templates = Environment(
+    loader=FileSystemLoader(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                         'templates', 'email')),
+    autoescape=select_autoescape(enabled_extensions=('html',), default_for_string=False),
+    trim_blocks=True,
+    auto_reload=False,
+    cache_size=-1
+)
+
+DECISION_STYLES = {
+    'zaakceptowany': {
+        'emoji': '✅',
+        'color': '#10b981',
+        'bg_color': '#d1fae5',
+        'message': 'Twój wniosek został zaakceptowany.'
+    },
+    'odrzucony': {
+        'emoji': '❌',
+        'color': '#ef4444',
+        'bg_color': '#fee2e2',
+        'message': 'Twój wniosek został odrzucony.'
+    },
+}
+
+
+def render_email(name, **context):
+    """
+    Render HTML and plain-text parts of an email template
+
+    Args:
+        name: Template name without extension, e.g. 'decision'
+        context: Template variables
+
+    Returns:
+        tuple: (html_body: str, text_body: str)
+    """
+    html = _templates.get_template(f'{name}.html').render(context)
+    text = _templates.get_template(f'{name}.txt').render(context)
+    return html, text
 
-    except Exception as e:
-        error_msg = f"Failed to send email: {str(e)}"
-        print(f"❌ {error_msg}")
-        return False, error_msg
+
+@lru_cache(maxsize=1)
+def get_app_url():
+    """Public URL of the application used in email links"""
+    app_name = os.getenv('APP_NAME', 'timeoff-manager-20251004')
+    if os.getenv('FLASK_ENV') == 'production':
+        return f"https://{app_name}.azurewebsites.net"
+    return "http://localhost:5000"
 
 
 def send_new_request_email(manager_email, employee_name, request_data):
@@ -83,48 +570,14 @@ def send_new_request_email(manager_email, employee_name, request_data):
     Returns:
         tuple: (success: bool, message: str)
     """
-    # Get app URL from environment
-    app_name = os.getenv('APP_NAME', 'timeoff-manager-20251004')
-    if os.getenv('FLASK_ENV') == 'production':
-        app_url = f"https://{app_name}.azurewebsites.net"
-    else:
-        app_url = "http://localhost:5000"
-
     subject = f"Nowy wniosek od {employee_name}"
-
-    html = f"""
-    <html>
-    <body style="font-family: Arial, sans-serif; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 40px;">
-        <div style="max-width: 600px; margin: 0 auto; background: white; border-radius: 20px; padding: 40px; box-shadow: 0 10px 40px rgba(0,0,0,0.1);">
-            <h2 style="color: #1e293b; margin-bottom: 30px; font-size: 24px;">Nowy wniosek o wyjście</h2>
-
-            <div style="background: #f8fafc; border-radius: 12px; padding: 20px; margin-bottom: 20px;">
-                <p style="margin: 10px 0; color: #475569;"><strong style="color: #1e293b;">Pracownik:</strong> {employee_name}</p>
-                <p style="margin: 10px 0; color: #475569;"><strong style="color: #1e293b;">Data:</strong> {request_data['date']}</p>
-                <p style="margin: 10px 0; color: #475569;"><strong style="color: #1e293b;">Wyjście:</strong> {request_data['time_out']}</p>
-                <p style="margin: 10px 0; color: #475569;"><strong style="color: #1e293b;">Powrót:</strong> {request_data['time_return']}</p>
-            </div>
-
-            <div style="background: #fef3c7; border-left: 4px solid #f59e0b; padding: 15px; border-radius: 8px; margin-bottom: 30px;">
-                <p style="margin: 0; color: #78350f;"><strong>Powód:</strong> {request_data['reason']}</p>
-            </div>
-
-            <p style="margin-top: 30px; text-align: center;">
-                <a href="{app_url}"
-                   style="display: inline-block; padding: 12px 24px; background: linear-gradient(to right, #667eea, #764ba2); color: white; text-decoration: none; border-radius: 8px; font-weight: bold;">
-                    Przejdź do aplikacji
-                </a>
-            </p>
-
-            <p style="margin-top: 30px; text-align: center; color: #94a3b8; font-size: 12px;">
-                TimeOff Manager - System zarządzania wnioskami
-            </p>
-        </div>
-    </body>
-    </html>
-    """
-
-    return send_email(manager_email, subject, html)
+    html, text = render_email(
+        'new_request',
+        employee_name=employee_name,
+        request_data=request_data,
+        app_url=get_app_url()
+    )
+    return send_email(manager_email, subject, html, text)
 
 
 def send_decision_email(employee_email, employee_name, request_data, decision, comment=None):
@@ -141,51 +594,46 @@ def send_decision_email(employee_email, employee_name, request_data, decision, c
     Returns:
         tuple: (success: bool, message: str)
     """
-    if decision == 'zaakceptowany':
-        subject = f"✅ Wniosek zaakceptowany - {request_data['date']}"
-        color = "#10b981"
-        emoji = "✅"
-        message = "Twój wniosek został zaakceptowany."
-        bg_color = "#d1fae5"
-    else:
-        subject = f"❌ Wniosek odrzucony - {request_data['date']}"
-        color = "#ef4444"
-        emoji = "❌"
-        message = "Twój wniosek został odrzucony."
-        bg_color = "#fee2e2"
-
-    comment_section = ""
-    if comment:
-        comment_section = f"""
-        <div style="background: {bg_color}; border-left: 4px solid {color}; padding: 15px; border-radius: 8px; margin-top: 20px;">
-            <p style="margin: 0; color: #1e293b;"><strong>Komentarz managera:</strong> {comment}</p>
-        </div>
-        """
+    style = DECISION_STYLES.get(decision, DECISION_STYLES['odrzucony'])
+    verb = 'zaakceptowany' if decision == 'zaakceptowany' else 'odrzucony'
+    subject = f"{style['emoji']} Wniosek {verb} - {request_data['date']}"
+    html, text = render_email(
+        'decision',
+        employee_name=employee_name,
+        request_data=request_data,
+        decision=decision,
+        comment=comment,
+        style=style
+    )
+    return send_email(employee_email, subject, html, text)
+
+
+def _pending_requests_phrase(count):
+    """'1 nowy wniosek', '3 nowe wnioski', '5 nowych wniosków'"""
+    if count == 1:
+        return "1 nowy wniosek"
+    if count % 10 in (2, 3, 4) and count % 100 not in (12, 13, 14):
+        return f"{count} nowe wnioski"
+    return f"{count} nowych wniosków"
+
+
+def send_digest_email(manager_email, manager_name, requests):
+    """
+    Send one summary email to a manager about several new requests
 
-    html = f"""
-    <html>
-    <body style="font-family: Arial, sans-serif; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); padding: 40px;">
-        <div style="max-width: 600px; margin: 0 auto; background: white; border-radius: 20px; padding: 40px; box-shadow: 0 10px 40px rgba(0,0,0,0.1);">
-            <div style="text-align: center; margin-bottom: 30px;">
-                <h1 style="color: {color}; font-size: 48px; margin: 0;">{emoji}</h1>
-                <h2 style="color: #1e293b; margin: 10px 0; text-transform: uppercase; font-size: 20px;">Wniosek {decision}</h2>
-            </div>
-
-            <div style="background: #f8fafc; border-radius: 12px; padding: 20px; margin-bottom: 20px;">
-                <p style="margin: 10px 0; color: #475569;"><strong style="color: #1e293b;">Pracownik:</strong> {employee_name}</p>
-                <p style="margin: 10px 0; color: #475569;"><strong style="color: #1e293b;">Data:</strong> {request_data['date']}</p>
-                <p style="margin: 10px 0; color: #475569;"><strong style="color: #1e293b;">Wyjście:</strong> {request_data['time_out']}</p>
-                <p style="margin: 10px 0; color: #475569;"><strong style="color: #1e293b;">Powrót:</strong> {request_data['time_return']}</p>
-            </div>
-
-            {comment_section}
-
-            <p style="margin-top: 30px; text-align: center; color: #94a3b8; font-size: 12px;">
-                TimeOff Manager - System zarządzania wnioskami
-            </p>
-        </div>
-    </body>
-    </html>
-    """
-
-    return send_email(employee_email, subject, html)
+    Args:
+        manager_email: Manager's email address
+        manager_name: Manager's full name
+        requests: List of dicts (employee_name, date, time_out, time_return, reason)
+
+    Returns:
+        tuple: (success: bool, message: str)
+    """
+    subject = f"{_pending_requests_phrase(len(requests))} do akceptacji"
+    html, text = render_email(
+        'digest',
+        manager_name=manager_name,
+        requests=requests,
+        app_url=get_app_url()
+    )
+    return send_email(manager_email, subject, html, text)
@@ -0,0 +1,254 @@
+"""
+Event fan-out across worker processes (SSE and cache invalidation)
+
+Routes call publish_request_event() / publish_event() before committing a
+change. Events are delivered only if the transaction commits:
+
+- PostgresBroker (production): pg_notify() is issued inside the transaction,
+  so PostgreSQL delivers it to every worker process on COMMIT. Each worker
+  runs one LISTEN thread which fans events out to its SSE subscribers and
+  registered listeners.
+- LocalBroker (development / SQLite): events are dispatched in-process after
+  COMMIT. Only subscribers connected to the same process receive them.
+
+Listeners (e.g. in-process caches) are also called in the committing
+process right after COMMIT, so it never serves stale data to itself while
+the NOTIFY is in flight.
+"""
+import json
+import logging
+import queue
+import select
+import threading
+import time
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+from config import Config
+from models import db
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'request_events'
+SUBSCRIBER_QUEUE_SIZE = 100
+SESSION_KEY = 'request_events'
+
+
+class Subscription:
+    """Queue of events visible to one connected user"""
+
+    def __init__(self, user_id, role):
+        self.user_id = user_id
+        self.role = role
+        self.queue = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def wants(self, payload):
+        """Admins see all request events, others only requests they are party to"""
+        if payload.get('kind', 'request') != 'request':
+            return False
+        if self.role == 'admin':
+            return True
+        return self.user_id in (payload.get('employee_id'), payload.get('manager_id'))
+
+    def get(self, timeout):
+        """Next event payload, or None after `timeout` seconds"""
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class LocalBroker:
+    """In-process fan-out (single worker stand-in for LISTEN/NOTIFY)"""
+
+    transactional = False
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = set()
+        self._listeners = []
+
+    def add_listener(self, callback):
+        """Call callback(payload) for every event, in every process"""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def subscribe(self, user_id, role):
+        sub = Subscription(user_id, role)
+        with self._lock:
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, session, payloads):
+        """Deliver payloads (called after COMMIT for non-transactional brokers)"""
+        for payload in payloads:
+            self._fan_out(payload)
+
+    def notify_listeners(self, payloads):
+        """Call registered listeners (idempotent consumers) for payloads"""
+        with self._lock:
+            listeners = list(self._listeners)
+        for payload in payloads:
+            for callback in listeners:
+                try:
+                    callback(payload)
+                except Exception as e:
+                    logger.error(f"Event listener error: {str(e)}")
+
+    def _fan_out(self, payload):
+        self.notify_listeners([payload])
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for sub in subscribers:
+            if sub.wants(payload):
+                try:
+                    sub.queue.put_nowait(payload)
+                except queue.Full:
+                    # Slow client - drop event, it will resync on reconnect
+                    pass
+
+
+class PostgresBroker(LocalBroker):
+    """Cross-process fan-out using PostgreSQL LISTEN/NOTIFY"""
+
+    transactional = True
+    RECONNECT_DELAY = 5
+
+    def __init__(self, engine):
+        super().__init__()
+        self._engine = engine
+        self._listener = None
+
+    def subscribe(self, user_id, role):
+        self._ensure_listener()
+        return super().subscribe(user_id, role)
+
+    def add_listener(self, callback):
+        self._ensure_listener()
+        super().add_listener(callback)
+
+    def publish(self, session, payloads):
+        """Queue NOTIFY inside the current transaction (sent on COMMIT)"""
+        for payload in payloads:
+            session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {'channel': CHANNEL, 'payload': json.dumps(payload)}
+            )
+
+    def _ensure_listener(self):
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = threading.Thread(
+                    target=self._listen, name='request-events-listener', daemon=True
+                )
+                self._listener.start()
+
+    def _listen(self):
+        while True:
+            conn = None
+            try:
+                # Dedicated connection, detached from the pool for good
+                raw = self._engine.raw_connection()
+                raw.detach()
+                conn = raw.driver_connection
+                conn.autocommit = True
+                conn.cursor().execute(f"LISTEN {CHANNEL}")
+
+                while True:
+                    if select.select([conn], [], [], 30) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        try:
+                            self._fan_out(json.loads(notify.payload))
+                        except ValueError:
+                            logger.warning("Malformed request event: %s", notify.payload)
+            except Exception as e:
+                logger.error(f"Request event listener error: {str(e)}")
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                time.sleep(self.RECONNECT_DELAY)
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return process-wide broker, chosen by EVENT_BROKER (auto by default)"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                backend = Config.EVENT_BROKER
+                if backend == 'auto':
+                    backend = 'postgres' if db.engine.dialect.name == 'postgresql' else 'local'
+                _broker = PostgresBroker(db.engine) if backend == 'postgres' else LocalBroker()
+    return _broker
+
+
+def publish_event(payload):
+    """
+    Publish an event when the current transaction commits
+
+    Args:
+        payload: JSON-serializable dict; non-request events carry a 'kind'
+    """
+    db.session.info.setdefault(SESSION_KEY, []).append(payload)
+
+
+def publish_request_event(event_type, req):
+    """
+    Publish a request event when the current transaction commits
+
+    Args:
+        event_type: 'created', 'accepted', 'rejected' or 'cancelled'
+        req: Request instance (flushed if it has no id yet)
+    """
+    if req.id is None:
+        db.session.flush()
+
+    publish_event({
+        'type': event_type,
+        'request_id': req.id,
+        'employee_id': req.employee_id,
+        'manager_id': req.manager_id,
+        'status': req.status
+    })
+
+
+@event.listens_for(Session, 'before_commit')
+def _notify_in_transaction(session):
+    payloads = session.info.get(SESSION_KEY)
+    if payloads:
+        broker = get_broker()
+        if broker.transactional:
+            broker.publish(session, payloads)
+
+
+@event.listens_for(Session, 'after_commit')
+def _dispatch_after_commit(session):
+    payloads = session.info.pop(SESSION_KEY, None)
+    if payloads:
+        broker = get_broker()
+        if broker.transactional:
+            # Other processes get the NOTIFY; update this one right away
+            broker.notify_listeners(payloads)
+        else:
+            broker.publish(session, payloads)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_on_rollback(session):
+    session.info.pop(SESSION_KEY, None)
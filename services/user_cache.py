@@ -0,0 +1,144 @@
+"""
+Per-user snapshot cache
+
+Keeps the serialized form of recently used users in process memory, so
+/api/me and user lookups on hot paths (e.g. create_request) skip the
+database. Routes that change users call invalidate_users() before
+committing; the invalidation is broadcast to all worker processes through
+the event broker and applied only if the transaction commits.
+USER_CACHE_TTL bounds staleness if an invalidation is ever missed.
+"""
+from collections import OrderedDict
+import threading
+import time
+from sqlalchemy.orm import joinedload
+from config import Config
+from models import User
+from services.event_service import get_broker, publish_event
+
+EVENT_KIND = 'user'
+
+
+class UserSnapshot:
+    """Immutable view of a user - the fields hot paths need plus to_dict()"""
+
+    __slots__ = ('id', 'email', 'first_name', 'last_name', 'role',
+                 'supervisor_id', 'is_active', 'data')
+
+    def __init__(self, user):
+        self.id = user.id
+        self.email = user.email
+        self.first_name = user.first_name
+        self.last_name = user.last_name
+        self.role = user.role
+        self.supervisor_id = user.supervisor_id
+        self.is_active = user.is_active
+        self.data = user.to_dict()
+
+    @property
+    def full_name(self):
+        return f"{self.first_name} {self.last_name}"
+
+
+class UserCache:
+    """Bounded LRU of UserSnapshot with TTL"""
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._subscribed = False
+        # Bumped on every invalidation - a load racing with one is not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _subscribe(self):
+        # Register once per process, on first use (after gunicorn forks)
+        if not self._subscribed:
+            self._subscribed = True
+            get_broker().add_listener(self._on_event)
+
+    def _on_event(self, payload):
+        if payload.get('kind') == EVENT_KIND:
+            self.invalidate(payload.get('user_ids'))
+
+    def get(self, user_id):
+        """Return UserSnapshot for user_id (loading it on a miss), or None"""
+        if user_id is None:
+            return None
+        self._subscribe()
+
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+
+        user = User.query.options(joinedload(User.supervisor)).filter_by(id=user_id).first()
+        if not user:
+            return None
+        snapshot = UserSnapshot(user)
+
+        with self._lock:
+            if generation != self._generation:
+                return snapshot
+            self._entries[user_id] = (now + self.ttl, snapshot)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return snapshot
+
+    def invalidate(self, user_ids=None):
+        """
+        Drop users (and users supervised by them, whose to_dict() embeds the
+        supervisor's name) from this process; None drops everything
+        """
+        with self._lock:
+            self._generation += 1
+            if user_ids is None:
+                self._entries.clear()
+                return
+            ids = set(user_ids)
+            stale = [
+                key for key, (_, snapshot) in self._entries.items()
+                if key in ids or snapshot.supervisor_id in ids
+            ]
+            for key in stale:
+                del self._entries[key]
+
+    def stats(self):
+        """Counters for monitoring"""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+user_cache = UserCache(Config.USER_CACHE_SIZE, Config.USER_CACHE_TTL)
+
+
+def get_user_snapshot(user_id):
+    """Cached UserSnapshot for user_id, or None if the user does not exist"""
+    return user_cache.get(user_id)
+
+
+def invalidate_users(user_ids=None):
+    """
+    Invalidate cached users in every worker once the transaction commits
+
+    Args:
+        user_ids: Iterable of user IDs, or None to invalidate all users
+    """
+    publish_event({
+        'kind': EVENT_KIND,
+        'user_ids': sorted(set(user_ids)) if user_ids is not None else None
+    })
@@ -7,14 +7,29 @@ echo "🚀 Starting TimeOff Manager..."
 echo "📦 Running database migrations..."
 python run_migration.py || echo "⚠️  Migration script not available or failed"
 
+# Alembic migrations (new columns and indexes on existing tables) - the code
+# below expects them, so do not start without them. On an empty database
+# they only create their own tables and init_db.py creates the rest
+echo "📦 Running Alembic migrations..."
+alembic upgrade head || { echo "❌ Alembic migration failed - not starting"; exit 1; }
+
 # Initialize database if needed
 echo "📦 Initializing database..."
 python init_db.py
 
+# Email outbox worker (emails are sent outside of API requests)
+echo "📧 Starting email worker..."
+python email_worker.py &
+
 # Start Gunicorn
+# gthread workers: long-lived SSE connections (/api/events) hold a thread,
+# not a whole worker process. At most SSE_MAX_STREAMS (default 4) of the
+# --threads of each worker serve streams - keep it below --threads
 echo "🔧 Starting Gunicorn..."
 gunicorn --bind=0.0.0.0:8000 \
          --workers=4 \
+         --worker-class=gthread \
+         --threads=8 \
          --timeout=600 \
          --access-logfile '-' \
          --error-logfile '-' \
@@ -0,0 +1,107 @@
+"""Shared fixtures: Flask app on an in-memory SQLite database"""
+import os
+import sys
+from contextlib import contextmanager
+from datetime import datetime, date, time, timedelta
+
+# Config reads the environment at import time
+os.environ['DATABASE_URL'] = 'sqlite:///:memory:'
+os.environ.setdefault('SECRET_KEY', 'test-secret-key-test-secret-key')
+os.environ['AUDIT_ASYNC'] = 'false'
+os.environ['EVENT_BROKER'] = 'local'
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import event
+
+from app import create_app
+from auth import generate_token, token_cache
+from models import db, User, Request
+from services.user_cache import user_cache
+from services.email_service import smtp_breaker, smtp_config_cache, smtp_pool
+
+
+def _reset_process_state():
+    """Module-level caches and SMTP state outlive the app, so every test starts clean"""
+    token_cache.clear()
+    user_cache.invalidate()
+    smtp_config_cache.invalidate()
+    smtp_breaker.reset()
+    smtp_pool.close_all()
+
+
+@pytest.fixture
+def app():
+    _reset_process_state()
+    app = create_app()
+    app.config['TESTING'] = True
+    try:
+        with app.app_context():
+            db.create_all()
+            yield app
+            db.session.remove()
+            db.drop_all()
+    finally:
+        _reset_process_state()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def users(app):
+    """admin -> manager -> employee hierarchy"""
+    admin = User(email='admin@firma.pl', password_hash='x', first_name='Admin',
+                 last_name='System', role='admin')
+    db.session.add(admin)
+    db.session.flush()
+    manager = User(email='manager@firma.pl', password_hash='x', first_name='Anna',
+                   last_name='Kowalska', role='manager', supervisor_id=admin.id)
+    db.session.add(manager)
+    db.session.flush()
+    employee = User(email='employee@firma.pl', password_hash='x', first_name='Jan',
+                    last_name='Nowak', role='pracownik', supervisor_id=manager.id)
+    db.session.add(employee)
+    db.session.commit()
+    return {'admin': admin, 'manager': manager, 'employee': employee}
+
+
+def auth_header(user):
+    return {'Authorization': f'Bearer {generate_token(user)}'}
+
+
+def add_requests(employee, manager, count):
+    """Insert `count` pending requests from employee to manager"""
+    now = datetime.utcnow()
+    db.session.add_all([
+        Request(
+            employee_id=employee.id,
+            manager_id=manager.id,
+            date=date(2026, 10, 20) + timedelta(days=i),
+            time_out=time(10, 0),
+            time_return=time(12, 0),
+            reason=f'Powód {i}',
+            status='oczekujący',
+            created_at=now - timedelta(seconds=i),
+        )
+        for i in range(count)
+    ])
+    db.session.commit()
+
+
+@contextmanager
+def count_queries():
+    """Collect the SQL statements executed on db.engine inside the block"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
@@ -0,0 +1,55 @@
+"""Audit log archive - refuses to run without an absolute AUDIT_ARCHIVE_DIR"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from config import Config
+from models import db, AuditLog
+from services.audit_archive import (archive_audit_logs, iter_archived_audit_logs,
+                                    list_segments, ArchiveNotConfigured)
+from conftest import auth_header
+
+
+def _add_old_logs(user, count):
+    old = datetime.utcnow() - timedelta(days=Config.AUDIT_RETENTION_DAYS + 1)
+    db.session.add_all([
+        AuditLog(user_id=user.id, action='USER_LOGIN', details=f'Login {i}',
+                 timestamp=old - timedelta(seconds=i))
+        for i in range(count)
+    ])
+    db.session.commit()
+
+
+@pytest.mark.parametrize('archive_dir', [None, '', 'archive/audit_log'])
+def test_refuses_without_an_absolute_archive_dir(app, users, monkeypatch, archive_dir):
+    monkeypatch.setattr(Config, 'AUDIT_ARCHIVE_DIR', archive_dir)
+    _add_old_logs(users['admin'], 3)
+
+    with pytest.raises(ArchiveNotConfigured):
+        archive_audit_logs()
+    with pytest.raises(ArchiveNotConfigured):
+        list(iter_archived_audit_logs())
+    assert AuditLog.query.count() == 3
+
+
+def test_export_without_archive_dir_returns_503(client, users, monkeypatch):
+    monkeypatch.setattr(Config, 'AUDIT_ARCHIVE_DIR', None)
+
+    response = client.get('/api/audit-logs/archive', headers=auth_header(users['admin']))
+    assert response.status_code == 503
+    assert 'AUDIT_ARCHIVE_DIR' in response.get_json()['error']
+
+
+def test_archived_rows_are_read_back(client, users, monkeypatch, tmp_path):
+    monkeypatch.setattr(Config, 'AUDIT_ARCHIVE_DIR', str(tmp_path))
+    _add_old_logs(users['admin'], 3)
+
+    result = archive_audit_logs()
+    assert result['archived'] == 3
+    assert AuditLog.query.count() == 0
+    assert len(list_segments()) == len(result['segments'])
+
+    response = client.get('/api/audit-logs/archive', headers=auth_header(users['admin']))
+    assert response.status_code == 200
+    lines = response.get_data(as_text=True).splitlines()
+    assert len(lines) == 3
@@ -0,0 +1,43 @@
+"""GET /api/audit-logs - bare array without ?limit= / ?after=, pages with them"""
+from datetime import datetime, timedelta
+
+from models import db, AuditLog
+from conftest import auth_header
+
+
+def _add_logs(user, count):
+    now = datetime.utcnow()
+    db.session.add_all([
+        AuditLog(user_id=user.id, action='USER_LOGIN', details=f'Login {i}',
+                 timestamp=now - timedelta(seconds=i))
+        for i in range(count)
+    ])
+    db.session.commit()
+
+
+def test_unpaged_returns_newest_100_as_array(client, users):
+    _add_logs(users['admin'], 120)
+
+    response = client.get('/api/audit-logs', headers=auth_header(users['admin']))
+    assert response.status_code == 200
+    logs = response.get_json()
+    assert isinstance(logs, list)
+    assert len(logs) == 100
+    assert logs[0]['details'] == 'Login 0'
+
+    filtered = client.get(f"/api/audit-logs?user_id={users['manager'].id}",
+                          headers=auth_header(users['admin'])).get_json()
+    assert filtered == []
+
+
+def test_paged_returns_items_and_cursor(client, users):
+    _add_logs(users['admin'], 60)
+
+    first = client.get('/api/audit-logs?limit=50', headers=auth_header(users['admin'])).get_json()
+    assert len(first['items']) == 50
+    assert first['next_cursor']
+
+    second = client.get(f"/api/audit-logs?after={first['next_cursor']}",
+                        headers=auth_header(users['admin'])).get_json()
+    assert [log['details'] for log in second['items']] == [f'Login {i}' for i in range(50, 60)]
+    assert second['next_cursor'] is None
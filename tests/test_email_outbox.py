@@ -0,0 +1,90 @@
+"""Email outbox - the batch is leased and committed before SMTP, outcomes recorded after"""
+from datetime import datetime
+
+import pytest
+
+from config import Config
+from models import db, EmailOutbox
+from services import email_outbox
+from services.email_outbox import enqueue_email, deliver_pending, STATUS_PENDING, STATUS_SENT
+from services.email_service import smtp_breaker
+
+
+def _enqueue(count):
+    for i in range(count):
+        enqueue_email('digest', f'manager{i}@firma.pl', manager_name=f'Manager {i}', requests=[])
+    db.session.commit()
+
+
+@pytest.fixture
+def sender(monkeypatch):
+    """Fake digest sender; calls holds (recipient, in_transaction, next_attempt_at per row)"""
+    calls = []
+
+    def send(recipient, **payload):
+        in_transaction = db.session().in_transaction()
+        leases = [row.next_attempt_at for row in EmailOutbox.query.order_by(EmailOutbox.id)]
+        db.session.rollback()
+        calls.append((recipient, in_transaction, leases))
+        return True, 'sent'
+
+    monkeypatch.setitem(email_outbox.SENDERS, 'digest', send)
+    return calls
+
+
+def test_no_transaction_is_open_while_sending(app, sender):
+    _enqueue(3)
+
+    result = deliver_pending()
+    assert result == {'processed': 3, 'sent': 3, 'retried': 0, 'dead': 0, 'deferred': 0}
+    assert [in_transaction for _, in_transaction, _ in sender] == [False] * 3
+    # All rows were leased before the first send
+    assert all(lease > datetime.utcnow() for lease in sender[0][2])
+    assert {row.status for row in EmailOutbox.query} == {STATUS_SENT}
+
+
+def test_rows_deleted_while_sending_are_skipped(app, monkeypatch):
+    _enqueue(2)
+
+    def send_and_clear(recipient, **payload):
+        EmailOutbox.query.delete()
+        db.session.commit()
+        return True, 'sent'
+
+    monkeypatch.setitem(email_outbox.SENDERS, 'digest', send_and_clear)
+    deliver_pending()
+    assert EmailOutbox.query.count() == 0
+
+
+def test_breaker_opening_mid_batch_leaves_the_rest_due(app, monkeypatch):
+    _enqueue(3)
+    due = [row.next_attempt_at for row in EmailOutbox.query.order_by(EmailOutbox.id)]
+
+    def send_and_trip(recipient, **payload):
+        for _ in range(Config.SMTP_BREAKER_THRESHOLD):
+            smtp_breaker.record_failure(ConnectionRefusedError('Connection refused'))
+        return False, 'Connection refused'
+
+    monkeypatch.setitem(email_outbox.SENDERS, 'digest', send_and_trip)
+    result = deliver_pending()
+    assert result == {'processed': 1, 'sent': 0, 'retried': 1, 'dead': 0, 'deferred': 2}
+
+    first, *rest = EmailOutbox.query.order_by(EmailOutbox.id).all()
+    assert first.attempts == 1 and first.last_error == 'Connection refused'
+    assert [row.next_attempt_at for row in rest] == due[1:]
+    assert all(row.status == STATUS_PENDING and row.attempts == 0 for row in rest)
+
+
+def test_lease_taken_over_by_another_worker_is_not_overwritten(app, monkeypatch):
+    _enqueue(1)
+
+    def send_after_takeover(recipient, **payload):
+        row = EmailOutbox.query.one()
+        row.status = STATUS_SENT
+        db.session.commit()
+        return False, 'timeout'
+
+    monkeypatch.setitem(email_outbox.SENDERS, 'digest', send_after_takeover)
+    deliver_pending()
+    row = EmailOutbox.query.one()
+    assert row.status == STATUS_SENT and row.attempts == 0
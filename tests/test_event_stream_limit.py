@@ -0,0 +1,34 @@
+"""GET /api/events caps the open streams per worker and answers 503 beyond it"""
+from config import Config
+from conftest import auth_header
+
+
+def _open_stream(client, user):
+    return client.get('/api/events', headers=auth_header(user), buffered=False)
+
+
+def test_streams_beyond_the_limit_get_503(client, users):
+    streams = [_open_stream(client, users['employee']) for _ in range(Config.SSE_MAX_STREAMS)]
+    try:
+        assert all(stream.status_code == 200 for stream in streams)
+
+        refused = _open_stream(client, users['manager'])
+        assert refused.status_code == 503
+        assert refused.headers['Retry-After'] == '30'
+        assert 'error' in refused.get_json()
+
+        # Closing a stream frees its slot
+        streams.pop().close()
+        reopened = _open_stream(client, users['manager'])
+        assert reopened.status_code == 200
+        streams.append(reopened)
+    finally:
+        for stream in streams:
+            stream.close()
+
+
+def test_slot_is_released_without_reading_the_stream(client, users):
+    for _ in range(Config.SSE_MAX_STREAMS + 1):
+        stream = _open_stream(client, users['employee'])
+        assert stream.status_code == 200
+        stream.close()
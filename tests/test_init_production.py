@@ -0,0 +1,48 @@
+"""POST /api/init-production - busy password hasher, wipe of queued emails"""
+import pytest
+
+import routes.init_routes as init_routes
+from auth import PasswordHasherBusy
+from models import db, User, EmailOutbox
+from services.email_outbox import enqueue_email
+
+
+@pytest.fixture
+def init_secret(monkeypatch):
+    monkeypatch.setenv('INIT_SECRET', 'init-secret')
+    return 'init-secret'
+
+
+def _init(client, secret):
+    return client.post('/api/init-production', json={
+        'secret': secret, 'admin_email': 'nowy@firma.pl', 'admin_password': 'Haslo123!'
+    })
+
+
+def test_busy_hasher_returns_503_and_keeps_data(client, users, init_secret, monkeypatch):
+    def busy(password):
+        raise PasswordHasherBusy('Password hashing queue is full')
+    monkeypatch.setattr(init_routes, 'hash_password', busy)
+
+    response = _init(client, init_secret)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+    assert response.get_json() == {'error': 'Server busy. Please try again.'}
+    assert User.query.count() == 3
+
+
+def test_wipe_deletes_queued_emails(client, users, init_secret, monkeypatch):
+    monkeypatch.setattr(init_routes, 'hash_password', lambda password: 'hashed')
+    enqueue_email('decision', 'employee@firma.pl', employee_name='Jan Nowak',
+                  request_data={'date': '2026-10-20', 'time_out': '10:00',
+                                'time_return': '12:00', 'reason': 'Wizyta'},
+                  decision='zaakceptowany', comment=None)
+    db.session.commit()
+    # The request runs in its own session in production
+    db.session.expunge_all()
+
+    response = _init(client, init_secret)
+    assert response.status_code == 200
+    assert response.get_json()['deleted']['emails'] == 1
+    assert EmailOutbox.query.count() == 0
+    assert [user.email for user in User.query.all()] == ['nowy@firma.pl']
@@ -0,0 +1,65 @@
+"""alembic upgrade head runs before and after db.create_all() (startup.sh order)"""
+import os
+import subprocess
+import sys
+
+import sqlalchemy as sa
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _alembic(database_url, *args):
+    env = dict(os.environ, DATABASE_URL=database_url)
+    result = subprocess.run([sys.executable, '-m', 'alembic', *args], cwd=ROOT, env=env,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+def _create_all(database_url):
+    engine = sa.create_engine(database_url)
+    from models import db
+    db.metadata.create_all(engine)
+    return engine
+
+
+def _schema(engine):
+    inspector = sa.inspect(engine)
+    return {
+        table: (sorted(c['name'] for c in inspector.get_columns(table)),
+                sorted(i['name'] for i in inspector.get_indexes(table)))
+        for table in inspector.get_table_names() if table != 'alembic_version'
+    }
+
+
+def test_upgrade_on_empty_database_then_create_all(tmp_path):
+    url = f"sqlite:///{tmp_path / 'empty.db'}"
+    _alembic(url, 'upgrade', 'head')
+    engine = _create_all(url)
+
+    reference = _create_all(f"sqlite:///{tmp_path / 'reference.db'}")
+    assert _schema(engine) == _schema(reference)
+    assert '(head)' in _alembic(url, 'current')
+
+
+def test_upgrade_after_create_all(tmp_path):
+    url = f"sqlite:///{tmp_path / 'created.db'}"
+    engine = _create_all(url)
+    before = _schema(engine)
+
+    _alembic(url, 'upgrade', 'head')
+    assert _schema(engine) == before
+    assert '(head)' in _alembic(url, 'current')
+
+
+def test_upgrade_adds_notified_at_to_an_existing_requests_table(tmp_path):
+    url = f"sqlite:///{tmp_path / 'previous.db'}"
+    engine = _create_all(url)
+    with engine.begin() as conn:
+        conn.execute(sa.text("DROP INDEX idx_requests_created_at_id"))
+        conn.execute(sa.text("ALTER TABLE requests DROP COLUMN notified_at"))
+
+    _alembic(url, 'upgrade', 'head')
+    columns, indexes = _schema(engine)['requests']
+    assert 'notified_at' in columns
+    assert 'idx_requests_created_at_id' in indexes
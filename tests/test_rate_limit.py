@@ -0,0 +1,33 @@
+"""Database rate limit backend - pruning keeps live counters of every window length"""
+import time
+
+from models import db, RateLimitCounter
+from security import DatabaseRateLimitBackend
+
+
+def _window(window_seconds):
+    return int(time.time() // window_seconds)
+
+
+def test_prune_keeps_counters_of_longer_windows(app):
+    backend = DatabaseRateLimitBackend(db.engine)
+    hourly = _window(3600)
+    backend.hit('export:3600:user:1', hourly, 3600)
+    assert backend.hit('export:3600:user:1', hourly, 3600) == (2, 0)
+
+    # A 60 s limiter triggers the periodic prune
+    backend._last_prune = 0
+    backend.hit('login:60:ip:127.0.0.1', _window(60), 60)
+
+    assert backend.hit('export:3600:user:1', hourly, 3600) == (3, 0)
+
+
+def test_prune_deletes_expired_counters(app):
+    backend = DatabaseRateLimitBackend(db.engine)
+    old_window = _window(60) - 2
+    backend.hit('login:60:ip:10.0.0.1', old_window, 60)
+
+    backend._last_prune = 0
+    backend.hit('login:60:ip:10.0.0.2', _window(60), 60)
+
+    assert [row.key for row in RateLimitCounter.query.all()] == ['login:60:ip:10.0.0.2']
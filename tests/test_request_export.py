@@ -0,0 +1,40 @@
+"""GET /api/requests/export - CSV formula escaping and filter validation"""
+import csv
+import io
+
+from models import db, Request
+from conftest import auth_header, add_requests
+
+
+def _export_rows(client, user):
+    response = client.get('/api/requests/export?format=csv', headers=auth_header(user))
+    assert response.status_code == 200
+    return list(csv.reader(io.StringIO(response.get_data(as_text=True).lstrip('\ufeff'))))
+
+
+def test_csv_cells_that_start_a_formula_are_escaped(client, users):
+    add_requests(users['employee'], users['manager'], 6)
+    reasons = ['=HYPERLINK("http://evil")', '+1+1', '-2+3', '@SUM(A1)', '\tx', 'Wizyta u lekarza']
+    for req, reason in zip(Request.query.order_by(Request.date).all(), reasons):
+        req.reason = reason
+    users['employee'].first_name = '=cmd'
+    db.session.commit()
+
+    header, *rows = _export_rows(client, users['admin'])
+    reason_col = header.index('reason')
+    assert [row[reason_col] for row in rows] == [
+        '\'=HYPERLINK("http://evil")', "'+1+1", "'-2+3", "'@SUM(A1)", "'\tx", 'Wizyta u lekarza'
+    ]
+    assert rows[0][header.index('employee_name')].startswith("'=cmd")
+    assert rows[0][header.index('date')] == '2026-10-20'
+
+
+def test_invalid_id_filter_returns_400(client, users):
+    for url in ('/api/requests/export?employee_id=abc', '/api/requests?manager_id=abc'):
+        response = client.get(url, headers=auth_header(users['admin']))
+        assert response.status_code == 400
+        assert 'must be an integer' in response.get_json()['error']
+
+    response = client.get('/api/requests/export?date_from=2026-13-01', headers=auth_header(users['admin']))
+    assert response.status_code == 400
+    assert response.get_json()['error'].startswith('Invalid date format')
@@ -0,0 +1,38 @@
+"""GET /api/requests issues the same number of queries for 1 and N requests"""
+from models import Request
+from conftest import auth_header, add_requests, count_queries
+
+
+def _list_queries(client, user, query_string=''):
+    """Number of SQL statements for one warm list call (caches primed)"""
+    url = f'/api/requests{query_string}'
+    assert client.get(url, headers=auth_header(user)).status_code == 200
+    with count_queries() as statements:
+        response = client.get(url, headers=auth_header(user))
+    assert response.status_code == 200
+    return len(statements), response.get_json()
+
+
+def _queries_with(client, users, total, query_string=''):
+    """Top the table up to `total` requests and count the queries of the admin list"""
+    add_requests(users['employee'], users['manager'], total - Request.query.count())
+    queries, body = _list_queries(client, users['admin'], query_string)
+    items = body['items'] if query_string else body
+    assert len(items) == total
+    return queries
+
+
+def test_list_query_count_is_constant(client, users):
+    assert _queries_with(client, users, 1) == _queries_with(client, users, 50)
+
+
+def test_paged_list_query_count_is_constant(client, users):
+    assert _queries_with(client, users, 1, '?limit=50') == _queries_with(client, users, 50, '?limit=50')
+
+
+def test_list_includes_parties_without_extra_queries(client, users):
+    add_requests(users['employee'], users['manager'], 3)
+    queries, body = _list_queries(client, users['manager'])
+    assert [item['employee']['name'] for item in body] == ['Jan Nowak'] * 3
+    assert [item['manager']['name'] for item in body] == ['Anna Kowalska'] * 3
+    assert queries == _list_queries(client, users['employee'])[0]
@@ -0,0 +1,103 @@
+"""sanitize_input matches the previous re.sub passes, repeats them to a fixpoint, stays linear"""
+import random
+import re
+
+import pytest
+
+import security
+from security import sanitize_input
+
+
+def old_sanitize_input(text):
+    """security.sanitize_input before the compiled patterns"""
+    if not text:
+        return text
+    text = re.sub(r'<script[^>]*>.*?</script>', '', text, flags=re.IGNORECASE | re.DOTALL)
+    text = re.sub(r'<iframe[^>]*>.*?</iframe>', '', text, flags=re.IGNORECASE | re.DOTALL)
+    text = re.sub(r'javascript:', '', text, flags=re.IGNORECASE)
+    text = re.sub(r'on\w+\s*=', '', text, flags=re.IGNORECASE)
+    return text.strip()
+
+
+@pytest.mark.parametrize('text', [
+    '',
+    None,
+    '  Wizyta u lekarza - kontrola okresowa  ',
+    'Spotkanie z klientem <b>ABC</b> w centrum',
+    'Urząd skarbowy <script>fetch("//evil")</script> 10:00-11:00',
+    '<SCRIPT src=x>\nalert(1)\n</ScRiPt> ok',
+    '<iframe src="//evil"></iframe> ok',
+    '<img src=x onerror=alert(1)> pilne',
+    '<a href="JavaScript:alert(1)">link</a>',
+    'on = x, one=1, only',
+    '<iframe>on<script a=1></iframe>x</script>',
+    '<script>unclosed',
+    '</script><script>',
+])
+def test_matches_previous_implementation(text):
+    assert sanitize_input(text) == old_sanitize_input(text)
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('<a href="java<script></script>script:alert(1)">link</a>', '<a href="alert(1)">link</a>'),
+    ('javajavascript:script:alert(1)', 'alert(1)'),
+    ('<img src=x oonerror=nerror=alert(1)>', '<img src=x alert(1)>'),
+    ('<scr<script></script>ipt>alert(1)</script>', ''),
+    ('<iframe src=javascript:x><script></script></iframe>', ''),
+    ('onjavascript:error=alert(1)', 'alert(1)'),
+])
+def test_removes_constructs_formed_by_a_removal(text, expected):
+    assert sanitize_input(text) == expected
+    assert sanitize_input(expected) == expected
+
+
+def test_random_markup_is_equivalent_or_further_sanitized():
+    tokens = ['<script>', '</script>', '<script a=1>', '<iframe>', '</iframe>', 'javascript:',
+              'java', 'script:', 'on', 'error', '=', ' ', 'x', '>', '<', '\n', 'ON', 'Script']
+    rng = random.Random(2026)
+    for _ in range(2000):
+        text = ''.join(rng.choice(tokens) for _ in range(rng.randint(1, 12)))
+        old = old_sanitize_input(text)
+        new = sanitize_input(text)
+        # Same result whenever one pass was enough; otherwise the passes
+        # are repeated on the old result until nothing changes
+        if old_sanitize_input(old) == old:
+            assert new == old, text
+        else:
+            assert new == sanitize_input(old), text
+        assert sanitize_input(new) == new, text
+
+
+def test_each_pass_matches_its_regex():
+    passes = [
+        (lambda t: security._remove_elements(t, security._SCRIPT_OPEN_RE, security._SCRIPT_CLOSE_RE),
+         re.compile(r'<script[^>]*>.*?</script>', re.IGNORECASE | re.DOTALL)),
+        (lambda t: security._remove_elements(t, security._IFRAME_OPEN_RE, security._IFRAME_CLOSE_RE),
+         re.compile(r'<iframe[^>]*>.*?</iframe>', re.IGNORECASE | re.DOTALL)),
+        (security._remove_event_handlers, re.compile(r'on\w+\s*=', re.IGNORECASE)),
+    ]
+    tokens = ['<script', '</script>', '<iframe', '</iframe>', '>', '<', 'on', 'ON', 'o', 'n',
+              'error', '=', ' ', '\t', '\n', 'x', '_', '1', 'é']
+    rng = random.Random(18)
+    for _ in range(5000):
+        text = ''.join(rng.choice(tokens) for _ in range(rng.randint(1, 16)))
+        for scanner, pattern in passes:
+            assert scanner(text) == pattern.sub('', text), text
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('<script>' * 25000, '<script>' * 25000),
+    ('on' * 100000 + ' x=1', 'on' * 100000 + ' x=1'),
+    ('java' * 10000 + 'script:' * 10000 + 'ok', 'ok'),
+    ('<iframe a=1>' * 20000 + '</script>', '<iframe a=1>' * 20000 + '</script>'),
+])
+def test_inputs_that_make_regexes_backtrack(text, expected):
+    # Each takes seconds to minutes with the backtracking patterns
+    assert sanitize_input(text) == expected
+
+
+def test_nesting_deeper_than_the_pass_limit_drops_angle_brackets():
+    depth = security.SANITIZE_MAX_PASSES + 2
+    text = '<img ' + 'o' * depth + 'nerror=' * depth + 'alert(1)>'
+    cleaned = sanitize_input(text)
+    assert '<' not in cleaned and '>' not in cleaned
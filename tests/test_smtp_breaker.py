@@ -0,0 +1,51 @@
+"""SMTP circuit breaker - closed by a configuration change, bypassed by the test email"""
+import socket
+
+from config import Config
+from services.email_service import send_email, smtp_breaker, smtp_config_cache
+from conftest import auth_header
+
+
+def _closed_port():
+    """A local port nothing listens on (connections are refused)"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _configure(client, admin, port):
+    response = client.post('/api/smtp-config', headers=auth_header(admin), json={
+        'server': '127.0.0.1', 'port': port, 'use_ssl': False, 'email_from': 'noreply@firma.pl'
+    })
+    assert response.status_code == 200
+
+
+def _trip():
+    for _ in range(Config.SMTP_BREAKER_THRESHOLD):
+        smtp_breaker.record_failure(ConnectionRefusedError('Connection refused'))
+    assert smtp_breaker.stats()['state'] == 'open'
+
+
+def test_config_update_closes_the_breaker(client, users):
+    _configure(client, users['admin'], _closed_port())
+    smtp_config_cache.get()
+    _trip()
+
+    _configure(client, users['admin'], _closed_port())
+    assert smtp_breaker.stats()['state'] == 'closed'
+    assert smtp_breaker.stats()['consecutive_failures'] == 0
+
+
+def test_test_email_is_sent_while_the_breaker_is_open(client, users):
+    _configure(client, users['admin'], _closed_port())
+    _trip()
+
+    success, message = send_email('admin@firma.pl', 'Wniosek', '<p>x</p>')
+    assert not success
+    assert 'SMTP server unavailable' in message
+
+    response = client.post('/api/smtp-config/test', headers=auth_header(users['admin']),
+                           json={'test_email': 'admin@firma.pl'})
+    error = response.get_json()['error']
+    assert 'SMTP server unavailable' not in error
+    assert 'refused' in error.lower()